@@ -0,0 +1,125 @@
+"""
+Synthetic and on-disk vector corpora for benchmarks.
+
+Synthetic corpora are drawn from a seeded Gaussian mixture so that nearest
+neighbors are meaningful (pure isotropic noise makes every ANN index look
+bad) and the same parameters always produce the same vectors.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info
+
+CATEGORIES = ("history", "science", "biology", "literature", "physics")
+
+
+@dataclass
+class Dataset:
+    """
+    Corpus plus query set.
+
+    Attributes:
+        name (str): Short description used in reports.
+        vectors (np.ndarray): (n, dim) float32 corpus.
+        queries (np.ndarray): (q, dim) float32 queries.
+        payloads (List[Dict[str, Any]]): One payload per corpus vector.
+    """
+    name: str
+    vectors: np.ndarray
+    queries: np.ndarray
+    payloads: List[Dict[str, Any]]
+
+    @property
+    def ids(self) -> List[int]:
+        return list(range(len(self.vectors)))
+
+
+def make_payloads(count: int) -> List[Dict[str, Any]]:
+    """
+    Payloads with a text field and a low-cardinality category for filter tests.
+
+    Args:
+        count (int): Number of payloads.
+
+    Returns:
+        List[Dict[str, Any]]: Payload dictionaries.
+    """
+    return [{"text": f"document {i}", "category": CATEGORIES[i % len(CATEGORIES)]} for i in range(count)]
+
+
+def synthetic_dataset(
+    num_vectors: int,
+    dimension: int,
+    num_queries: int = 1000,
+    num_clusters: int = 100,
+    spread: float = 0.5,
+    seed: int = 0,
+) -> Dataset:
+    """
+    Generate a clustered corpus and queries from the same distribution.
+
+    Args:
+        num_vectors (int): Corpus size.
+        dimension (int): Vector dimension.
+        num_queries (int): Number of queries.
+        num_clusters (int): Mixture components.
+        spread (float): Standard deviation around each center.
+        seed (int): Random seed.
+
+    Returns:
+        Dataset: The generated dataset.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_clusters, dimension)).astype(np.float32)
+
+    def draw(count: int) -> np.ndarray:
+        labels = rng.integers(0, num_clusters, count)
+        noise = rng.standard_normal((count, dimension)).astype(np.float32)
+        return centers[labels] + np.float32(spread) * noise
+
+    vectors = draw(num_vectors)
+    queries = draw(num_queries)
+    info(f"Generated synthetic corpus: {num_vectors} x {dimension}, {num_queries} queries", service="benchmark")
+    return Dataset(
+        name=f"synthetic-{num_vectors}x{dimension}-seed{seed}",
+        vectors=vectors,
+        queries=queries,
+        payloads=make_payloads(num_vectors),
+    )
+
+
+def load_dataset(vectors_path: str, queries_path: Optional[str] = None, num_queries: int = 1000,
+                 seed: int = 0) -> Dataset:
+    """
+    Load a corpus saved with ``numpy.save``; queries are sampled from it when no file is given.
+
+    Args:
+        vectors_path (str): Path to an (n, dim) .npy file.
+        queries_path (Optional[str]): Path to a (q, dim) .npy file.
+        num_queries (int): Queries to sample when queries_path is None.
+        seed (int): Random seed for sampling.
+
+    Returns:
+        Dataset: The loaded dataset.
+    """
+    vectors = np.load(vectors_path, mmap_mode="r").astype(np.float32)
+    if queries_path:
+        queries = np.load(queries_path).astype(np.float32)
+    else:
+        rng = np.random.default_rng(seed)
+        queries = vectors[rng.choice(len(vectors), size=min(num_queries, len(vectors)), replace=False)]
+    return Dataset(
+        name=os.path.basename(vectors_path),
+        vectors=vectors,
+        queries=np.ascontiguousarray(queries),
+        payloads=make_payloads(len(vectors)),
+    )
@@ -0,0 +1,114 @@
+"""
+Throughput and accuracy drift of the CPU embedding backends against fp32.
+
+Each precision in ``--precisions`` is loaded through the model registry and
+encodes the same corpus. The report gives texts per second, the speedup over
+fp32 and the cosine similarity between each text's embedding and its fp32
+embedding (mean, 1st percentile and minimum). ONNX precisions load from
+``--onnx-dir``; pass ``--export`` to write it from ``--model`` first.
+
+Example:
+    python src/benchmark/encoders.py --onnx-dir .cache/onnx/minilm --export \\
+        --precisions fp32 int8 onnx onnx-int8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils import info
+from src.utils.model_registry import get_model, release_model, DEFAULT_MODEL_NAME, ONNX_PRECISIONS
+from src.benchmark.datasets import CATEGORIES
+
+WORDS = ("vector", "index", "query", "graph", "latency", "memory", "cell", "protein", "river", "empire",
+         "theory", "energy", "novel", "poem", "market", "signal", "quantum", "orbit", "enzyme", "battle")
+
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    """
+    Seeded sentences of varying length, so tokenization and padding costs are realistic.
+    """
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(CATEGORIES)}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 40)))
+        for _ in range(count)
+    ]
+
+
+def time_encode(model: Any, texts: List[str], batch_size: int) -> Dict[str, Any]:
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    started = time.perf_counter()
+    vectors = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+    seconds = time.perf_counter() - started
+    return {"vectors": vectors, "seconds": seconds, "texts_per_second": len(texts) / seconds if seconds else 0.0}
+
+
+def cosine_drift(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    Row-wise cosine similarity between two embedding matrices.
+    """
+    ref = reference / np.clip(np.linalg.norm(reference, axis=1, keepdims=True), 1e-12, None)
+    cand = candidate / np.clip(np.linalg.norm(candidate, axis=1, keepdims=True), 1e-12, None)
+    cosine = np.sum(ref * cand, axis=1)
+    return {
+        "cosine_mean": float(cosine.mean()),
+        "cosine_p01": float(np.percentile(cosine, 1)),
+        "cosine_min": float(cosine.min()),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare embedding backends against fp32.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--onnx-dir", default=None, help="Directory written by export_onnx")
+    parser.add_argument("--export", action="store_true", help="Export --model to --onnx-dir first")
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8", "onnx", "onnx-int8"])
+    parser.add_argument("--num-texts", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.export:
+        from src.utils.onnx_encoder import export_onnx
+
+        export_onnx(args.model, args.onnx_dir)
+    texts = synthetic_texts(args.num_texts, args.seed)
+
+    reference = time_encode(get_model(args.model, device="cpu"), texts, args.batch_size)
+    report: Dict[str, Any] = {"model": args.model, "num_texts": len(texts), "batch_size": args.batch_size,
+                              "results": {}}
+    for precision in args.precisions:
+        name = args.onnx_dir if precision in ONNX_PRECISIONS else args.model
+        if name is None:
+            info(f"Skipping {precision}: --onnx-dir not given", service="benchmark")
+            continue
+        run = reference if precision == "fp32" else time_encode(
+            get_model(name, device="cpu", precision=precision), texts, args.batch_size)
+        report["results"][precision] = {
+            "seconds": run["seconds"],
+            "texts_per_second": run["texts_per_second"],
+            "speedup": reference["seconds"] / run["seconds"] if run["seconds"] else 0.0,
+            **cosine_drift(reference["vectors"], run["vectors"]),
+        }
+        if precision != "fp32":
+            release_model(name, device="cpu", precision=precision)
+        info(f"{precision}: {run['texts_per_second']:.0f} texts/s, "
+             f"cosine vs fp32 {report['results'][precision]['cosine_mean']:.4f}", service="benchmark")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Cost of filtered search in the in-process engines.
+
+Synthetic points carry a skewed ``category`` (200 values), a ``year``, a
+``price`` and a ``lang``. For filters spanning selectivities from 0.1% to
+90% the report gives:
+
+- mask evaluation: row by row (``filter_expr.matches``, how filters were
+  applied before) against ``PayloadIndex`` with cold and warm columns;
+- flat (NumPy) search latency with pre-filtering, post-filtering and the
+  planner's choice;
+- HNSW latency and recall@k against exact filtered results, for the same
+  three strategies (recall of unfiltered HNSW search is given for reference).
+
+Example:
+    python src/benchmark/filters.py --num-points 200000 --hnsw-points 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.runner import percentile_ms
+from src.hnsw_lite.engine import HNSWIndex
+from src.numpy_lite.engine import FlatIndex
+from src.utils.filter_expr import matches, parse_filter
+from src.utils.payload_index import PayloadIndex
+
+FILTERS = (
+    "category == 'c150'",
+    "category in ['c20', 'c21', 'c22'] and year >= 2015",
+    "category == 'c3'",
+    "2010 <= year < 2013 and lang != 'en'",
+    "price < 20 or category == 'c0'",
+    "not (lang == 'en') and year > 2000",
+    "year >= 2002",
+)
+# Planner settings forcing one strategy: (selectivity threshold, full scan rows).
+STRATEGIES = {"pre": (1.0, 0), "post": (0.0, 0)}
+
+
+def make_payloads(count: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    categories = np.minimum(rng.zipf(1.3, count) - 1, 199)
+    years = rng.integers(2000, 2025, count)
+    prices = rng.gamma(2.0, 50.0, count).round(2)
+    langs = rng.choice(["en", "de", "fr", "es"], count, p=[0.6, 0.2, 0.1, 0.1])
+    return [{"category": f"c{c}", "year": int(y), "price": float(p), "lang": str(lang)}
+            for c, y, p, lang in zip(categories.tolist(), years.tolist(), prices.tolist(), langs.tolist())]
+
+
+def timed(fn: Any, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure filtered search in the in-process engines.")
+    parser.add_argument("--num-points", type=int, default=200_000)
+    parser.add_argument("--hnsw-points", type=int, default=20_000)
+    parser.add_argument("--num-queries", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.standard_normal((args.num_points, args.dim)).astype(np.float32)
+    payloads = make_payloads(args.num_points, rng)
+    queries = rng.standard_normal((args.num_queries, args.dim)).astype(np.float32)
+    ids = list(range(args.num_points))
+
+    flat = FlatIndex(args.dim)
+    flat.upsert(ids, vectors, payloads)
+    hnsw = HNSWIndex(args.dim, M=12, ef_construction=100, ef_search=64)
+    hnsw.upsert(ids[:args.hnsw_points], vectors[:args.hnsw_points], payloads[:args.hnsw_points])
+    hnsw_exact = FlatIndex(args.dim)
+    hnsw_exact.upsert(ids[:args.hnsw_points], vectors[:args.hnsw_points], payloads[:args.hnsw_points])
+
+    truth = [{hit.id for hit in hits} for hits in hnsw_exact.search(queries, k=args.k)]
+    found = sum(len({hit.id for hit in hits} & expected)
+                for hits, expected in zip(hnsw.search(queries, k=args.k), truth))
+    unfiltered_recall = found / (len(queries) * args.k)
+
+    rows = []
+    for expression in FILTERS:
+        node = parse_filter(expression)
+        started = time.perf_counter()
+        reference = np.fromiter((matches(node, payload) for payload in payloads), dtype=bool, count=len(payloads))
+        row_wise = time.perf_counter() - started
+
+        # No whole-expression cache, so warm runs measure evaluation over cached columns and bitmaps.
+        index = PayloadIndex(mask_cache=0)
+        started = time.perf_counter()
+        estimate = index.selectivity(expression, payloads)
+        mask = index.mask(expression, payloads)
+        cold = time.perf_counter() - started
+        assert np.array_equal(mask, reference), expression
+        warm = timed(lambda: index.mask(expression, payloads), 5)
+
+        row: Dict[str, Any] = {
+            "filter": expression,
+            "selectivity": float(reference.mean()),
+            "estimated_selectivity": estimate,
+            "mask_row_wise_ms": row_wise * 1000.0,
+            "mask_vectorized_cold_ms": cold * 1000.0,
+            "mask_vectorized_warm_ms": percentile_ms(warm, 50),
+        }
+
+        default_flat = flat.prefilter_selectivity
+        for name, (threshold, _) in list(STRATEGIES.items()) + [("planned", (default_flat, 0))]:
+            flat.prefilter_selectivity = threshold
+            flat.search(queries[:1], k=args.k, filters=expression)
+            row[f"flat_{name}_ms_p50"] = percentile_ms(
+                timed(lambda: flat.search(queries[0], k=args.k, filters=expression), args.num_queries), 50)
+        flat.prefilter_selectivity = default_flat
+
+        truth = [{hit.id for hit in hits} for hits in hnsw_exact.search(queries, k=args.k, filters=expression)]
+        default_hnsw = (hnsw.prefilter_selectivity, hnsw.full_scan_rows)
+        for name, (threshold, full_scan_rows) in list(STRATEGIES.items()) + [("planned", default_hnsw)]:
+            hnsw.prefilter_selectivity, hnsw.full_scan_rows = threshold, full_scan_rows
+            latencies, found = [], 0
+            for query, expected in zip(queries, truth):
+                started = time.perf_counter()
+                hits = hnsw.search(query, k=args.k, filters=expression)[0]
+                latencies.append(time.perf_counter() - started)
+                found += len({hit.id for hit in hits} & expected)
+            row[f"hnsw_{name}_ms_p50"] = percentile_ms(latencies, 50)
+            row[f"hnsw_{name}_recall"] = found / max(sum(len(expected) for expected in truth), 1)
+        hnsw.prefilter_selectivity, hnsw.full_scan_rows = default_hnsw
+        rows.append(row)
+
+    print(json.dumps({
+        "num_points": args.num_points,
+        "hnsw_points": args.hnsw_points,
+        "hnsw_unfiltered_recall": unfiltered_recall,
+        "dim": args.dim,
+        "k": args.k,
+        "results": rows,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Memory and time cost of handing embeddings to clients as Python lists versus
+float32 buffers.
+
+The "lists" path is what the entry points used to do: ``.tolist()`` on the
+whole embedding matrix, then one dict per row around those lists. The
+"buffers" path keeps the matrix, builds rows around ndarray views and
+converts to lists only one batch at a time, at the client boundary, which is
+what ``src.utils.vector_buffers`` does. Peak memory is measured with
+tracemalloc (which tracks NumPy allocations) in a separate pass from the
+timing, so tracing overhead does not skew the times.
+
+Fully materializing 1M x 384 vectors as lists needs well over 10 GB, so the
+lists path runs on at most ``--max-materialized`` vectors and is scaled
+linearly to ``--num-vectors``; the report marks it as extrapolated.
+
+Example:
+    python src/benchmark/handoff.py --num-vectors 1000000 --dim 384
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils import info
+from src.utils.resource_utils import format_bytes
+from src.utils.vector_buffers import iter_batches, to_lists, DEFAULT_CONVERT_BATCH
+
+
+def _consume(rows: List[Dict[str, Any]]) -> int:
+    # Stand-in for the client call: touch every row once.
+    return sum(1 for row in rows if row["vector"] is not None)
+
+
+def lists_path(embeddings: np.ndarray, texts: List[str], batch_size: int) -> int:
+    vectors = embeddings.tolist()
+    rows = [{"id": i, "vector": vectors[i], "text": texts[i]} for i in range(len(texts))]
+    written = 0
+    for start in range(0, len(rows), batch_size):
+        written += _consume(rows[start:start + batch_size])
+    return written
+
+
+def buffers_path(embeddings: np.ndarray, texts: List[str], batch_size: int) -> int:
+    written = 0
+    for offset, batch in iter_batches(embeddings, batch_size):
+        rows = [{"id": offset + i, "vector": vector, "text": texts[offset + i]}
+                for i, vector in enumerate(to_lists(batch))]
+        written += _consume(rows)
+    return written
+
+
+def measure(path: Callable[[np.ndarray, List[str], int], int], embeddings: np.ndarray,
+            texts: List[str], batch_size: int) -> Dict[str, float]:
+    """
+    Time one path, then run it again under tracemalloc for its peak extra memory.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    path(embeddings, texts, batch_size)
+    seconds = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    path(embeddings, texts, batch_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": float(peak)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare list and buffer handoff of embeddings.")
+    parser.add_argument("--num-vectors", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_CONVERT_BATCH)
+    parser.add_argument("--max-materialized", type=int, default=100_000,
+                        help="Largest corpus converted to lists in one go; larger runs are extrapolated")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    embeddings = rng.standard_normal((args.num_vectors, args.dim), dtype=np.float32)
+    texts = [f"document {i}" for i in range(args.num_vectors)]
+
+    buffers = measure(buffers_path, embeddings, texts, args.batch_size)
+
+    sample = min(args.num_vectors, args.max_materialized)
+    lists = measure(lists_path, embeddings[:sample], texts[:sample], args.batch_size)
+    scale = args.num_vectors / sample
+    lists = {key: value * scale for key, value in lists.items()}
+
+    report = {
+        "num_vectors": args.num_vectors,
+        "dim": args.dim,
+        "batch_size": args.batch_size,
+        "matrix_bytes": embeddings.nbytes,
+        "lists": {**lists, "extrapolated_from": sample if scale > 1 else None},
+        "buffers": buffers,
+        "memory_saved_bytes": lists["peak_bytes"] - buffers["peak_bytes"],
+        "speedup": lists["seconds"] / buffers["seconds"] if buffers["seconds"] else 0.0,
+    }
+    info(f"Handoff of {args.num_vectors} x {args.dim}: lists peak {format_bytes(lists['peak_bytes'])} "
+         f"in {lists['seconds']:.2f}s, buffers peak {format_bytes(buffers['peak_bytes'])} "
+         f"in {buffers['seconds']:.2f}s", service="benchmark")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Recall of hybrid retrieval on keyword-heavy queries.
+
+Each synthetic document has topic words plus a unique part code such as
+"DDR1234"; each query names one code plus some topic words, and its answer
+is the document with that code. The default embedding hashes topic words
+only, standing in for a dense model that cannot tell codes apart; pass
+``--model`` to embed with a real model instead. The report gives recall@k of
+dense-only, BM25-only, RRF and weighted fusion at the same k, plus query
+latency of each side.
+
+Example:
+    python src/benchmark/hybrid.py --num-docs 50000 --k 10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.encoders import WORDS
+from src.benchmark.runner import percentile_ms
+from src.utils.hybrid import fuse, sparse_results
+from src.utils.sparse_index import BM25Index
+from src.utils.vector_store import create_store
+
+PREFIXES = ("DDR", "SKU", "ERR", "CVE", "ISO")
+
+
+def make_corpus(count: int, rng: random.Random) -> List[str]:
+    return [f"{' '.join(rng.choices(WORDS, k=rng.randint(6, 20)))} {rng.choice(PREFIXES)}{i}"
+            for i in range(count)]
+
+
+def hashed_encoder(dim: int) -> Callable[[List[str]], np.ndarray]:
+    """
+    Bag of topic words hashed to random unit vectors; tokens with digits are ignored.
+    """
+    def word_vector(word: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+        return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+    table = {word: word_vector(word) for word in WORDS}
+
+    def encode(texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                if word in table:
+                    out[row] += table[word]
+        return out / np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+
+    return encode
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure hybrid retrieval recall on keyword queries.")
+    parser.add_argument("--num-docs", type=int, default=20_000)
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--model", default=None, help="Embedding model; hashed topic words by default")
+    parser.add_argument("--alpha", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    corpus = make_corpus(args.num_docs, rng)
+    if args.model:
+        from src.utils.parallel_encoder import get_encoder
+
+        model = get_encoder(args.model)
+        encode: Callable[[List[str]], Any] = lambda texts: model.encode(texts, batch_size=256)
+    else:
+        encode = hashed_encoder(args.dim)
+    vectors = np.asarray(encode(corpus), dtype=np.float32)
+
+    store = create_store("numpy", "benchmark_hybrid", vectors.shape[1])
+    store.create_collection(recreate=True)
+    ids = list(range(len(corpus)))
+    store.upsert(ids, vectors, [{"text": text} for text in corpus])
+    index = BM25Index()
+    started = time.perf_counter()
+    index.add(ids, corpus)
+    build_seconds = time.perf_counter() - started
+
+    targets = rng.sample(ids, args.num_queries)
+    queries = [f"{' '.join(rng.sample(corpus[t].split()[:-1], 2))} {corpus[t].split()[-1]}" for t in targets]
+    query_vectors = np.asarray(encode(queries), dtype=np.float32)
+
+    hits = {"dense": 0, "sparse": 0, "rrf": 0, "weighted": 0}
+    dense_latency, sparse_latency = [], []
+    for target, query, vector in zip(targets, queries, query_vectors):
+        begin = time.perf_counter()
+        dense = store.search(vector, k=args.k)
+        dense_latency.append(time.perf_counter() - begin)
+        begin = time.perf_counter()
+        sparse = sparse_results(index, query, args.k)
+        sparse_latency.append(time.perf_counter() - begin)
+        runs: Dict[str, Any] = {
+            "dense": dense,
+            "sparse": sparse,
+            "rrf": fuse(dense, sparse, args.k, "rrf", args.alpha),
+            "weighted": fuse(dense, sparse, args.k, "weighted", args.alpha),
+        }
+        for name, results in runs.items():
+            hits[name] += any(result.id == target for result in results)
+
+    report = {
+        "num_docs": len(corpus),
+        "num_queries": len(queries),
+        "k": args.k,
+        "encoder": args.model or "hashed-topic-words",
+        "recall_at_k": {name: count / len(queries) for name, count in hits.items()},
+        "dense_latency_ms_p50": percentile_ms(dense_latency, 50),
+        "sparse_latency_ms_p50": percentile_ms(sparse_latency, 50),
+        "sparse_latency_ms_p95": percentile_ms(sparse_latency, 95),
+        "sparse_build_seconds": build_seconds,
+        "sparse_index": index.stats(),
+    }
+    store.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Collision check and throughput of point id allocation under concurrent load.
+
+Several processes, each running several threads, reserve ids of random batch
+sizes from one shared ``IdAllocator`` file; every id handed out is collected
+and checked for repeats. A second pass hashes distinct texts into content ids
+and checks those for collisions too. The script exits with status 1 if any id
+was handed out twice.
+
+Example:
+    python src/benchmark/id_allocation.py --processes 4 --threads 8 --allocations 2000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils import info, error
+from src.utils.id_allocator import IdAllocator, content_ids
+
+
+def _worker(args: Tuple[str, int, int, int, int, int]) -> List[int]:
+    path, threads, allocations, max_batch, block_size, seed = args
+    allocator = IdAllocator(path, name="stress", block_size=block_size)
+
+    def run(thread_seed: int) -> List[int]:
+        rng = random.Random(thread_seed)
+        ids: List[int] = []
+        for _ in range(allocations):
+            ids.extend(allocator.allocate(rng.randint(1, max_batch)))
+        return ids
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        chunks = list(pool.map(run, [seed * 1000 + t for t in range(threads)]))
+    allocator.close()
+    return [point_id for chunk in chunks for point_id in chunk]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check that concurrent id allocation never repeats an id.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--allocations", type=int, default=2000, help="Allocations per thread")
+    parser.add_argument("--max-batch", type=int, default=64, help="Largest number of ids per allocation")
+    parser.add_argument("--block-size", type=int, default=256)
+    parser.add_argument("--num-texts", type=int, default=1_000_000, help="Distinct texts for the content id check")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "ids.sqlite")
+        jobs = [(path, args.threads, args.allocations, args.max_batch, args.block_size, seed)
+                for seed in range(args.processes)]
+        started = time.perf_counter()
+        with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+            results = pool.map(_worker, jobs)
+        seconds = time.perf_counter() - started
+
+    allocated = [point_id for ids in results for point_id in ids]
+    counter_repeats = len(allocated) - len(set(allocated))
+
+    texts = [f"document {i}" for i in range(args.num_texts)]
+    hashed = content_ids(texts)
+    content_collisions = len(hashed) - len(set(hashed.tolist()))
+
+    report = {
+        "processes": args.processes,
+        "threads_per_process": args.threads,
+        "ids_allocated": len(allocated),
+        "counter_repeats": counter_repeats,
+        "allocation_seconds": seconds,
+        "ids_per_second": len(allocated) / seconds if seconds else 0.0,
+        "content_ids": len(hashed),
+        "content_collisions": content_collisions,
+    }
+    print(json.dumps(report, indent=2))
+    if counter_repeats or content_collisions:
+        error(f"Id collisions detected: {counter_repeats} counter repeats, "
+              f"{content_collisions} content id collisions", service="benchmark")
+        sys.exit(1)
+    info(f"{len(allocated)} ids from {args.processes} processes x {args.threads} threads, no repeats",
+         service="benchmark")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Async load generator: blocking sequential queries versus the asyncio layer.
+
+Runs the same queries against one backend first one at a time through the
+synchronous ``VectorStore`` API, then with up to ``--in-flight`` queries
+pending at once through ``AsyncVectorStore``, and reports QPS and latency
+for both. In-process backends answer in microseconds, so ``--latency-ms``
+adds a simulated network round-trip to each call to model a remote server.
+
+Example:
+    python src/benchmark/load_generator.py --backend numpy --latency-ms 5 --in-flight 1000 --max-concurrency 256
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.datasets import synthetic_dataset
+from src.benchmark.runner import BENCH_COLLECTION, percentile_ms
+from src.utils import info
+from src.utils.async_utils import AsyncVectorStore, configure_limiter
+from src.utils.vector_store import VectorStore, create_store
+
+
+class DelayedStore(VectorStore):
+    """
+    Wraps a store and sleeps before every search to simulate a network round-trip.
+    """
+
+    def __init__(self, store: VectorStore, latency_seconds: float) -> None:
+        super().__init__(store.collection_name, store.dimension)
+        self.store = store
+        self.backend = store.backend
+        self.latency_seconds = latency_seconds
+
+    def create_collection(self, recreate: bool = False) -> None:
+        self.store.create_collection(recreate=recreate)
+
+    def upsert(self, ids, vectors, payloads=None) -> int:
+        return self.store.upsert(ids, vectors, payloads)
+
+    def delete(self, ids) -> int:
+        return self.store.delete(ids)
+
+    def search(self, query_vector, k: int = 10, filters=None):
+        time.sleep(self.latency_seconds)
+        return self.store.search(query_vector, k=k, filters=filters)
+
+    def close(self) -> None:
+        self.store.close()
+
+
+def _summary(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    return {
+        "queries": len(latencies),
+        "errors": errors,
+        "qps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile_ms(latencies, 50),
+        "p99_ms": percentile_ms(latencies, 99),
+    }
+
+
+def run_sync(store: VectorStore, queries: np.ndarray, k: int) -> Dict[str, Any]:
+    """
+    Issue the queries one after the other through the blocking API.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for query in queries:
+        call_started = time.perf_counter()
+        store.search(query, k=k)
+        latencies.append(time.perf_counter() - call_started)
+    return _summary(latencies, time.perf_counter() - started)
+
+
+async def run_async(store: AsyncVectorStore, queries: np.ndarray, k: int, in_flight: int) -> Dict[str, Any]:
+    """
+    Keep up to ``in_flight`` queries pending at once through the async API.
+
+    Timeouts and backend errors are counted instead of aborting the run.
+    """
+    latencies: List[float] = []
+    errors = 0
+    pending = asyncio.Semaphore(in_flight)
+
+    async def one(query: np.ndarray) -> None:
+        nonlocal errors
+        async with pending:
+            call_started = time.perf_counter()
+            try:
+                await store.search(query, k=k)
+                latencies.append(time.perf_counter() - call_started)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    return _summary(latencies, time.perf_counter() - started, errors)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare blocking and asyncio query throughput on one backend.")
+    parser.add_argument("--backend", default="numpy")
+    parser.add_argument("--num-vectors", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--num-queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--in-flight", type=int, default=1000, help="Queries pending at once in the async run")
+    parser.add_argument("--max-concurrency", type=int, default=128, help="Backend limiter: calls actually executing")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated round-trip added to each search")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dataset = synthetic_dataset(args.num_vectors, args.dim, args.num_queries, seed=args.seed)
+
+    store = create_store(args.backend, BENCH_COLLECTION, args.dim)
+    store.create_collection(recreate=True)
+    for start in range(0, len(dataset.ids), 1000):
+        store.upsert(dataset.ids[start:start + 1000], dataset.vectors[start:start + 1000],
+                     dataset.payloads[start:start + 1000])
+    if args.latency_ms > 0:
+        store = DelayedStore(store, args.latency_ms / 1000.0)
+
+    try:
+        sync_result = run_sync(store, dataset.queries, args.k)
+        limiter = configure_limiter(args.backend, max_concurrency=args.max_concurrency, timeout=args.timeout)
+        async_result = asyncio.run(run_async(AsyncVectorStore(store, limiter), dataset.queries,
+                                             args.k, args.in_flight))
+        limiter.shutdown()
+    finally:
+        store.close()
+
+    report = {
+        "backend": args.backend,
+        "latency_ms": args.latency_ms,
+        "in_flight": args.in_flight,
+        "max_concurrency": args.max_concurrency,
+        "sync": sync_result,
+        "async": async_result,
+        "qps_gain": async_result["qps"] / sync_result["qps"] if sync_result["qps"] else 0.0,
+    }
+    info(f"Load test on '{args.backend}': sync {sync_result['qps']:.0f} QPS, "
+         f"async {async_result['qps']:.0f} QPS ({report['qps_gain']:.1f}x)", service="benchmark")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
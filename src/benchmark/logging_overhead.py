@@ -0,0 +1,99 @@
+"""
+Per-call overhead of the logger on the search hot path.
+
+Measures nanoseconds per call for:
+
+- a disabled-level call built with an f-string versus a lazy %-template;
+- an enabled call through the previous synchronous setup (stdout and file
+  handlers on the calling thread) versus the queue handler, where the caller
+  only enqueues the record.
+
+Output goes to a temporary directory and stdout is redirected to /dev/null,
+so terminal speed does not skew the numbers.
+
+Example:
+    python src/benchmark/logging_overhead.py --calls 200000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils import logging_utils
+from src.utils.logging_utils import info, debug, configure_logging, flush, set_level
+
+
+def per_call_ns(fn: Callable[[int], None], calls: int) -> float:
+    fn(0)  # warm-up
+    started = time.perf_counter_ns()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter_ns() - started) / calls
+
+
+def synchronous_logger(log_dir: str) -> logging.Logger:
+    """
+    The former setup: stdout and file handlers formatting on the caller's thread.
+    """
+    sync = logging.getLogger("logging_overhead_sync")
+    sync.setLevel(logging.DEBUG)
+    sync.propagate = False
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
+    for handler in (logging.StreamHandler(sys.stdout),
+                    logging.FileHandler(os.path.join(log_dir, "sync.log"), encoding="utf-8")):
+        handler.setFormatter(formatter)
+        sync.addHandler(handler)
+    return sync
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure logging overhead per call.")
+    parser.add_argument("--calls", type=int, default=100000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    collection, limit, filter_expr = "benchmark", 10, "category == 'science'"
+    report: Dict[str, float] = {}
+    real_stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            configure_logging(log_dir)
+            set_level("INFO", "search_utils")
+            report["disabled_fstring_ns"] = per_call_ns(lambda i: debug(
+                f"Running search on collection '{collection}' with limit={limit} and filter='{filter_expr}'",
+                service="search_utils"), args.calls)
+            report["disabled_lazy_ns"] = per_call_ns(lambda i: debug(
+                "Running search on collection '%s' with limit=%d and filter='%s'", collection, limit, filter_expr,
+                service="search_utils"), args.calls)
+
+            sync = synchronous_logger(log_dir)
+            report["enabled_sync_ns"] = per_call_ns(lambda i: sync.info(
+                f"[search_utils] Search returned results for {i} queries"), args.calls)
+            report["enabled_queue_ns"] = per_call_ns(lambda i: info(
+                "Search returned results for %d queries", i, service="search_utils", operation="search",
+                latency_ms=1.0), args.calls)
+            started = time.perf_counter()
+            flush()
+            report["queue_drain_seconds"] = time.perf_counter() - started
+            for handler in sync.handlers:
+                handler.close()
+        finally:
+            sys.stdout = real_stdout
+            set_level(logging_utils._default_level, "search_utils")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
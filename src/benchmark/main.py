@@ -0,0 +1,105 @@
+"""
+Command-line entry point for the cross-backend benchmark.
+
+Example:
+    python src/benchmark/main.py --backends numpy hnsw qdrant --num-vectors 100000 --dim 384
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.datasets import synthetic_dataset, load_dataset
+from src.benchmark.runner import (
+    DEFAULT_BACKENDS, environment, exact_ground_truth, run_backend, summary_table, compare_reports
+)
+from src.utils import info
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "bench_results")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark vector database backends on one workload.")
+    parser.add_argument("--backends", nargs="+", default=list(DEFAULT_BACKENDS))
+    parser.add_argument("--num-vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--num-queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vectors", help="Load the corpus from a .npy file instead of generating it")
+    parser.add_argument("--queries", help="Load queries from a .npy file")
+    parser.add_argument("--weaviate-embedded", action="store_true",
+                        help="Run Weaviate against an embedded instance instead of localhost:8080")
+    parser.add_argument("--output", help="JSON report path (default: bench_results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    return parser.parse_args()
+
+
+def backend_kwargs(backend: str, args: argparse.Namespace, dataset):
+    if backend == "weaviate" and args.weaviate_embedded:
+        from src.weaviate_lite.config import get_embedded_weaviate_client
+        return {"client": get_embedded_weaviate_client()}
+    # Keep benchmark collections out of the demo data directories.
+    if backend == "hnsw":
+        from src.hnsw_lite.engine import HNSWClient
+        return {"client": HNSWClient()}
+    if backend == "ivfpq":
+        from src.ivfpq_lite.engine import IVFPQClient
+        dim = dataset.vectors.shape[1]
+        m = next((m for m in (48, 32, 16, 8) if dim % m == 0), 1)
+        nlist = max(1, min(256, len(dataset.vectors) // 39))
+        return {"client": IVFPQClient(tempfile.mkdtemp(prefix="bench-ivfpq-")), "m": m, "nlist": nlist}
+    return {}
+
+
+def main() -> None:
+    args = parse_args()
+    if args.vectors:
+        dataset = load_dataset(args.vectors, args.queries, args.num_queries, args.seed)
+    else:
+        dataset = synthetic_dataset(args.num_vectors, args.dim, args.num_queries, seed=args.seed)
+
+    truth = exact_ground_truth(dataset, args.k)
+    results = [
+        run_backend(backend, dataset, truth, k=args.k, batch_size=args.batch_size,
+                    concurrency=args.concurrency, store_kwargs=backend_kwargs(backend, args, dataset))
+        for backend in args.backends
+    ]
+
+    report = {
+        "environment": environment(),
+        "workload": {
+            "dataset": dataset.name,
+            "num_vectors": int(dataset.vectors.shape[0]),
+            "dim": int(dataset.vectors.shape[1]),
+            "num_queries": int(dataset.queries.shape[0]),
+            "k": args.k,
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['environment']['commit'] or 'nogit'}-{report['environment']['timestamp']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+    print(summary_table(results))
+    info(f"Benchmark report written to '{output}'", service="benchmark")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            print(compare_reports(json.load(handle), report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Latency of the local cross-encoder rerank stage.
+
+For each candidate count N the same synthetic queries and candidate texts
+are reranked three ways: scored in plain rank order (``window_batches=1``),
+with length-sorted windows, and again with a warm score cache. A last pass
+runs with ``--budget-ms`` to show how many pairs fit the budget and how often
+it cut scoring short. The report gives p50/p95 milliseconds per query.
+
+Example:
+    python src/benchmark/reranker.py --candidates 20 50 100 --budget-ms 40
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.encoders import synthetic_texts
+from src.benchmark.runner import percentile_ms
+from src.utils.reranker import CrossEncoderReranker, DEFAULT_RERANKER_MODEL, DEFAULT_RERANK_BATCH
+from src.utils.vector_store import SearchResult
+
+
+def candidates_for(texts: List[str], count: int, rng: random.Random) -> List[SearchResult]:
+    return [SearchResult(id=i, score=1.0 - i / count, payload={"text": text})
+            for i, text in enumerate(rng.sample(texts, count))]
+
+
+def time_rerank(reranker: CrossEncoderReranker, queries: List[str], candidates: List[List[SearchResult]],
+                budget_ms: Optional[float] = None) -> Dict[str, Any]:
+    latencies = []
+    for query, hits in zip(queries, candidates):
+        started = time.perf_counter()
+        reranker.rerank(query, hits, k=10, budget_ms=budget_ms)
+        latencies.append(time.perf_counter() - started)
+    return {"latency_ms_p50": percentile_ms(latencies, 50), "latency_ms_p95": percentile_ms(latencies, 95)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure local reranking latency.")
+    parser.add_argument("--model", default=DEFAULT_RERANKER_MODEL)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--num-queries", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_RERANK_BATCH)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    corpus = synthetic_texts(5000, args.seed)
+    queries = synthetic_texts(args.num_queries, args.seed + 1)
+    model = CrossEncoderReranker(args.model).model
+    report: Dict[str, Any] = {"model": args.model, "batch_size": args.batch_size, "results": {}}
+    for count in args.candidates:
+        candidates = [candidates_for(corpus, count, rng) for _ in queries]
+        rank_order = CrossEncoderReranker(args.model, batch_size=args.batch_size, window_batches=1,
+                                          max_candidates=count, cache_items=0, model=model)
+        sorted_windows = CrossEncoderReranker(args.model, batch_size=args.batch_size,
+                                              max_candidates=count, model=model)
+        budgeted = CrossEncoderReranker(args.model, batch_size=args.batch_size, max_candidates=count,
+                                        cache_items=0, model=model)
+        time_rerank(rank_order, queries[:2], candidates[:2])  # warm-up
+        row = {
+            "rank_order": time_rerank(rank_order, queries, candidates),
+            "length_sorted": time_rerank(sorted_windows, queries, candidates),
+            "cached": time_rerank(sorted_windows, queries, candidates),
+            "budgeted": time_rerank(budgeted, queries, candidates, args.budget_ms),
+        }
+        row["budgeted"].update(budgeted.stats())
+        row["budgeted"]["adaptive_n"] = budgeted.candidate_count(10, args.budget_ms)
+        report["results"][count] = row
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
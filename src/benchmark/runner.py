@@ -0,0 +1,223 @@
+"""
+Cross-backend benchmark runner.
+
+Runs the same ingest and query workload against every requested backend
+through the ``VectorStore`` interface and collects:
+
+- ingest throughput (vectors/s) with batched upserts;
+- single-client query latency (p50/p95/p99) and QPS;
+- QPS with N concurrent clients;
+- recall@k against exact brute-force results;
+- resident and peak memory of the process.
+
+A backend that cannot be reached is recorded with its error instead of
+aborting the whole run.
+"""
+
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.datasets import Dataset
+from src.numpy_lite.engine import FlatIndex
+from src.utils.logging_utils import info, error
+from src.utils.resource_utils import current_rss_bytes, peak_rss_bytes
+from src.utils.vector_store import VectorStore, create_store
+
+BENCH_COLLECTION = "bench_collection"
+DEFAULT_BACKENDS = ("numpy", "hnsw", "ivfpq", "qdrant", "milvus", "weaviate")
+
+
+def percentile_ms(samples: Sequence[float], q: float) -> float:
+    return float(np.percentile(np.asarray(samples) * 1000.0, q)) if len(samples) else 0.0
+
+
+def exact_ground_truth(dataset: Dataset, k: int) -> List[Set[Any]]:
+    """
+    Exact top-k ids per query, computed with the brute-force NumPy index.
+    """
+    exact = FlatIndex(dataset.vectors.shape[1], "cosine")
+    exact.upsert(dataset.ids, dataset.vectors)
+    return [{hit.id for hit in hits} for hits in exact.search(dataset.queries, k=k)]
+
+
+def recall_at_k(results: Sequence[Sequence[Any]], truth: Sequence[Set[Any]]) -> float:
+    found = sum(len(expected & {hit.id for hit in hits}) for hits, expected in zip(results, truth))
+    return found / max(1, sum(len(expected) for expected in truth))
+
+
+def _ingest(store: VectorStore, dataset: Dataset, batch_size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(dataset.vectors), batch_size):
+        stop = start + batch_size
+        store.upsert(dataset.ids[start:stop], dataset.vectors[start:stop], dataset.payloads[start:stop])
+    return time.perf_counter() - started
+
+
+def _sequential_queries(store: VectorStore, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(store.search(query, k=k))
+        latencies.append(time.perf_counter() - started)
+    return latencies, results
+
+
+def _concurrent_qps(store: VectorStore, queries: np.ndarray, k: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda query: store.search(query, k=k), queries))
+    elapsed = time.perf_counter() - started
+    return len(queries) / elapsed if elapsed else 0.0
+
+
+def run_backend(
+    backend: str,
+    dataset: Dataset,
+    truth: Sequence[Set[Any]],
+    k: int = 10,
+    batch_size: int = 1000,
+    concurrency: int = 8,
+    store_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the ingest and query workload against one backend.
+
+    Args:
+        backend (str): Name registered in ``STORE_ADAPTERS``.
+        dataset (Dataset): Corpus and queries.
+        truth (Sequence[Set[Any]]): Exact top-k ids per query.
+        k (int): Results per query.
+        batch_size (int): Vectors per upsert call.
+        concurrency (int): Concurrent clients for the QPS measurement.
+        store_kwargs (Optional[Dict[str, Any]]): Extra adapter arguments.
+
+    Returns:
+        Dict[str, Any]: Metrics for the backend, or an "error" entry.
+    """
+    result: Dict[str, Any] = {"backend": backend}
+    store = None
+    try:
+        rss_before = current_rss_bytes()
+        store = create_store(backend, BENCH_COLLECTION, dataset.vectors.shape[1], **(store_kwargs or {}))
+        store.create_collection(recreate=True)
+
+        ingest_seconds = _ingest(store, dataset, batch_size)
+        latencies, results = _sequential_queries(store, dataset.queries, k)
+        qps_concurrent = _concurrent_qps(store, dataset.queries, k, concurrency)
+        rss_after = current_rss_bytes()
+
+        result.update({
+            "ingest_seconds": ingest_seconds,
+            "ingest_vectors_per_second": len(dataset.vectors) / ingest_seconds if ingest_seconds else 0.0,
+            "latency_ms_p50": percentile_ms(latencies, 50),
+            "latency_ms_p95": percentile_ms(latencies, 95),
+            "latency_ms_p99": percentile_ms(latencies, 99),
+            "qps_single_client": len(latencies) / sum(latencies) if sum(latencies) else 0.0,
+            "qps_concurrent": qps_concurrent,
+            "concurrency": concurrency,
+            "recall_at_k": recall_at_k(results, truth),
+            "rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+        })
+        info(
+            f"{backend}: {result['ingest_vectors_per_second']:.0f} vec/s ingest, "
+            f"p50={result['latency_ms_p50']:.2f}ms p99={result['latency_ms_p99']:.2f}ms, "
+            f"{result['qps_concurrent']:.0f} QPS @ {concurrency}, recall@{k}={result['recall_at_k']:.3f}",
+            service="benchmark",
+        )
+    except Exception as exc:
+        error(f"Benchmark failed for backend '{backend}': {exc}", service="benchmark")
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        if store is not None:
+            try:
+                store.close()
+            except Exception as exc:
+                error(f"Failed to close backend '{backend}': {exc}", service="benchmark")
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Run metadata recorded with every report so runs can be compared across commits.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+SUMMARY_COLUMNS = (
+    ("backend", "backend", "{}"),
+    ("ingest vec/s", "ingest_vectors_per_second", "{:.0f}"),
+    ("p50 ms", "latency_ms_p50", "{:.2f}"),
+    ("p95 ms", "latency_ms_p95", "{:.2f}"),
+    ("p99 ms", "latency_ms_p99", "{:.2f}"),
+    ("QPS x1", "qps_single_client", "{:.0f}"),
+    ("QPS xN", "qps_concurrent", "{:.0f}"),
+    ("recall@k", "recall_at_k", "{:.3f}"),
+    ("RSS +MB", "rss_delta_bytes", "{:.1f}"),
+)
+
+
+def summary_table(results: Sequence[Dict[str, Any]]) -> str:
+    """
+    Render backend results as a fixed-width text table.
+    """
+    rows = [[title for title, _, _ in SUMMARY_COLUMNS]]
+    failures = []
+    for result in results:
+        if "error" in result:
+            rows.append([result["backend"], "failed"] + [""] * (len(SUMMARY_COLUMNS) - 2))
+            failures.append(f"{result['backend']}: {result['error']}")
+            continue
+        row = []
+        for _, key, fmt in SUMMARY_COLUMNS:
+            value = result.get(key)
+            if key == "rss_delta_bytes" and value is not None:
+                value = value / (1024 * 1024)
+            row.append("n/a" if value is None else fmt.format(value))
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(SUMMARY_COLUMNS))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows]
+    return "\n".join(lines + failures)
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """
+    Relative change of every metric per backend between two reports.
+    """
+    before = {result["backend"]: result for result in baseline.get("results", [])}
+    lines = [f"Comparing {baseline.get('environment', {}).get('commit')} -> "
+             f"{current.get('environment', {}).get('commit')}"]
+    for result in current.get("results", []):
+        old = before.get(result["backend"])
+        if old is None or "error" in result or "error" in old:
+            continue
+        changes = []
+        for title, key, _ in SUMMARY_COLUMNS[1:]:
+            if old.get(key) and result.get(key) is not None:
+                changes.append(f"{title} {100.0 * (result[key] - old[key]) / old[key]:+.1f}%")
+        lines.append(f"{result['backend']}: " + ", ".join(changes))
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+"""
+Query latency of Weaviate's gRPC collections API against the GraphQL path.
+
+A synthetic corpus is loaded into a scratch collection with
+``insert_documents``. The same queries then run twice: once through
+``search_documents``, where the v4 client sends the vector over gRPC as packed
+float32, and once as the v3-style GraphQL ``Get { nearVector }`` query, where
+the vector is a decimal literal in the query text. The results are checked
+for the same top hits, and the report gives p50/p95/p99 latency and QPS for
+both paths.
+
+Runs against localhost:8080/50051 by default, or an embedded instance as a
+stand-in with ``--embedded``.
+
+Example:
+    python src/benchmark/weaviate_api.py --num-vectors 20000 --dim 384 --embedded
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.benchmark.datasets import synthetic_dataset
+from src.benchmark.runner import percentile_ms
+from src.utils import info
+from src.utils.logging_utils import set_level
+from src.weaviate_lite.config import get_weaviate_client, get_embedded_weaviate_client
+from src.weaviate_lite.index_utils import create_schema, insert_documents
+from src.weaviate_lite.search_utils import search_documents
+
+COLLECTION = "BenchmarkApi"
+
+
+def graphql_search(client, query_vector: np.ndarray, class_name: str, limit: int) -> List[str]:
+    """
+    The previous search path: a GraphQL near-vector query, parsed from nested dicts.
+    """
+    vector = ", ".join(repr(float(x)) for x in query_vector)
+    response = client.graphql_raw_query(
+        "{ Get { %s(nearVector: {vector: [%s]}, limit: %d) { text _additional { id distance } } } }"
+        % (class_name, vector, limit)
+    )
+    return [hit["_additional"]["id"] for hit in (response.get or {}).get(class_name, [])]
+
+
+def grpc_search(client, query_vector: np.ndarray, class_name: str, limit: int) -> List[str]:
+    return [result.id for result in search_documents(client, query_vector, class_name, limit,
+                                                     return_properties=["text"])]
+
+
+def time_queries(search: Callable[..., List[str]], client, queries: np.ndarray, k: int) -> Dict[str, Any]:
+    search(client, queries[0], COLLECTION, k)  # warm-up
+    latencies, ids = [], []
+    started = time.perf_counter()
+    for query in queries:
+        begin = time.perf_counter()
+        ids.append(search(client, query, COLLECTION, k))
+        latencies.append(time.perf_counter() - begin)
+    seconds = time.perf_counter() - started
+    return {
+        "ids": ids,
+        "latency_ms_p50": percentile_ms(latencies, 50),
+        "latency_ms_p95": percentile_ms(latencies, 95),
+        "latency_ms_p99": percentile_ms(latencies, 99),
+        "qps": len(queries) / seconds if seconds else 0.0,
+    }
+
+
+def overlap(left: Sequence[List[str]], right: Sequence[List[str]]) -> float:
+    """
+    Mean fraction of shared ids between two result lists per query.
+    """
+    shared = [len(set(a) & set(b)) / max(1, len(a)) for a, b in zip(left, right)]
+    return float(np.mean(shared)) if shared else 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare Weaviate gRPC and GraphQL query latency.")
+    parser.add_argument("--num-vectors", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--embedded", action="store_true", help="Use an embedded instance instead of localhost")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dataset = synthetic_dataset(args.num_vectors, args.dim, args.num_queries, seed=args.seed)
+    client = get_embedded_weaviate_client() if args.embedded else get_weaviate_client()
+    # Per-query search logs would be part of the measured latency.
+    set_level("WARNING", "search_utils")
+    try:
+        create_schema(client, COLLECTION)
+        summary = insert_documents(client, [str(i) for i in range(len(dataset.vectors))], dataset.vectors,
+                                   COLLECTION)
+        info(f"Loaded {summary.inserted} vectors at {summary.objects_per_second:.0f} objects/s",
+             service="benchmark")
+
+        grpc = time_queries(grpc_search, client, dataset.queries, args.k)
+        graphql = time_queries(graphql_search, client, dataset.queries, args.k)
+        report = {
+            "num_vectors": len(dataset.vectors),
+            "dim": args.dim,
+            "num_queries": len(dataset.queries),
+            "k": args.k,
+            "top_k_overlap": overlap(grpc.pop("ids"), graphql.pop("ids")),
+            "grpc": grpc,
+            "graphql": graphql,
+            "p50_speedup": graphql["latency_ms_p50"] / grpc["latency_ms_p50"] if grpc["latency_ms_p50"] else 0.0,
+        }
+        print(json.dumps(report, indent=2))
+    finally:
+        client.collections.delete(COLLECTION)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
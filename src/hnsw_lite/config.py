@@ -0,0 +1,38 @@
+"""HNSW in-process backend configuration setup"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.hnsw_lite.engine import HNSWClient
+from src.utils.logging_utils import info, error
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
+
+COLLECTION_NAME = "demo_collection"
+VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
+HNSW_INDEX_PATH = os.path.join(ROOT_DIR, "hnsw_data")
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+def get_hnsw_client(path: str = HNSW_INDEX_PATH) -> HNSWClient:
+    try:
+        client = HNSWClient(path)
+        info(f"✅ HNSW client initialized at '{path}'")
+        return client
+    except Exception as e:
+        error(f"❌ Failed to initialize HNSW client: {e}")
+        raise
+
+def get_embedding_model():
+    try:
+        model = get_encoder(EMBEDDING_MODEL_NAME)
+        info("📐 Embedding model ready")
+        return model
+    except Exception as e:
+        error(f"❌ Failed to load embedding model: {e}")
+        raise
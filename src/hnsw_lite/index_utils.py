@@ -0,0 +1,66 @@
+"""Index creation, insertion and persistence utilities for the HNSW backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.hnsw_lite.config import HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH
+from src.hnsw_lite.engine import HNSWClient
+from src.utils.logging_utils import info, error
+from src.utils.id_allocator import resolve_ids
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, remove_texts, drop_sparse_index
+from typing import Any, List, Optional, Sequence
+
+def create_hnsw_collection(client: HNSWClient, collection_name: str, vector_dim: int,
+                           M: int = HNSW_M, ef_construction: int = HNSW_EF_CONSTRUCTION,
+                           ef_search: int = HNSW_EF_SEARCH, metric: str = "cosine") -> None:
+    try:
+        client.recreate_collection(collection_name, vector_dim, M=M, ef_construction=ef_construction,
+                                   ef_search=ef_search, metric=metric)
+        info(f"📦 HNSW collection '{collection_name}' created (M={M}, ef_construction={ef_construction})")
+    except Exception as e:
+        error(f"❌ Failed to create collection: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("hnsw", client), collection_name)
+        drop_sparse_index(client_scope("hnsw", client), collection_name)
+        if client.path is not None:
+            drop_manifest("hnsw", collection_name)
+
+def insert_data(client: HNSWClient, collection_name: str, embeddings: Any, texts: List[str],
+                start_id: Optional[int] = None, ids: Optional[Sequence[int]] = None) -> None:
+    try:
+        ids = resolve_ids(texts, ids=ids, start_id=start_id).tolist()
+        client.get_collection(collection_name).upsert(ids, embeddings, [{"text": text} for text in texts])
+        index_texts(client_scope("hnsw", client), collection_name, ids, texts)
+        info("✅ Data inserted into HNSW collection")
+    except Exception as e:
+        error(f"❌ Failed to insert data: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("hnsw", client), collection_name)
+
+def delete_data(client: HNSWClient, collection_name: str, ids: List[Any]) -> int:
+    try:
+        removed = client.get_collection(collection_name).delete(ids)
+        remove_texts(client_scope("hnsw", client), collection_name, ids)
+        info(f"🗑️ Tombstoned {removed} points in HNSW collection '{collection_name}'")
+        return removed
+    except Exception as e:
+        error(f"❌ Failed to delete data: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("hnsw", client), collection_name)
+
+def save_collection(client: HNSWClient, collection_name: str) -> None:
+    try:
+        directory = client.save(collection_name)
+        info(f"💾 HNSW collection '{collection_name}' saved to '{directory}'")
+    except Exception as e:
+        error(f"❌ Failed to save collection: {e}")
+        raise
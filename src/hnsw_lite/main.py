@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Fix import path for development
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+from src.hnsw_lite.config import get_hnsw_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM, EMBEDDING_MODEL_NAME
+from src.hnsw_lite.index_utils import create_hnsw_collection, insert_data, save_collection
+from src.hnsw_lite.search_utils import search_hnsw, measure_recall
+from src.utils.embedding_cache import get_embedding_cache
+
+def main():
+    client = get_hnsw_client()
+    model = get_embedding_model()
+    cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
+
+    create_hnsw_collection(client, COLLECTION_NAME, VECTOR_DIM)
+
+    texts = [
+        "Artificial intelligence was founded as an academic discipline in 1956.",
+        "Alan Turing was the first person to conduct substantial research in AI."
+    ]
+    embeddings = cache.encode(model, texts)
+    insert_data(client, COLLECTION_NAME, embeddings, texts)
+    save_collection(client, COLLECTION_NAME)
+
+    query = model.encode(["Who is Alan Turing?"])[0]
+    results = search_hnsw(client, COLLECTION_NAME, query)
+
+    for result in results:
+        print(result)
+
+    # Recall and latency against exact search on a synthetic collection
+    rng = np.random.default_rng(0)
+    synthetic = rng.standard_normal((5000, VECTOR_DIM)).astype(np.float32)
+    create_hnsw_collection(client, "recall_check", VECTOR_DIM)
+    client.get_collection("recall_check").upsert(list(range(len(synthetic))), synthetic)
+    measure_recall(client.get_collection("recall_check"), rng.standard_normal((100, VECTOR_DIM)), k=10)
+
+if __name__ == "__main__":
+    main()
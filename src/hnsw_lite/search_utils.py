@@ -0,0 +1,73 @@
+"""Search and recall measurement utilities for the HNSW backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+import time
+import numpy as np
+from src.hnsw_lite.engine import HNSWClient, HNSWIndex
+from src.numpy_lite.engine import FlatIndex
+from src.utils.logging_utils import info, error
+from src.utils.vector_store import SearchResult, Filters
+from typing import Any, Dict, List, Optional, Sequence
+
+def search_hnsw(client: HNSWClient, collection_name: str, query: Any, limit: int = 2,
+                ef_search: Optional[int] = None,
+                filters: Optional[Filters] = None) -> List[SearchResult]:
+    try:
+        results = client.get_collection(collection_name).search(query, k=limit, ef_search=ef_search,
+                                                                filters=filters)[0]
+        info("🔍 Search completed with %d results", len(results), operation="search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
+
+def search_hnsw_batch(client: HNSWClient, collection_name: str, queries: Any, limit: int = 2,
+                      ef_search: Optional[int] = None,
+                      filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+    try:
+        results = client.get_collection(collection_name).search(queries, k=limit, ef_search=ef_search,
+                                                                filters=filters)
+        info("🔍 Batch search completed for %d queries", len(results), operation="batch_search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
+
+def measure_recall(index: HNSWIndex, queries: Any, k: int = 10,
+                   ef_values: Sequence[int] = (16, 32, 64, 128, 256)) -> List[Dict[str, float]]:
+    """
+    Compare HNSW results with exact brute-force results for several ef_search values.
+
+    Returns one row per ef value with recall@k and per-query latency (mean/p50/p99, in ms).
+    """
+    ids, vectors, _ = index.live_items()
+    exact = FlatIndex(index.dimension, index.metric)
+    exact.upsert(ids, vectors)
+    truth = [{hit.id for hit in hits} for hits in exact.search(queries, k=k)]
+
+    queries = np.asarray(queries, dtype=np.float32)
+    report = []
+    for ef in ef_values:
+        latencies = []
+        hits_found = 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            hits = index.search(query, k=k, ef_search=ef)[0]
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            hits_found += len(expected & {hit.id for hit in hits})
+        row = {
+            "ef_search": ef,
+            "recall_at_k": hits_found / max(1, sum(len(expected) for expected in truth)),
+            "latency_ms_mean": float(np.mean(latencies)),
+            "latency_ms_p50": float(np.percentile(latencies, 50)),
+            "latency_ms_p99": float(np.percentile(latencies, 99)),
+        }
+        info(f"📈 ef_search={ef}: recall@{k}={row['recall_at_k']:.3f}, "
+             f"p50={row['latency_ms_p50']:.2f}ms, p99={row['latency_ms_p99']:.2f}ms")
+        report.append(row)
+    return report
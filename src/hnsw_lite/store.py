@@ -0,0 +1,71 @@
+"""VectorStore adapter for the HNSW in-process backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.hnsw_lite.config import get_hnsw_client, HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH
+from src.hnsw_lite.engine import HNSWClient
+from src.hnsw_lite.search_utils import search_hnsw, search_hnsw_batch
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.query_cache import invalidate_collection
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, remove_texts, drop_sparse_index, payload_texts
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class HNSWStore(VectorStore):
+    """Approximate in-process VectorStore backed by HNSWIndex."""
+
+    backend = "hnsw"
+
+    def __init__(self, collection_name: str, dimension: int, client: Optional[HNSWClient] = None,
+                 M: int = HNSW_M, ef_construction: int = HNSW_EF_CONSTRUCTION,
+                 ef_search: int = HNSW_EF_SEARCH, metric: str = "cosine") -> None:
+        super().__init__(collection_name, dimension)
+        self.client = client if client is not None else get_hnsw_client()
+        self.scope = client_scope(self.backend, self.client)
+        self.persistent = self.client.path is not None
+        self.params = {"M": M, "ef_construction": ef_construction, "ef_search": ef_search, "metric": metric}
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate or not self.client.collection_exists(self.collection_name):
+            self.client.recreate_collection(self.collection_name, self.dimension, **self.params)
+            invalidate_collection(self.scope, self.collection_name)
+            drop_sparse_index(self.scope, self.collection_name)
+            if self.persistent:
+                drop_manifest(self.backend, self.collection_name)
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        try:
+            count = self.client.get_collection(self.collection_name).upsert(ids, vectors, payloads)
+            index_texts(self.scope, self.collection_name, ids, payload_texts(payloads))
+            return count
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            removed = self.client.get_collection(self.collection_name).delete(ids)
+            remove_texts(self.scope, self.collection_name, ids)
+            return removed
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return len(self.client.get_collection(self.collection_name))
+
+    def search(self, query_vector: Any, k: int = 10,
+               filters: Optional[Filters] = None) -> List[SearchResult]:
+        return search_hnsw(self.client, self.collection_name, query_vector, limit=k, filters=filters)
+
+    def batch_search(self, query_vectors: Any, k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        return search_hnsw_batch(self.client, self.collection_name, query_vectors, limit=k, filters=filters)
+
+    def close(self) -> None:
+        if self.client.path is not None and self.client.has_unsaved_changes(self.collection_name):
+            self.client.save(self.collection_name)
@@ -0,0 +1,40 @@
+"""IVF-PQ in-process backend configuration setup"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.ivfpq_lite.engine import IVFPQClient
+from src.utils.logging_utils import info, error
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
+
+COLLECTION_NAME = "demo_collection"
+VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
+IVFPQ_DATA_PATH = os.path.join(ROOT_DIR, "ivfpq_data")
+# 256 lists and 48 one-byte sub-quantizers: 48 bytes per 384-dim vector instead of 1536.
+IVFPQ_NLIST = 256
+IVFPQ_M = 48
+IVFPQ_NPROBE = 16
+IVFPQ_RERANK_K = 100
+
+def get_ivfpq_client(path: str = IVFPQ_DATA_PATH) -> IVFPQClient:
+    try:
+        client = IVFPQClient(path)
+        info(f"✅ IVF-PQ client initialized at '{path}'")
+        return client
+    except Exception as e:
+        error(f"❌ Failed to initialize IVF-PQ client: {e}")
+        raise
+
+def get_embedding_model():
+    try:
+        model = get_encoder(EMBEDDING_MODEL_NAME)
+        info("📐 Embedding model ready")
+        return model
+    except Exception as e:
+        error(f"❌ Failed to load embedding model: {e}")
+        raise
@@ -0,0 +1,405 @@
+"""
+IVF-PQ (inverted file + product quantization) compressed index in NumPy.
+
+Vectors are first assigned to one of ``nlist`` coarse k-means centroids
+(the inverted lists). The residual to that centroid is split into ``m``
+sub-vectors and each is replaced by the index of its nearest centroid in a
+256-entry per-subspace codebook, so a vector is stored as ``m`` bytes
+(8-64 bytes instead of 1.5 KB for 384 float32 dims).
+
+Queries probe the ``nprobe`` closest lists and score their codes with
+asymmetric distance computation: one (m, 256) table of query-to-codeword
+distances per probed list, then a table lookup per code. Optionally the best
+``rerank_k`` candidates are re-scored exactly against full-precision vectors
+kept in an append-only float32 file on disk and read through ``numpy.memmap``.
+
+The knobs that trade memory for recall are ``m`` (bytes per vector),
+``nlist``/``nprobe`` (how much of the collection is scanned) and ``rerank_k``.
+
+Payload filters are applied inside the probed lists, before the codes are
+scored. A selective filter probes every list (pre-filter: only matching codes
+are scored anywhere); a broad one raises ``nprobe`` by the inverse
+selectivity so enough matching candidates are still found (post-filter).
+"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.utils.vector_store import SearchResult, Filters
+from src.utils.payload_index import PayloadIndex, plan, PREFILTER_SELECTIVITY
+
+METRICS = ("cosine", "euclidean")
+CODEBOOK_SIZE = 256
+# Rows of the (points x centroids) distance block computed at once during training/assignment.
+ASSIGN_BLOCK = 16384
+
+
+def _sq_distances(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Squared euclidean distances between every row of data and every centroid."""
+    data_sq = np.einsum("ij,ij->i", data, data)[:, np.newaxis]
+    centroid_sq = np.einsum("ij,ij->i", centroids, centroids)[np.newaxis, :]
+    return np.maximum(data_sq - 2.0 * data @ centroids.T + centroid_sq, 0.0)
+
+
+def assign(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid for every row, computed in blocks."""
+    labels = np.empty(data.shape[0], dtype=np.int64)
+    for start in range(0, data.shape[0], ASSIGN_BLOCK):
+        block = data[start:start + ASSIGN_BLOCK]
+        labels[start:start + ASSIGN_BLOCK] = np.argmin(_sq_distances(block, centroids), axis=1)
+    return labels
+
+
+def kmeans(data: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """
+    Lloyd's k-means in NumPy.
+
+    Args:
+        data (np.ndarray): (n, d) float32 training points.
+        k (int): Number of centroids. May exceed n, in which case points are reused.
+        iterations (int): Lloyd iterations.
+        seed (int): Random seed for initialization and empty-cluster repair.
+
+    Returns:
+        np.ndarray: (k, d) float32 centroids.
+    """
+    rng = np.random.default_rng(seed)
+    n = data.shape[0]
+    centroids = data[rng.choice(n, size=k, replace=n < k)].astype(np.float32, copy=True)
+    for _ in range(iterations):
+        labels = assign(data, centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        nonempty = counts > 0
+        centroids[nonempty] = sums[nonempty] / counts[nonempty, np.newaxis]
+        empty = np.flatnonzero(~nonempty)
+        if empty.size:
+            centroids[empty] = data[rng.choice(n, size=empty.size)]
+    return centroids
+
+
+class FloatStore:
+    """
+    Append-only float32 matrix on disk, read back through ``numpy.memmap``.
+
+    Args:
+        path (str): File holding the raw row-major vectors.
+        dimension (int): Vector dimension.
+    """
+
+    def __init__(self, path: str, dimension: int) -> None:
+        self.path = path
+        self.dimension = dimension
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        open(path, "wb").close()
+        self._rows = 0
+        self._mmap: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, vectors: np.ndarray) -> None:
+        with open(self.path, "ab") as handle:
+            handle.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._rows += vectors.shape[0]
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        if self._mmap is None or self._mmap.shape[0] < self._rows:
+            self._mmap = np.memmap(self.path, dtype=np.float32, mode="r", shape=(self._rows, self.dimension))
+        # Read in file order for locality, then restore the requested order.
+        order = np.argsort(rows)
+        out = np.empty((rows.size, self.dimension), dtype=np.float32)
+        out[order] = self._mmap[rows[order]]
+        return out
+
+
+class IVFPQIndex:
+    """
+    Memory-bounded approximate index.
+
+    Args:
+        dimension (int): Vector dimension; must be divisible by ``m``.
+        nlist (int): Number of inverted lists (coarse centroids).
+        m (int): Sub-quantizers, i.e. bytes per stored code.
+        nprobe (int): Default number of lists scanned per query.
+        metric (str): "cosine" (vectors are normalized) or "euclidean".
+        rerank_path (Optional[str]): File for the on-disk float store. None disables re-ranking.
+        rerank_k (int): Default number of ADC candidates re-scored exactly when re-ranking.
+        seed (int): Random seed for training.
+
+    Attributes:
+        prefilter_selectivity (float): Estimated filter selectivity at or below which every
+            list is probed for the matching codes.
+    """
+
+    def __init__(self, dimension: int, nlist: int = 256, m: int = 16, nprobe: int = 8,
+                 metric: str = "cosine", rerank_path: Optional[str] = None,
+                 rerank_k: int = 100, seed: int = 0) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', expected one of {METRICS}")
+        if dimension % m:
+            raise ValueError(f"Dimension {dimension} is not divisible by m={m}")
+        self.dimension = dimension
+        self.nlist = nlist
+        self.m = m
+        self.dsub = dimension // m
+        self.nprobe = nprobe
+        self.metric = metric
+        self.rerank_k = rerank_k
+        self.seed = seed
+        self.coarse: Optional[np.ndarray] = None
+        self.codebooks: Optional[np.ndarray] = None
+        self._float_store = FloatStore(rerank_path, dimension) if rerank_path else None
+
+        # Per inverted list: chunks of codes / internal rows, concatenated lazily.
+        self._list_codes: List[List[np.ndarray]] = [[] for _ in range(nlist)]
+        self._list_rows: List[List[np.ndarray]] = [[] for _ in range(nlist)]
+        self._ids: List[Any] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._rows: Dict[Any, int] = {}
+        self._deleted = np.zeros(0, dtype=bool)
+        self._filter_index = PayloadIndex()
+        self.prefilter_selectivity = PREFILTER_SELECTIVITY
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.coarse is not None
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {matrix.shape[1]}")
+        if self.metric == "cosine":
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        return matrix
+
+    def _score(self, sq_distances: np.ndarray) -> np.ndarray:
+        # On unit vectors ||a - b||^2 = 2 - 2 cos(a, b).
+        if self.metric == "cosine":
+            return 1.0 - sq_distances / 2.0
+        return -sq_distances
+
+    # ------------------------------------------------------------------ training / encoding
+
+    def train(self, vectors: Any, iterations: int = 20) -> None:
+        """
+        Train coarse centroids and PQ codebooks on a representative sample.
+        """
+        sample = self._prepare(vectors)
+        with self._lock:
+            self.coarse = kmeans(sample, self.nlist, iterations, self.seed)
+            residuals = sample - self.coarse[assign(sample, self.coarse)]
+            codebooks = np.empty((self.m, CODEBOOK_SIZE, self.dsub), dtype=np.float32)
+            for sub in range(self.m):
+                block = np.ascontiguousarray(residuals[:, sub * self.dsub:(sub + 1) * self.dsub])
+                codebooks[sub] = kmeans(block, CODEBOOK_SIZE, iterations, self.seed + sub + 1)
+            self.codebooks = codebooks
+
+    def encode(self, vectors: np.ndarray, lists: np.ndarray) -> np.ndarray:
+        """PQ codes (n, m) uint8 of the residuals of already prepared vectors."""
+        residuals = vectors - self.coarse[lists]
+        codes = np.empty((vectors.shape[0], self.m), dtype=np.uint8)
+        for sub in range(self.m):
+            block = np.ascontiguousarray(residuals[:, sub * self.dsub:(sub + 1) * self.dsub])
+            codes[:, sub] = assign(block, self.codebooks[sub])
+        return codes
+
+    def decode(self, codes: np.ndarray, lists: np.ndarray) -> np.ndarray:
+        """Approximate reconstruction of encoded vectors."""
+        parts = [self.codebooks[sub][codes[:, sub]] for sub in range(self.m)]
+        return np.concatenate(parts, axis=1) + self.coarse[lists]
+
+    # ------------------------------------------------------------------ writes
+
+    def add(self, ids: Sequence[Any], vectors: Any,
+            payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """
+        Encode and append points; an existing id is tombstoned and re-added.
+
+        Raises:
+            RuntimeError: If the index has not been trained.
+        """
+        if not self.is_trained:
+            raise RuntimeError("IVF-PQ index must be trained before adding vectors")
+        matrix = self._prepare(vectors)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids but {matrix.shape[0]} vectors")
+        payloads = payloads if payloads is not None else [{} for _ in ids]
+        lists = assign(matrix, self.coarse)
+        codes = self.encode(matrix, lists)
+        with self._lock:
+            start = len(self._ids)
+            rows = np.arange(start, start + len(ids), dtype=np.int64)
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(ids), dtype=bool)])
+            for point_id, row, payload in zip(ids, rows.tolist(), payloads):
+                old = self._rows.get(point_id)
+                if old is not None:
+                    self._deleted[old] = True
+                self._rows[point_id] = row
+                self._ids.append(point_id)
+                self._payloads.append(dict(payload))
+            for list_id in np.unique(lists).tolist():
+                members = lists == list_id
+                self._list_codes[list_id].append(codes[members])
+                self._list_rows[list_id].append(rows[members])
+            if self._float_store is not None:
+                self._float_store.append(matrix)
+        return len(ids)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        removed = 0
+        with self._lock:
+            for point_id in ids:
+                row = self._rows.pop(point_id, None)
+                if row is not None:
+                    self._deleted[row] = True
+                    removed += 1
+        return removed
+
+    def _list_arrays(self, list_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        codes, rows = self._list_codes[list_id], self._list_rows[list_id]
+        if len(codes) > 1:
+            self._list_codes[list_id] = codes = [np.concatenate(codes)]
+            self._list_rows[list_id] = rows = [np.concatenate(rows)]
+        if not codes:
+            return np.empty((0, self.m), dtype=np.uint8), np.empty(0, dtype=np.int64)
+        return codes[0], rows[0]
+
+    # ------------------------------------------------------------------ search
+
+    def search(self, query_vectors: Any, k: int = 10, nprobe: Optional[int] = None,
+               rerank: Optional[bool] = None, rerank_k: Optional[int] = None,
+               filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        """
+        Approximate top-k for one query or a batch of queries.
+
+        Args:
+            query_vectors (Any): One vector or a (n, dim) matrix.
+            k (int): Results per query.
+            nprobe (Optional[int]): Lists scanned per query; defaults to the index setting.
+            rerank (Optional[bool]): Re-score candidates exactly; defaults to True when a float store exists.
+            rerank_k (Optional[int]): ADC candidates passed to re-ranking.
+            filters (Optional[Filters]): Payload filter dict or expression.
+
+        Returns:
+            List[List[SearchResult]]: One list per query, ordered by decreasing score.
+        """
+        if not self.is_trained:
+            raise RuntimeError("IVF-PQ index must be trained before searching")
+        queries = self._prepare(query_vectors)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        rerank = self._float_store is not None if rerank is None else rerank
+        if rerank and self._float_store is None:
+            raise ValueError("Re-ranking requires the index to be created with a rerank_path")
+        shortlist = max(k, rerank_k or self.rerank_k) if rerank else k
+        sub_index = np.arange(self.m)
+
+        results: List[List[SearchResult]] = []
+        with self._lock:
+            filter_plan = plan(self._filter_index, filters, self._payloads, self.prefilter_selectivity)
+            allowed = filter_plan.mask
+            if filter_plan.strategy == "pre":
+                nprobe = self.nlist
+            elif filter_plan.strategy == "post":
+                nprobe = filter_plan.overfetch(nprobe, self.nlist)
+            probes = np.argsort(_sq_distances(queries, self.coarse), axis=1)[:, :nprobe]
+            for query, probed in zip(queries, probes):
+                candidate_rows, candidate_dist = [], []
+                for list_id in probed.tolist():
+                    codes, rows = self._list_arrays(list_id)
+                    live = ~self._deleted[rows]
+                    if allowed is not None:
+                        live &= allowed[rows]
+                    if not live.all():
+                        codes, rows = codes[live], rows[live]
+                    if rows.size == 0:
+                        continue
+                    residual = (query - self.coarse[list_id]).reshape(self.m, 1, self.dsub)
+                    table = np.sum((self.codebooks - residual) ** 2, axis=2)
+                    candidate_rows.append(rows)
+                    candidate_dist.append(table[sub_index, codes].sum(axis=1))
+                if not candidate_rows:
+                    results.append([])
+                    continue
+                rows = np.concatenate(candidate_rows)
+                distances = np.concatenate(candidate_dist)
+                if rows.size > shortlist:
+                    keep = np.argpartition(distances, shortlist - 1)[:shortlist]
+                    rows, distances = rows[keep], distances[keep]
+                if rerank:
+                    exact = self._float_store.take(rows) - query
+                    distances = np.einsum("ij,ij->i", exact, exact)
+                order = np.argsort(distances, kind="stable")[:k]
+                scores = self._score(distances[order])
+                results.append([
+                    SearchResult(id=self._ids[row], score=float(score), payload=self._payloads[row])
+                    for row, score in zip(rows[order].tolist(), scores.tolist())
+                ])
+        return results
+
+    # ------------------------------------------------------------------ reporting
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Bytes held in RAM by the compressed index compared with raw float32 storage.
+        """
+        with self._lock:
+            code_bytes = sum(chunk.nbytes for chunks in self._list_codes for chunk in chunks)
+            row_bytes = sum(chunk.nbytes for chunks in self._list_rows for chunk in chunks)
+            model_bytes = (self.coarse.nbytes if self.coarse is not None else 0) + \
+                          (self.codebooks.nbytes if self.codebooks is not None else 0)
+            return {
+                "vectors": len(self._ids),
+                "code_bytes": code_bytes,
+                "list_row_bytes": row_bytes,
+                "model_bytes": model_bytes,
+                "total_bytes": code_bytes + row_bytes + model_bytes,
+                "float32_bytes": len(self._ids) * self.dimension * 4,
+                "bytes_per_vector": self.m,
+            }
+
+
+class IVFPQClient:
+    """
+    In-process client holding named IVF-PQ collections.
+
+    Args:
+        path (Optional[str]): Directory for the per-collection float stores used by re-ranking.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._collections: Dict[str, IVFPQIndex] = {}
+        self._lock = threading.Lock()
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return collection_name in self._collections
+
+    def recreate_collection(self, collection_name: str, dimension: int, rerank: bool = True,
+                            **params: Any) -> IVFPQIndex:
+        rerank_path = os.path.join(self.path, f"{collection_name}.f32") if rerank and self.path else None
+        with self._lock:
+            collection = IVFPQIndex(dimension, rerank_path=rerank_path, **params)
+            self._collections[collection_name] = collection
+            return collection
+
+    def get_collection(self, collection_name: str) -> IVFPQIndex:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            raise KeyError(f"Collection '{collection_name}' does not exist")
+        return collection
@@ -0,0 +1,62 @@
+"""Index creation, training and insertion utilities for the IVF-PQ backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.ivfpq_lite.config import IVFPQ_NLIST, IVFPQ_M, IVFPQ_NPROBE, IVFPQ_RERANK_K
+from src.ivfpq_lite.engine import IVFPQClient
+from src.utils.logging_utils import info, warning, error
+from src.utils.resource_utils import format_bytes
+from src.utils.id_allocator import resolve_ids
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sparse_index import index_texts, drop_sparse_index
+from typing import Any, List, Optional, Sequence
+
+def create_ivfpq_collection(client: IVFPQClient, collection_name: str, vector_dim: int,
+                            nlist: int = IVFPQ_NLIST, m: int = IVFPQ_M, nprobe: int = IVFPQ_NPROBE,
+                            rerank: bool = True, rerank_k: int = IVFPQ_RERANK_K,
+                            metric: str = "cosine") -> None:
+    try:
+        client.recreate_collection(collection_name, vector_dim, rerank=rerank, nlist=nlist, m=m,
+                                   nprobe=nprobe, rerank_k=rerank_k, metric=metric)
+        info(f"📦 IVF-PQ collection '{collection_name}' created (nlist={nlist}, {m} bytes/vector)")
+    except Exception as e:
+        error(f"❌ Failed to create collection: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("ivfpq", client), collection_name)
+        drop_sparse_index(client_scope("ivfpq", client), collection_name)
+
+def train_collection(client: IVFPQClient, collection_name: str, sample: Any, iterations: int = 20) -> None:
+    try:
+        collection = client.get_collection(collection_name)
+        if len(sample) < collection.nlist * 39:
+            warning(f"⚠️ Training IVF-PQ on {len(sample)} vectors; "
+                    f"at least {collection.nlist * 39} are recommended for nlist={collection.nlist}")
+        collection.train(sample, iterations=iterations)
+        info(f"🎓 IVF-PQ collection '{collection_name}' trained on {len(sample)} vectors")
+    except Exception as e:
+        error(f"❌ Failed to train collection: {e}")
+        raise
+
+def insert_data(client: IVFPQClient, collection_name: str, embeddings: Any, texts: List[str],
+                start_id: Optional[int] = None, ids: Optional[Sequence[int]] = None) -> None:
+    try:
+        collection = client.get_collection(collection_name)
+        if not collection.is_trained:
+            train_collection(client, collection_name, embeddings)
+        ids = resolve_ids(texts, ids=ids, start_id=start_id).tolist()
+        collection.add(ids, embeddings, [{"text": text} for text in texts])
+        index_texts(client_scope("ivfpq", client), collection_name, ids, texts)
+        usage = collection.memory_usage()
+        info(f"✅ Data inserted into IVF-PQ collection ({format_bytes(usage['total_bytes'])} in RAM "
+             f"vs {format_bytes(usage['float32_bytes'])} as float32)")
+    except Exception as e:
+        error(f"❌ Failed to insert data: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("ivfpq", client), collection_name)
@@ -0,0 +1,43 @@
+import sys
+import os
+
+# Fix import path for development
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np
+from src.ivfpq_lite.config import get_ivfpq_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM, EMBEDDING_MODEL_NAME
+from src.ivfpq_lite.index_utils import create_ivfpq_collection, train_collection, insert_data
+from src.ivfpq_lite.search_utils import search_ivfpq, measure_tradeoff
+from src.utils.embedding_cache import get_embedding_cache
+
+def main():
+    client = get_ivfpq_client()
+    model = get_embedding_model()
+    cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
+
+    # A two-document corpus cannot train 256 lists; use a handful instead.
+    create_ivfpq_collection(client, COLLECTION_NAME, VECTOR_DIM, nlist=1, m=48)
+
+    texts = [
+        "Artificial intelligence was founded as an academic discipline in 1956.",
+        "Alan Turing was the first person to conduct substantial research in AI."
+    ]
+    embeddings = cache.encode(model, texts)
+    train_collection(client, COLLECTION_NAME, embeddings, iterations=5)
+    insert_data(client, COLLECTION_NAME, embeddings, texts)
+
+    query = model.encode(["Who is Alan Turing?"])[0]
+    results = search_ivfpq(client, COLLECTION_NAME, query)
+
+    for result in results:
+        print(result)
+
+    # Memory vs recall on a synthetic collection
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((64, VECTOR_DIM))
+    corpus = centers[rng.integers(0, 64, 20000)] + 0.5 * rng.standard_normal((20000, VECTOR_DIM))
+    queries = centers[rng.integers(0, 64, 100)] + 0.5 * rng.standard_normal((100, VECTOR_DIM))
+    measure_tradeoff(corpus, queries, k=10, nlist=128, m_values=(8, 16, 48), nprobe_values=(4, 16))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Search and memory/recall trade-off utilities for the IVF-PQ backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+import tempfile
+import time
+import numpy as np
+from src.ivfpq_lite.engine import IVFPQClient, IVFPQIndex
+from src.numpy_lite.engine import FlatIndex
+from src.utils.logging_utils import info, error
+from src.utils.vector_store import SearchResult, Filters
+from typing import Any, Dict, List, Optional, Sequence
+
+def search_ivfpq(client: IVFPQClient, collection_name: str, query: Any, limit: int = 2,
+                 nprobe: Optional[int] = None, rerank: Optional[bool] = None,
+                 filters: Optional[Filters] = None) -> List[SearchResult]:
+    try:
+        results = client.get_collection(collection_name).search(query, k=limit, nprobe=nprobe, rerank=rerank,
+                                                                filters=filters)[0]
+        info("🔍 Search completed with %d results", len(results), operation="search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
+
+def search_ivfpq_batch(client: IVFPQClient, collection_name: str, queries: Any, limit: int = 2,
+                       nprobe: Optional[int] = None, rerank: Optional[bool] = None,
+                       filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+    try:
+        results = client.get_collection(collection_name).search(queries, k=limit, nprobe=nprobe, rerank=rerank,
+                                                                filters=filters)
+        info("🔍 Batch search completed for %d queries", len(results), operation="batch_search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
+
+def measure_tradeoff(vectors: Any, queries: Any, k: int = 10, nlist: int = 256,
+                     m_values: Sequence[int] = (8, 16, 32, 64),
+                     nprobe_values: Sequence[int] = (4, 16, 64),
+                     metric: str = "cosine") -> List[Dict[str, Any]]:
+    """
+    Build one IVF-PQ index per code size and report RAM, recall@k and latency
+    for every nprobe, with and without exact re-ranking.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    exact = FlatIndex(vectors.shape[1], metric)
+    exact.upsert(list(range(len(vectors))), vectors)
+    truth = [{hit.id for hit in hits} for hits in exact.search(queries, k=k)]
+
+    report = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for m in m_values:
+            index = IVFPQIndex(vectors.shape[1], nlist=nlist, m=m, metric=metric,
+                               rerank_path=os.path.join(workdir, f"m{m}.f32"))
+            index.train(vectors)
+            index.add(list(range(len(vectors))), vectors)
+            usage = index.memory_usage()
+            for nprobe in nprobe_values:
+                for rerank in (False, True):
+                    started = time.perf_counter()
+                    results = index.search(queries, k=k, nprobe=nprobe, rerank=rerank)
+                    elapsed = time.perf_counter() - started
+                    found = sum(len(expected & {hit.id for hit in hits}) for hits, expected in zip(results, truth))
+                    row = {
+                        "m": m,
+                        "nprobe": nprobe,
+                        "rerank": rerank,
+                        "ram_bytes": usage["total_bytes"],
+                        "compression": usage["float32_bytes"] / max(1, usage["total_bytes"]),
+                        "recall_at_k": found / max(1, sum(len(expected) for expected in truth)),
+                        "latency_ms_per_query": elapsed * 1000.0 / max(1, len(queries)),
+                    }
+                    info(f"📈 m={m} nprobe={nprobe} rerank={rerank}: recall@{k}={row['recall_at_k']:.3f}, "
+                         f"{row['compression']:.1f}x smaller, {row['latency_ms_per_query']:.2f}ms/query")
+                    report.append(row)
+    return report
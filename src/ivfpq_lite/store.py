@@ -0,0 +1,73 @@
+"""VectorStore adapter for the IVF-PQ in-process backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.ivfpq_lite.config import get_ivfpq_client, IVFPQ_NLIST, IVFPQ_M, IVFPQ_NPROBE, IVFPQ_RERANK_K
+from src.ivfpq_lite.engine import IVFPQClient
+from src.ivfpq_lite.search_utils import search_ivfpq_batch
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.query_cache import invalidate_collection
+from src.utils.sparse_index import index_texts, remove_texts, drop_sparse_index, payload_texts
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class IVFPQStore(VectorStore):
+    """
+    Compressed in-process VectorStore. The first upsert trains the quantizers,
+    so it should carry a representative sample of the collection.
+    """
+
+    backend = "ivfpq"
+    # Only the re-ranking floats go to disk; codes and lists live in memory.
+    persistent = False
+
+    def __init__(self, collection_name: str, dimension: int, client: Optional[IVFPQClient] = None,
+                 nlist: int = IVFPQ_NLIST, m: int = IVFPQ_M, nprobe: int = IVFPQ_NPROBE,
+                 rerank: bool = True, rerank_k: int = IVFPQ_RERANK_K, metric: str = "cosine") -> None:
+        super().__init__(collection_name, dimension)
+        self.client = client if client is not None else get_ivfpq_client()
+        self.scope = client_scope(self.backend, self.client)
+        self.rerank = rerank
+        self.params = {"nlist": nlist, "m": m, "nprobe": nprobe, "rerank_k": rerank_k, "metric": metric}
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate or not self.client.collection_exists(self.collection_name):
+            self.client.recreate_collection(self.collection_name, self.dimension, rerank=self.rerank,
+                                            **self.params)
+            invalidate_collection(self.scope, self.collection_name)
+            drop_sparse_index(self.scope, self.collection_name)
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        collection = self.client.get_collection(self.collection_name)
+        if not collection.is_trained:
+            collection.train(vectors)
+        try:
+            count = collection.add(ids, vectors, payloads)
+            index_texts(self.scope, self.collection_name, ids, payload_texts(payloads))
+            return count
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            removed = self.client.get_collection(self.collection_name).delete(ids)
+            remove_texts(self.scope, self.collection_name, ids)
+            return removed
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return len(self.client.get_collection(self.collection_name))
+
+    def search(self, query_vector: Any, k: int = 10,
+               filters: Optional[Filters] = None) -> List[SearchResult]:
+        return self.batch_search([query_vector], k=k, filters=filters)[0]
+
+    def batch_search(self, query_vectors: Any, k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        return search_ivfpq_batch(self.client, self.collection_name, query_vectors, limit=k, filters=filters)
@@ -10,13 +10,17 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
 from pymilvus import MilvusClient
-from sentence_transformers import SentenceTransformer
+from typing import Any
 from src.utils import info, error
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
 
 # Constants
-MILVUS_DB_PATH = "milvus_demo.db"
+# Milvus Lite file, or a server URI such as "http://localhost:19530".
+MILVUS_DB_PATH = os.getenv("MILVUS_URI", "milvus_demo.db")
 COLLECTION_NAME = "demo_collection"
 VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
 
 
 def get_milvus_client() -> MilvusClient:
@@ -35,17 +39,15 @@ def get_milvus_client() -> MilvusClient:
         raise
 
 
-def get_embedding_model() -> SentenceTransformer:
+def get_embedding_model() -> Any:
     """
-    Initialize and return the embedding model.
+    Return the process-wide shared embedding model.
 
     Returns:
-        SentenceTransformer: SentenceTransformer model instance.
+        Any: SentenceTransformer model, or the ONNX encoder for EMBEDDING_PRECISION=onnx.
     """
     try:
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        info("Embedding model 'all-MiniLM-L6-v2' loaded", service="config")
-        return model
+        return get_encoder(EMBEDDING_MODEL_NAME)
     except Exception as exc:
         error(f"Failed to load embedding model: {exc}", service="config")
         raise
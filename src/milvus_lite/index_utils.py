@@ -8,12 +8,82 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
-from pymilvus import MilvusClient
-from src.utils import info, debug, warning, error
-from typing import List, Dict, Any
+from pymilvus import DataType, MilvusClient
+from src.utils import info, error
+from src.utils.async_utils import get_limiter
+from src.utils.vector_buffers import DEFAULT_CONVERT_BATCH
+from src.utils.columnar import ColumnBatch
+from src.utils.id_allocator import IdAllocator
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, drop_sparse_index
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+from src.utils.ingestion import ingest_stream, IngestStats, DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence
 
 
-def recreate_collection(client: MilvusClient, collection_name: str, dimension: int) -> None:
+# Scalar field type and index per payload field type; VARCHAR fields need a maximum length.
+SCALAR_FIELDS = {
+    "keyword": (DataType.VARCHAR, "INVERTED"),
+    "integer": (DataType.INT64, "STL_SORT"),
+    "float": (DataType.DOUBLE, "STL_SORT"),
+    "bool": (DataType.BOOL, "BITMAP"),
+    "text": (DataType.VARCHAR, "INVERTED"),
+}
+MAX_VARCHAR_LENGTH = int(os.getenv("MILVUS_MAX_VARCHAR_LENGTH", "1024"))
+
+
+def create_milvus_collection(
+    client: MilvusClient,
+    collection_name: str,
+    dimension: int,
+    payload_schema: Optional[PayloadSchema] = None,
+) -> None:
+    """
+    Create a collection, with a scalar index per declared payload field.
+
+    Without declared fields this is the quick-setup collection (int64 "id",
+    "vector", dynamic payload fields, COSINE metric). With them the same
+    layout is spelled out, each declared field becomes a nullable typed
+    column (so rows without it still insert) and gets a scalar index:
+    INVERTED for keyword and text fields, STL_SORT for numeric ranges,
+    BITMAP for booleans. Undeclared payload keys stay dynamic.
+
+    Args:
+        client (MilvusClient): Milvus client.
+        collection_name (str): Collection name.
+        dimension (int): Vector dimension.
+        payload_schema (Optional[PayloadSchema]): {field: type}; defaults to PAYLOAD_SCHEMA.
+    """
+    payload_schema = validate_schema(DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema)
+    if not payload_schema:
+        client.create_collection(collection_name=collection_name, dimension=dimension)
+        info(f"Created collection '{collection_name}' with dimension {dimension}", service="index_utils")
+        return
+
+    schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)
+    schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True)
+    schema.add_field(field_name="vector", datatype=DataType.FLOAT_VECTOR, dim=dimension)
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name="vector", index_type="AUTOINDEX", metric_type="COSINE")
+    for field, field_type in payload_schema.items():
+        datatype, index_type = SCALAR_FIELDS[field_type]
+        extra = {"max_length": MAX_VARCHAR_LENGTH} if datatype == DataType.VARCHAR else {}
+        schema.add_field(field_name=field, datatype=datatype, nullable=True, **extra)
+        index_params.add_index(field_name=field, index_type=index_type, index_name=f"{field}_idx")
+
+    client.create_collection(collection_name=collection_name, schema=schema, index_params=index_params)
+    info(f"Created collection '{collection_name}' with dimension {dimension} "
+         f"and scalar indexes on {sorted(payload_schema)}", service="index_utils")
+
+
+def recreate_collection(
+    client: MilvusClient,
+    collection_name: str,
+    dimension: int,
+    payload_schema: Optional[PayloadSchema] = None,
+) -> None:
     """
     Drop collection if exists, then create a new one.
 
@@ -21,47 +91,88 @@ def recreate_collection(client: MilvusClient, collection_name: str, dimension: i
         client (MilvusClient): Milvus client.
         collection_name (str): Collection name.
         dimension (int): Vector dimension.
+        payload_schema (Optional[PayloadSchema]): Payload fields to index; defaults to PAYLOAD_SCHEMA.
     """
     try:
         if client.has_collection(collection_name):
             client.drop_collection(collection_name)
             info(f"Dropped existing collection '{collection_name}'", service="index_utils")
-        client.create_collection(collection_name=collection_name, dimension=dimension)
-        info(f"Created collection '{collection_name}' with dimension {dimension}", service="index_utils")
+        create_milvus_collection(client, collection_name, dimension, payload_schema)
     except Exception as exc:
         error(f"Failed to recreate collection '{collection_name}': {exc}", service="index_utils")
         raise
+    finally:
+        invalidate_collection(client_scope("milvus", client), collection_name)
+        drop_sparse_index(client_scope("milvus", client), collection_name)
+        drop_manifest("milvus", collection_name)
 
 
-def prepare_data(chunk_texts: List[str], embeddings: List[List[float]]) -> List[Dict[str, Any]]:
+def prepare_columns(
+    chunk_texts: List[str],
+    embeddings: Any,
+    start_id: Optional[int] = None,
+    columns: Optional[Dict[str, Any]] = None,
+    ids: Optional[Sequence[int]] = None,
+) -> ColumnBatch:
     """
-    Prepare data entries with id, vector, and text fields.
+    Prepare a column-oriented batch with id, vector, text and extra fields.
 
     Args:
         chunk_texts (List[str]): List of chunk texts.
-        embeddings (List[List[float]]): Corresponding embeddings.
+        embeddings (Any): Corresponding embeddings as an ndarray, buffer or list of lists.
+        start_id (Optional[int]): Id of the first entry, for positional ids.
+        columns (Optional[Dict[str, Any]]): Extra fields; a scalar is repeated for every entry.
+        ids (Optional[Sequence[int]]): Ids of the entries. Content ids are used when neither
+            ``ids`` nor ``start_id`` is given.
 
     Returns:
-        List[Dict[str, Any]]: List of dicts suitable for Milvus insert.
+        ColumnBatch: Ids array, vector matrix and payload columns.
     """
-    data = []
     try:
-        for i, text in enumerate(chunk_texts):
-            data.append({
-                "id": i,
-                "vector": embeddings[i],
-                "text": text,
-            })
-        info(f"Prepared {len(data)} data entries for insertion", service="index_utils")
-        return data
+        batch = ColumnBatch.from_texts(chunk_texts, embeddings, start_id, columns, ids=ids)
+        info(f"Prepared {len(batch)} entries as columns", service="index_utils")
+        return batch
     except Exception as exc:
         error(f"Error preparing data: {exc}", service="index_utils")
         raise
 
 
+def prepare_data(
+    chunk_texts: List[str],
+    embeddings: Any,
+    start_id: Optional[int] = None,
+    columns: Optional[Dict[str, Any]] = None,
+    ids: Optional[Sequence[int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Prepare data entries with id, vector, text and extra fields.
+
+    Rows are built in bulk from a ``ColumnBatch``; vectors are row views of
+    one float32 matrix that pymilvus serializes straight from the buffer.
+
+    Args:
+        chunk_texts (List[str]): List of chunk texts.
+        embeddings (Any): Corresponding embeddings as an ndarray, buffer or list of lists.
+        start_id (Optional[int]): Id of the first entry, for positional ids.
+        columns (Optional[Dict[str, Any]]): Extra fields; a scalar is repeated for every entry.
+        ids (Optional[Sequence[int]]): Ids of the entries. Content ids are used when neither
+            ``ids`` nor ``start_id`` is given.
+
+    Returns:
+        List[Dict[str, Any]]: List of dicts suitable for Milvus insert.
+    """
+    return prepare_columns(chunk_texts, embeddings, start_id, columns, ids=ids).to_rows()
+
+
 def insert_data(client: MilvusClient, collection_name: str, data: List[Dict[str, Any]]) -> None:
     """
-    Insert data into Milvus collection.
+    Upsert data into Milvus collection.
+
+    Milvus does not enforce primary-key uniqueness on insert, so rows are
+    upserted: re-ingesting a text under its content id replaces its entity
+    instead of adding a duplicate. Rows repeating an id within ``data`` are
+    collapsed to the last one, since Milvus rejects a request with duplicate
+    primary keys.
 
     Args:
         client (MilvusClient): Milvus client.
@@ -69,8 +180,100 @@ def insert_data(client: MilvusClient, collection_name: str, data: List[Dict[str,
         data (List[Dict[str, Any]]): Data to insert.
     """
     try:
-        client.insert(collection_name=collection_name, data=data)
+        data = list({row["id"]: row for row in data}.values())
+        client.upsert(collection_name=collection_name, data=data)
+        index_texts(client_scope("milvus", client), collection_name,
+                    [row["id"] for row in data], [row.get("text") for row in data])
         info(f"Inserted {len(data)} entities into collection '{collection_name}'", service="index_utils")
     except Exception as exc:
         error(f"Failed to insert data into collection '{collection_name}': {exc}", service="index_utils")
         raise
+    finally:
+        invalidate_collection(client_scope("milvus", client), collection_name)
+
+
+def insert_batch(
+    client: MilvusClient,
+    collection_name: str,
+    batch: ColumnBatch,
+    batch_size: int = DEFAULT_CONVERT_BATCH,
+) -> None:
+    """
+    Upsert a column-oriented batch, building the entity rows one slice at a time.
+
+    MilvusClient only takes row dicts, so each slice of ``batch_size`` entities
+    is converted right before its upsert request. As in ``insert_data``, rows
+    are upserted and ids repeated within the batch are collapsed to the last row.
+
+    Args:
+        client (MilvusClient): Milvus client.
+        collection_name (str): Collection to insert into.
+        batch (ColumnBatch): Ids, vectors and payload columns.
+        batch_size (int): Entities per upsert request.
+    """
+    try:
+        batch = batch.deduplicated()
+        for part in batch.iter_slices(batch_size):
+            client.upsert(collection_name=collection_name, data=part.to_rows())
+        index_texts(client_scope("milvus", client), collection_name, batch.id_list(), batch.columns.get("text"))
+        info(f"Inserted {len(batch)} entities into collection '{collection_name}'", service="index_utils")
+    except Exception as exc:
+        error(f"Failed to insert data into collection '{collection_name}': {exc}", service="index_utils")
+        raise
+    finally:
+        invalidate_collection(client_scope("milvus", client), collection_name)
+
+
+async def async_insert_data(
+    client: MilvusClient,
+    collection_name: str,
+    data: List[Dict[str, Any]],
+    timeout: Optional[float] = None,
+) -> None:
+    """
+    Insert data without blocking the event loop.
+
+    Milvus Lite has no async client, so the blocking upsert runs on the
+    thread pool of the "milvus" limiter.
+
+    Args:
+        client (MilvusClient): Milvus client.
+        collection_name (str): Collection to insert into.
+        data (List[Dict[str, Any]]): Data to insert.
+        timeout (Optional[float]): Seconds to wait; defaults to the limiter timeout.
+    """
+    await get_limiter("milvus").run_blocking(insert_data, client, collection_name, data, timeout=timeout)
+
+
+def stream_insert_data(
+    client: MilvusClient,
+    collection_name: str,
+    documents: Iterable[str],
+    encode_fn: Callable[[List[str]], Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    allocator: Optional[IdAllocator] = None,
+) -> IngestStats:
+    """
+    Encode and insert a stream of texts, overlapping encoding with inserts.
+
+    Entities get ids reserved from ``allocator`` if given, else content ids,
+    so repeated or concurrent streams never reuse each other's ids.
+
+    Args:
+        client (MilvusClient): Milvus client.
+        collection_name (str): Collection to insert into.
+        documents (Iterable[str]): Texts to ingest; consumed lazily.
+        encode_fn (Callable[[List[str]], Any]): Maps a batch of texts to an embedding matrix.
+        batch_size (int): Texts per batch.
+        max_pending (int): Encoded batches allowed to queue ahead of the inserts.
+        allocator (Optional[IdAllocator]): Counter to reserve entity ids from.
+
+    Returns:
+        IngestStats: Counters and timings for the run.
+    """
+    def write(texts: List[str], embeddings: Any, offset: int) -> None:
+        ids = allocator.allocate(len(texts)) if allocator is not None else None
+        insert_batch(client, collection_name, prepare_columns(texts, embeddings, ids=ids))
+
+    return ingest_stream(documents, encode_fn, write, batch_size=batch_size, max_pending=max_pending)
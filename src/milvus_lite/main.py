@@ -8,19 +8,21 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
-from config import get_milvus_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM
-from index_utils import recreate_collection, prepare_data, insert_data
+from config import get_milvus_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM, EMBEDDING_MODEL_NAME
+from index_utils import recreate_collection, prepare_data, prepare_columns, insert_data, insert_batch
 from search_utils import search_vectors
 from src.utils import info, error
+from src.utils.embedding_cache import get_embedding_cache
+from src.utils.sync import sync_collection, INCREMENTAL_SYNC
+from src.utils.query_cache import get_query_cache
 
 
 def main():
     try:
         client = get_milvus_client()
         model = get_embedding_model()
-
-        # Recreate collection
-        recreate_collection(client, COLLECTION_NAME, VECTOR_DIM)
+        cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
+        query_cache = get_query_cache()
 
         # Initial chunk texts
         chunk_texts = [
@@ -36,62 +38,69 @@ def main():
             "Newton's laws describe the motion of objects."
         ]
 
-        # Encode embeddings
-        embeddings = model.encode(chunk_texts).tolist()
-        data = prepare_data(chunk_texts, embeddings)
-        info(f"Data ready with {len(data)} entities.")
+        # More documents on a different subject
+        docs = [
+            "Machine learning has been used for drug design.",
+            "Computational synthesis with AI algorithms predicts molecular properties.",
+            "DDR1 is involved in cancers and fibrosis.",
+        ]
+
+        if INCREMENTAL_SYNC:
+            # Keep the collection and only embed and upsert new or changed documents
+            documents = [(f"chunk-{i}", text, {}) for i, text in enumerate(chunk_texts)]
+            documents += [(f"doc-{i}", doc, {"subject": "biology"}) for i, doc in enumerate(docs)]
+            stats = sync_collection("milvus", COLLECTION_NAME, VECTOR_DIM, documents, model, EMBEDDING_MODEL_NAME,
+                                    client=client)
+            info(f"Incremental sync: {stats}")
+        else:
+            # Recreate collection
+            recreate_collection(client, COLLECTION_NAME, VECTOR_DIM)
+
+            # Encode embeddings
+            embeddings = cache.encode(model, chunk_texts)
+            data = prepare_data(chunk_texts, embeddings)
+            info(f"Data ready with {len(data)} entities.")
+
+            # Insert data
+            insert_data(client, COLLECTION_NAME, data)
+
+            # Encode doc embeddings
+            doc_embeddings = cache.encode(model, docs)
 
-        # Insert data
-        insert_data(client, COLLECTION_NAME, data)
+            # Prepare doc data with 'subject' field as columns
+            doc_batch = prepare_columns(docs, doc_embeddings, columns={"subject": "biology"})
+            info(f"Prepared {len(doc_batch)} new documents with subject 'biology'.")
+
+            insert_batch(client, COLLECTION_NAME, doc_batch)
 
         # Search example
         query = ["Who is Alan Turing?"]
-        query_vectors = model.encode(query).tolist()
+        query_vectors = model.encode(query)
         res = search_vectors(
             client,
             collection_name=COLLECTION_NAME,
             query_vectors=query_vectors,
             limit=1,
-            output_fields=['id', 'text']
+            output_fields=['id', 'text'],
+            cache=query_cache
         )
         info(f"Search results for query '{query[0]}': {res}")
 
-        # Insert more documents on a different subject
-        docs = [
-            "Machine learning has been used for drug design.",
-            "Computational synthesis with AI algorithms predicts molecular properties.",
-            "DDR1 is involved in cancers and fibrosis.",
-        ]
-
-        # Encode doc embeddings
-        doc_embeddings = model.encode(docs).tolist()
-
-        # Prepare doc data with 'subject' field
-        doc_data = []
-        start_id = len(data)
-        for i, doc in enumerate(docs):
-            doc_data.append({
-                "id": start_id + i,
-                "vector": doc_embeddings[i],
-                "text": doc,
-                "subject": "biology"
-            })
-        info(f"Prepared {len(doc_data)} new documents with subject 'biology'.")
-
-        insert_data(client, COLLECTION_NAME, doc_data)
-
         # Search with filter example
         filtered_query = ["tell me AI related information"]
-        filtered_vectors = model.encode(filtered_query).tolist()
+        filtered_vectors = model.encode(filtered_query)
         filtered_res = search_vectors(
             client,
             collection_name=COLLECTION_NAME,
             query_vectors=filtered_vectors,
             limit=2,
             output_fields=["text", "id"],
-            filter_expr="subject == 'biology'"
+            filter_expr="subject == 'biology'",
+            cache=query_cache
         )
         info(f"Filtered search results: {filtered_res}")
+        info(f"Embedding cache stats: {cache.stats()}")
+        info(f"Query cache stats: {query_cache.stats()}")
 
     except Exception as exc:
         error(f"Exception in main: {exc}", service="main")
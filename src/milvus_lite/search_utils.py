@@ -3,6 +3,7 @@ Search utilities for querying Milvus.
 """
 import sys
 import os
+import time
 
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -10,42 +11,132 @@ sys.path.append(ROOT_DIR)
 
 from pymilvus import MilvusClient
 from typing import List, Dict, Any, Optional
-from src.utils import info, error
+from src.utils import info, debug, error
+from src.utils.async_utils import get_limiter
+from src.utils.vector_buffers import as_matrix
+from src.utils.query_cache import QueryCache
+from src.utils.vector_store import Filters, client_scope
+
+
+def _format_literal(value: Any) -> str:
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def build_filter_expr(filters: Optional[Filters]) -> Optional[str]:
+    """
+    Build a Milvus boolean expression from a {field: value | [values]} dict.
+
+    Args:
+        filters (Optional[Filters]): Equality (scalar) or membership (list) conditions; an
+            expression string is passed through for the server to parse.
+
+    Returns:
+        Optional[str]: Expression such as "subject == 'biology' and year in [2020, 2021]", or None.
+    """
+    if not filters:
+        return None
+    if isinstance(filters, str):
+        return filters
+    clauses = []
+    for field, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            clauses.append(f"{field} in [{', '.join(_format_literal(v) for v in value)}]")
+        else:
+            clauses.append(f"{field} == {_format_literal(value)}")
+    return " and ".join(clauses)
 
 
 def search_vectors(
     client: MilvusClient,
     collection_name: str,
-    query_vectors: List[List[float]],
+    query_vectors: Any,
     limit: int = 1,
     output_fields: Optional[List[str]] = None,
     filter_expr: Optional[str] = None,
+    cache: Optional[QueryCache] = None,
 ) -> List[Dict[str, Any]]:
     """
     Search vectors in Milvus collection with optional filtering.
 
+    All query vectors are sent in a single request, as one float32 matrix
+    that pymilvus packs from its buffer without going through Python lists.
+    With a ``cache``, queries answered before are served from it and only the
+    rest are sent.
+
     Args:
         client (MilvusClient): Milvus client.
         collection_name (str): Collection to search.
-        query_vectors (List[List[float]]): Query vectors.
+        query_vectors (Any): Query vectors (ndarray, buffer or list of lists), searched as one batch.
         limit (int): Max results to return.
         output_fields (Optional[List[str]]): Fields to return.
         filter_expr (Optional[str]): Filter expression (e.g. "subject == 'biology'").
+        cache (Optional[QueryCache]): Query-result cache to consult and fill.
 
     Returns:
-        List[Dict[str, Any]]: Search results.
+        List[Dict[str, Any]]: One list of hits per query vector, in query order.
     """
     try:
-        info(f"Running search on collection '{collection_name}' with limit={limit} and filter='{filter_expr}'", service="search_utils")
-        results = client.search(
-            collection_name=collection_name,
-            data=query_vectors,
-            limit=limit,
-            output_fields=output_fields or [],
-            filter=filter_expr
-        )
-        info(f"Search returned {len(results)} results", service="search_utils")
+        debug("Running search on collection '%s' with limit=%d and filter='%s'", collection_name, limit, filter_expr,
+              service="search_utils")
+        started = time.perf_counter()
+        matrix = as_matrix(query_vectors)
+
+        def run(data: Any) -> List[Any]:
+            return client.search(
+                collection_name=collection_name,
+                data=data,
+                limit=limit,
+                output_fields=output_fields or [],
+                filter=filter_expr
+            )
+
+        if cache is not None:
+            results = cache.cached_batch(client_scope("milvus", client), collection_name, matrix, limit, filter_expr,
+                                         lambda positions: run(matrix[positions]),
+                                         extra=tuple(output_fields or ()))
+        else:
+            results = run(matrix)
+        info("Search returned results for %d queries", len(results), service="search_utils", operation="search",
+             latency_ms=(time.perf_counter() - started) * 1000.0, collection=collection_name, limit=limit)
         return results
     except Exception as exc:
         error(f"Search failed on collection '{collection_name}': {exc}", service="search_utils")
         raise
+
+
+async def async_search_vectors(
+    client: MilvusClient,
+    collection_name: str,
+    query_vectors: Any,
+    limit: int = 1,
+    output_fields: Optional[List[str]] = None,
+    filter_expr: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search vectors without blocking the event loop.
+
+    Milvus Lite has no async client, so the blocking search runs on the
+    thread pool of the "milvus" limiter.
+
+    Args:
+        client (MilvusClient): Milvus client.
+        collection_name (str): Collection to search.
+        query_vectors (Any): Query vectors (ndarray, buffer or list of lists), searched as one batch.
+        limit (int): Max results to return.
+        output_fields (Optional[List[str]]): Fields to return.
+        filter_expr (Optional[str]): Filter expression.
+        timeout (Optional[float]): Seconds to wait; defaults to the limiter timeout.
+
+    Returns:
+        List[Dict[str, Any]]: One list of hits per query vector, in query order.
+    """
+    return await get_limiter("milvus").run_blocking(
+        search_vectors, client, collection_name, query_vectors,
+        limit=limit, output_fields=output_fields, filter_expr=filter_expr, timeout=timeout
+    )
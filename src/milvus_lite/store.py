@@ -0,0 +1,145 @@
+"""
+VectorStore adapter for Milvus.
+"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from pymilvus import MilvusClient
+from typing import Any, Dict, List, Optional, Sequence
+from src.milvus_lite.config import get_milvus_client
+from src.milvus_lite.index_utils import recreate_collection, create_milvus_collection
+from src.milvus_lite.search_utils import search_vectors, build_filter_expr
+from src.utils import info, error
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.vector_buffers import as_matrix, DEFAULT_CONVERT_BATCH
+from src.utils.columnar import ColumnBatch
+from src.utils.query_cache import invalidate_collection
+from src.utils.sparse_index import index_texts, remove_texts, payload_texts
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+
+
+def _to_results(hits: List[Dict[str, Any]]) -> List[SearchResult]:
+    results = []
+    for hit in hits:
+        payload = {key: value for key, value in (hit.get("entity") or {}).items() if key not in ("id", "vector")}
+        results.append(SearchResult(id=hit["id"], score=float(hit["distance"]), payload=payload))
+    return results
+
+
+class MilvusStore(VectorStore):
+    """
+    Milvus-backed VectorStore built on a quick-setup collection (int64 "id",
+    "vector" and dynamic payload fields, COSINE metric).
+
+    Args:
+        collection_name (str): Collection name.
+        dimension (int): Vector dimension.
+        client (Optional[MilvusClient]): Existing client; defaults to Milvus Lite at MILVUS_DB_PATH.
+        payload_schema (Optional[PayloadSchema]): Payload fields declared and given a scalar index
+            when the collection is created; defaults to PAYLOAD_SCHEMA.
+    """
+
+    backend = "milvus"
+
+    def __init__(
+        self,
+        collection_name: str,
+        dimension: int,
+        client: Optional[MilvusClient] = None,
+        payload_schema: Optional[PayloadSchema] = None,
+    ) -> None:
+        super().__init__(collection_name, dimension)
+        self.client = client if client is not None else get_milvus_client()
+        self.scope = client_scope(self.backend, self.client)
+        self.payload_schema = validate_schema(DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema)
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate:
+            recreate_collection(self.client, self.collection_name, self.dimension, self.payload_schema)
+            return
+        try:
+            if not self.client.has_collection(self.collection_name):
+                create_milvus_collection(self.client, self.collection_name, self.dimension, self.payload_schema)
+        except Exception as exc:
+            error(f"Failed to create collection '{self.collection_name}': {exc}", service="store")
+            raise
+
+    def upsert(
+        self,
+        ids: Sequence[int],
+        vectors: Sequence[Sequence[float]],
+        payloads: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> int:
+        payloads = payloads or [{} for _ in ids]
+        data = [
+            {**payload, "id": point_id, "vector": vector}
+            for point_id, vector, payload in zip(ids, as_matrix(vectors), payloads)
+        ]
+        try:
+            self.client.upsert(collection_name=self.collection_name, data=data)
+            index_texts(self.scope, self.collection_name, ids, payload_texts(payloads))
+            info(f"Upserted {len(data)} entities into collection '{self.collection_name}'", service="store")
+            return len(data)
+        except Exception as exc:
+            error(f"Failed to upsert into collection '{self.collection_name}': {exc}", service="store")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def upsert_batch(self, batch: ColumnBatch) -> int:
+        try:
+            for part in batch.iter_slices(DEFAULT_CONVERT_BATCH):
+                self.client.upsert(collection_name=self.collection_name, data=part.to_rows())
+            index_texts(self.scope, self.collection_name, batch.id_list(), batch.columns.get("text"))
+            info(f"Upserted {len(batch)} entities into collection '{self.collection_name}'", service="store")
+            return len(batch)
+        except Exception as exc:
+            error(f"Failed to upsert into collection '{self.collection_name}': {exc}", service="store")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[int]) -> int:
+        try:
+            self.client.delete(collection_name=self.collection_name, ids=list(ids))
+            remove_texts(self.scope, self.collection_name, ids)
+            return len(ids)
+        except Exception as exc:
+            error(f"Failed to delete from collection '{self.collection_name}': {exc}", service="store")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return int(self.client.get_collection_stats(self.collection_name)["row_count"])
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+    ) -> List[SearchResult]:
+        return self.batch_search([query_vector], k=k, filters=filters)[0]
+
+    def batch_search(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+    ) -> List[List[SearchResult]]:
+        results = search_vectors(
+            self.client,
+            collection_name=self.collection_name,
+            query_vectors=as_matrix(query_vectors),
+            limit=k,
+            output_fields=["*"],
+            filter_expr=build_filter_expr(filters) or "",
+        )
+        return [_to_results(hits) for hits in results]
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,34 @@
+"""NumPy brute-force backend configuration setup"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.numpy_lite.engine import NumpyClient
+from src.utils.logging_utils import info, error
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
+
+COLLECTION_NAME = "demo_collection"
+VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
+
+def get_numpy_client() -> NumpyClient:
+    try:
+        client = NumpyClient()
+        info("✅ NumPy in-process client initialized")
+        return client
+    except Exception as e:
+        error(f"❌ Failed to initialize NumPy client: {e}")
+        raise
+
+def get_embedding_model():
+    try:
+        model = get_encoder(EMBEDDING_MODEL_NAME)
+        info("📐 Embedding model ready")
+        return model
+    except Exception as e:
+        error(f"❌ Failed to load embedding model: {e}")
+        raise
@@ -0,0 +1,293 @@
+"""
+Exact brute-force vector search engine in pure NumPy.
+
+Vectors live in one contiguous float32 matrix (grown geometrically), so a
+query batch is answered with a single matrix multiplication followed by
+``argpartition`` for the top-k. For cosine collections vectors are normalized
+once on insert, which turns cosine similarity into a dot product. Payload
+filters (dicts or Milvus-style expressions) are evaluated into boolean masks
+by a ``PayloadIndex``; selective filters gather the matching rows before
+scoring (pre-filter), broad ones score every row and mask the scores
+(post-filter), which avoids copying most of the matrix.
+"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from src.utils.vector_store import SearchResult, Filters
+from src.utils.payload_index import PayloadIndex, plan
+
+METRICS = ("cosine", "dot", "euclidean")
+INITIAL_CAPACITY = 1024
+# Upper bound on the (queries x points) score block materialized at once.
+MAX_SCORE_BLOCK = 1 << 26
+# Gathering the matching rows costs a copy of them; above this fraction masking the scores is cheaper.
+FLAT_PREFILTER_SELECTIVITY = float(os.getenv("FLAT_PREFILTER_SELECTIVITY", "0.3"))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class FlatIndex:
+    """
+    One collection of an exact (brute-force) index.
+
+    Args:
+        dimension (int): Vector dimension.
+        metric (str): One of "cosine", "dot" or "euclidean". Scores are always
+            "higher is better"; euclidean scores are negated squared distances.
+
+    Attributes:
+        prefilter_selectivity (float): Estimated filter selectivity at or below which the
+            matching rows are gathered before scoring instead of masking the scores.
+    """
+
+    def __init__(self, dimension: int, metric: str = "cosine") -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', expected one of {METRICS}")
+        self.dimension = dimension
+        self.metric = metric
+        self._vectors = np.empty((INITIAL_CAPACITY, dimension), dtype=np.float32)
+        self._sq_norms = np.empty(INITIAL_CAPACITY, dtype=np.float32)
+        self._ids: List[Any] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._rows: Dict[Any, int] = {}
+        self._filter_index = PayloadIndex()
+        self.prefilter_selectivity = FLAT_PREFILTER_SELECTIVITY
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Read-only view of the stored (normalized, for cosine) vectors."""
+        view = self._vectors[:len(self._ids)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self) -> List[Any]:
+        return list(self._ids)
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+        vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        sq_norms[:len(self._ids)] = self._sq_norms[:len(self._ids)]
+        self._vectors, self._sq_norms = vectors, sq_norms
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {matrix.shape[1]}")
+        if self.metric == "cosine":
+            matrix = _normalize_rows(matrix)
+        return matrix
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """
+        Insert new points and overwrite existing ones in place.
+
+        Returns:
+            int: Number of points written.
+        """
+        matrix = self._prepare(vectors)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids but {matrix.shape[0]} vectors")
+        payloads = payloads if payloads is not None else [{} for _ in ids]
+        with self._lock:
+            self._reserve(len(self._ids) + len(ids))
+            rows = np.empty(len(ids), dtype=np.int64)
+            overwritten = False
+            for position, point_id in enumerate(ids):
+                row = self._rows.get(point_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._rows[point_id] = row
+                    self._ids.append(point_id)
+                    self._payloads.append(dict(payloads[position]))
+                else:
+                    self._payloads[row] = dict(payloads[position])
+                    overwritten = True
+                rows[position] = row
+            self._vectors[rows] = matrix
+            self._sq_norms[rows] = np.einsum("ij,ij->i", matrix, matrix)
+            if overwritten:
+                # Appended rows are picked up by the payload index; rewritten ones are not.
+                self._filter_index.invalidate()
+        return len(ids)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        """
+        Delete points, filling each hole with the last row to keep storage contiguous.
+
+        Returns:
+            int: Number of points actually removed.
+        """
+        removed = 0
+        with self._lock:
+            for point_id in ids:
+                row = self._rows.pop(point_id, None)
+                if row is None:
+                    continue
+                last = len(self._ids) - 1
+                if row != last:
+                    moved_id = self._ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    self._sq_norms[row] = self._sq_norms[last]
+                    self._ids[row] = moved_id
+                    self._payloads[row] = self._payloads[last]
+                    self._rows[moved_id] = row
+                self._ids.pop()
+                self._payloads.pop()
+                removed += 1
+            if removed:
+                self._filter_index.invalidate()
+        return removed
+
+    def get_payload(self, point_id: Any) -> Optional[Dict[str, Any]]:
+        row = self._rows.get(point_id)
+        return None if row is None else self._payloads[row]
+
+    def condition_mask(self, field: str, value: Any) -> np.ndarray:
+        """
+        Boolean mask of the points whose payload matches one condition.
+
+        A scalar value means equality, a list/tuple/set means membership. Masks
+        are cached until the next write.
+        """
+        with self._lock:
+            return self._filter_index.mask({field: value}, self._payloads)
+
+    def filter_mask(self, filters: Optional[Filters]) -> Optional[np.ndarray]:
+        """
+        Mask for a {field: value | [values]} dict or a filter expression, or None when unfiltered.
+        """
+        with self._lock:
+            return self._filter_index.mask(filters, self._payloads)
+
+    def _scores(self, queries: np.ndarray, stored: np.ndarray, sq_norms: np.ndarray) -> np.ndarray:
+        scores = queries @ stored.T
+        if self.metric == "euclidean":
+            # -||q - x||^2 = 2 q.x - ||x||^2 - ||q||^2
+            scores = 2.0 * scores - sq_norms - np.einsum("ij,ij->i", queries, queries)[:, None]
+        return scores
+
+    def search(self, query_vectors: Any, k: int = 10,
+               filters: Optional[Filters] = None,
+               mask: Optional[np.ndarray] = None) -> List[List[SearchResult]]:
+        """
+        Exact top-k for a batch of queries.
+
+        Args:
+            query_vectors (Any): One vector or a (n, dim) matrix.
+            k (int): Results per query.
+            filters (Optional[Filters]): Payload filter dict or expression such as
+                "subject == 'biology' and year >= 2020".
+            mask (Optional[np.ndarray]): Precomputed boolean mask, combined with ``filters``.
+
+        Returns:
+            List[List[SearchResult]]: One list per query, ordered by decreasing score.
+        """
+        queries = self._prepare(query_vectors)
+        with self._lock:
+            size = len(self._ids)
+            filter_plan = plan(self._filter_index, filters, self._payloads, self.prefilter_selectivity)
+            combined = filter_plan.mask
+            if mask is not None:
+                combined = mask[:size] if combined is None else combined & mask[:size]
+            rows = excluded = None
+            stored, sq_norms = self._vectors[:size], self._sq_norms[:size]
+            top = k
+            if combined is not None:
+                if filter_plan.strategy == "post" and mask is None:
+                    excluded = ~combined
+                    top = min(k, size - int(np.count_nonzero(excluded)))
+                else:
+                    rows = np.flatnonzero(combined)
+                    stored, sq_norms = self._vectors[rows], self._sq_norms[rows]
+            ids, payloads = self._ids, self._payloads
+
+            candidates = stored.shape[0]
+            top = min(top, candidates)
+            results: List[List[SearchResult]] = []
+            if top == 0:
+                return [[] for _ in range(queries.shape[0])]
+
+            block = max(1, MAX_SCORE_BLOCK // max(candidates, 1))
+            for start in range(0, queries.shape[0], block):
+                scores = self._scores(queries[start:start + block], stored, sq_norms)
+                if excluded is not None:
+                    scores[:, excluded] = -np.inf
+                if top < candidates:
+                    part = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+                else:
+                    part = np.broadcast_to(np.arange(candidates), (scores.shape[0], candidates))
+                part_scores = np.take_along_axis(scores, part, axis=1)
+                order = np.argsort(-part_scores, axis=1, kind="stable")
+                best = np.take_along_axis(part, order, axis=1)
+                best_scores = np.take_along_axis(part_scores, order, axis=1)
+                if rows is not None:
+                    best = rows[best]
+                for query_rows, query_scores in zip(best.tolist(), best_scores.tolist()):
+                    results.append([
+                        SearchResult(id=ids[row], score=score, payload=payloads[row])
+                        for row, score in zip(query_rows, query_scores)
+                    ])
+            return results
+
+
+class NumpyClient:
+    """
+    Minimal in-process client holding named FlatIndex collections, mirroring
+    the collection-oriented API of ``QdrantClient(":memory:")``.
+    """
+
+    def __init__(self) -> None:
+        self._collections: Dict[str, FlatIndex] = {}
+        self._lock = threading.Lock()
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return collection_name in self._collections
+
+    def create_collection(self, collection_name: str, dimension: int, metric: str = "cosine") -> FlatIndex:
+        with self._lock:
+            if collection_name in self._collections:
+                raise ValueError(f"Collection '{collection_name}' already exists")
+            collection = FlatIndex(dimension, metric)
+            self._collections[collection_name] = collection
+            return collection
+
+    def recreate_collection(self, collection_name: str, dimension: int, metric: str = "cosine") -> FlatIndex:
+        with self._lock:
+            collection = FlatIndex(dimension, metric)
+            self._collections[collection_name] = collection
+            return collection
+
+    def delete_collection(self, collection_name: str) -> bool:
+        with self._lock:
+            return self._collections.pop(collection_name, None) is not None
+
+    def get_collection(self, collection_name: str) -> FlatIndex:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            raise KeyError(f"Collection '{collection_name}' does not exist")
+        return collection
@@ -0,0 +1,40 @@
+"""Index creation and insertion utilities for the NumPy brute-force backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.numpy_lite.engine import NumpyClient
+from src.utils.logging_utils import info, error
+from src.utils.id_allocator import resolve_ids
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sparse_index import index_texts, drop_sparse_index
+from typing import Any, List, Optional, Sequence
+
+def create_numpy_collection(client: NumpyClient, collection_name: str, vector_dim: int,
+                            metric: str = "cosine") -> None:
+    try:
+        client.recreate_collection(collection_name, vector_dim, metric)
+        info(f"📦 NumPy collection '{collection_name}' created")
+    except Exception as e:
+        error(f"❌ Failed to create collection: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("numpy", client), collection_name)
+        drop_sparse_index(client_scope("numpy", client), collection_name)
+
+def insert_data(client: NumpyClient, collection_name: str, embeddings: Any, texts: List[str],
+                start_id: Optional[int] = None, ids: Optional[Sequence[int]] = None) -> None:
+    try:
+        ids = resolve_ids(texts, ids=ids, start_id=start_id).tolist()
+        client.get_collection(collection_name).upsert(ids, embeddings, [{"text": text} for text in texts])
+        index_texts(client_scope("numpy", client), collection_name, ids, texts)
+        info("✅ Data inserted into NumPy collection")
+    except Exception as e:
+        error(f"❌ Failed to insert data: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("numpy", client), collection_name)
@@ -0,0 +1,33 @@
+import sys
+import os
+
+# Fix import path for development
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.numpy_lite.config import get_numpy_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM, EMBEDDING_MODEL_NAME
+from src.numpy_lite.index_utils import create_numpy_collection, insert_data
+from src.numpy_lite.search_utils import search_numpy
+from src.utils.embedding_cache import get_embedding_cache
+
+def main():
+    client = get_numpy_client()
+    model = get_embedding_model()
+    cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
+
+    create_numpy_collection(client, COLLECTION_NAME, VECTOR_DIM)
+
+    texts = [
+        "Artificial intelligence was founded as an academic discipline in 1956.",
+        "Alan Turing was the first person to conduct substantial research in AI."
+    ]
+    embeddings = cache.encode(model, texts)
+    insert_data(client, COLLECTION_NAME, embeddings, texts)
+
+    query = model.encode(["Who is Alan Turing?"])[0]
+    results = search_numpy(client, COLLECTION_NAME, query)
+
+    for result in results:
+        print(result)
+
+if __name__ == "__main__":
+    main()
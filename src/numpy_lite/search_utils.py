@@ -0,0 +1,32 @@
+"""Search functionality using the NumPy brute-force backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.numpy_lite.engine import NumpyClient
+from src.utils.logging_utils import info, error
+from src.utils.vector_store import SearchResult, Filters
+from typing import Any, List, Optional
+
+def search_numpy(client: NumpyClient, collection_name: str, query: Any, limit: int = 2,
+                 filters: Optional[Filters] = None) -> List[SearchResult]:
+    try:
+        results = client.get_collection(collection_name).search(query, k=limit, filters=filters)[0]
+        info("🔍 Search completed with %d results", len(results), operation="search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
+
+def search_numpy_batch(client: NumpyClient, collection_name: str, queries: Any, limit: int = 2,
+                       filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+    try:
+        results = client.get_collection(collection_name).search(queries, k=limit, filters=filters)
+        info("🔍 Batch search completed for %d queries", len(results), operation="batch_search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to search: {e}")
+        raise
@@ -0,0 +1,63 @@
+"""VectorStore adapter for the NumPy brute-force backend"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.numpy_lite.config import get_numpy_client
+from src.numpy_lite.engine import NumpyClient
+from src.numpy_lite.search_utils import search_numpy, search_numpy_batch
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.query_cache import invalidate_collection
+from src.utils.sparse_index import index_texts, remove_texts, drop_sparse_index, payload_texts
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class NumpyStore(VectorStore):
+    """Exact in-process VectorStore; also the ground truth for recall measurements."""
+
+    backend = "numpy"
+    persistent = False
+
+    def __init__(self, collection_name: str, dimension: int, client: Optional[NumpyClient] = None,
+                 metric: str = "cosine") -> None:
+        super().__init__(collection_name, dimension)
+        self.client = client if client is not None else get_numpy_client()
+        self.scope = client_scope(self.backend, self.client)
+        self.metric = metric
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate or not self.client.collection_exists(self.collection_name):
+            self.client.recreate_collection(self.collection_name, self.dimension, self.metric)
+            invalidate_collection(self.scope, self.collection_name)
+            drop_sparse_index(self.scope, self.collection_name)
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        try:
+            count = self.client.get_collection(self.collection_name).upsert(ids, vectors, payloads)
+            index_texts(self.scope, self.collection_name, ids, payload_texts(payloads))
+            return count
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            removed = self.client.get_collection(self.collection_name).delete(ids)
+            remove_texts(self.scope, self.collection_name, ids)
+            return removed
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return len(self.client.get_collection(self.collection_name))
+
+    def search(self, query_vector: Any, k: int = 10,
+               filters: Optional[Filters] = None) -> List[SearchResult]:
+        return search_numpy(self.client, self.collection_name, query_vector, limit=k, filters=filters)
+
+    def batch_search(self, query_vectors: Any, k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        return search_numpy_batch(self.client, self.collection_name, query_vectors, limit=k, filters=filters)
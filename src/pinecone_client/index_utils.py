@@ -7,24 +7,74 @@ import os
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
-from pinecone import Pinecone
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from pinecone import Pinecone, ServerlessSpec
 from src.utils import info
+from src.utils.client_pool import ClientPool, get_pool
 
+PINECONE_POOL_SIZE = int(os.getenv("PINECONE_POOL_SIZE", "4"))
 
-def init_pinecone(api_key: str) -> Pinecone:
+
+def init_pinecone(api_key: str, host: Optional[str] = None) -> Pinecone:
     """
-    Initializes the Pinecone client.
+    Initializes a new Pinecone client.
 
     Args:
         api_key (str): The API key for Pinecone.
+        host (Optional[str]): Control plane URL, e.g. a local mock server; defaults to Pinecone's.
 
     Returns:
         Pinecone: Initialized Pinecone client.
     """
     info("🔐 Initializing Pinecone client", service="Pinecone")
+    if host:
+        return Pinecone(api_key=api_key, host=host)
     return Pinecone(api_key=api_key)
 
 
+def get_pinecone_pool(api_key: str, host: Optional[str] = None) -> ClientPool:
+    """
+    Returns the process-wide client pool for an API key and host.
+
+    Clients are created lazily with ``init_pinecone`` and checked with a
+    ``list_indexes()`` call before reuse after being idle.
+
+    Args:
+        api_key (str): The API key for Pinecone.
+        host (Optional[str]): Control plane URL.
+
+    Returns:
+        ClientPool: The shared pool.
+    """
+    return get_pool(
+        f"pinecone:{hash(api_key)}:{host or ''}",
+        lambda: ClientPool(
+            "pinecone",
+            factory=lambda: init_pinecone(api_key, host),
+            health_check=lambda pc: pc.list_indexes() is not None,
+            close=lambda pc: None,
+            max_size=PINECONE_POOL_SIZE
+        )
+    )
+
+
+@contextmanager
+def pinecone_connection(api_key: str, host: Optional[str] = None) -> Iterator[Pinecone]:
+    """
+    Leases a pooled Pinecone client for the duration of a ``with`` block.
+
+    Args:
+        api_key (str): The API key for Pinecone.
+        host (Optional[str]): Control plane URL.
+
+    Yields:
+        Pinecone: A ready client.
+    """
+    with get_pinecone_pool(api_key, host).connection() as pc:
+        yield pc
+
+
 def create_index_if_needed(pc: Pinecone, index_name: str) -> None:
     """
     Creates an index if it doesn't already exist.
@@ -48,6 +98,28 @@ def create_index_if_needed(pc: Pinecone, index_name: str) -> None:
         info(f"✅ Index already exists: {index_name}", service="Pinecone")
 
 
+def create_dense_index_if_needed(pc: Pinecone, index_name: str, dimension: int, metric: str = "cosine") -> None:
+    """
+    Creates a serverless index for client-side vectors if it doesn't already exist.
+
+    Args:
+        pc (Pinecone): Pinecone client.
+        index_name (str): Name of the index.
+        dimension (int): Vector dimension.
+        metric (str): Similarity metric.
+    """
+    if not pc.has_index(index_name):
+        info(f"📦 Creating dense index: {index_name} ({dimension} dims, {metric})", service="Pinecone")
+        pc.create_index(
+            name=index_name,
+            dimension=dimension,
+            metric=metric,
+            spec=ServerlessSpec(cloud="aws", region="us-east-1")
+        )
+    else:
+        info(f"✅ Index already exists: {index_name}", service="Pinecone")
+
+
 def upsert_sample_records(index, namespace: str) -> None:
     """
     Upserts sample educational records to the index.
@@ -10,9 +10,10 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
 from config import PINECONE_API_KEY, INDEX_NAME
-from index_utils import init_pinecone, create_index_if_needed, upsert_sample_records
-from search_utils import basic_search, reranked_search
+from index_utils import pinecone_connection, create_index_if_needed, upsert_sample_records
+from search_utils import basic_search, reranked_search, local_reranked_search
 from src.utils import error, info
+from src.utils.reranker import LOCAL_RERANK
 
 
 
@@ -27,22 +28,24 @@ def main():
     try:
         info("🚀 Starting Pinecone operations pipeline")
 
-        # Step 1: Initialize Pinecone client
-        pc = init_pinecone(api_key=PINECONE_API_KEY)
+        # Step 1: Lease a Pinecone client from the shared pool
+        with pinecone_connection(api_key=PINECONE_API_KEY) as pc:
+            # Step 2: Create index if it doesn't exist
+            create_index_if_needed(pc, INDEX_NAME)
 
-        # Step 2: Create index if it doesn't exist
-        create_index_if_needed(pc, INDEX_NAME)
+            # Step 3: Upsert data to index
+            index = pc.Index(INDEX_NAME)
+            upsert_sample_records(index, namespace="ns1")
 
-        # Step 3: Upsert data to index
-        index = pc.Index(INDEX_NAME)
-        upsert_sample_records(index, namespace="ns1")
+            # Step 4: Basic search
+            query = "historical structures and monuments"
+            basic_search(index, query=query, namespace="ns1")
 
-        # Step 4: Basic search
-        query = "historical structures and monuments"
-        basic_search(index, query=query, namespace="ns1")
-
-        # Step 5: Reranked search
-        reranked_search(index, query=query, namespace="ns1")
+            # Step 5: Reranked search, on this machine when LOCAL_RERANK=1
+            if LOCAL_RERANK:
+                local_reranked_search(index, query=query, namespace="ns1")
+            else:
+                reranked_search(index, query=query, namespace="ns1")
 
     except (KeyError, ValueError, RuntimeError) as e:
         error("❌ An error occurred: %s", e)
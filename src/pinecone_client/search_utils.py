@@ -8,10 +8,15 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
+from typing import List, Optional
 from src.utils import info
+from src.utils.reranker import CrossEncoderReranker, get_reranker, RERANK_BUDGET_MS
+from src.utils.vector_store import SearchResult
+from src.utils.concurrency import fan_out, DEFAULT_FAN_OUT
+from src.utils.async_utils import get_limiter
 
 
-def basic_search(index, query: str, namespace: str) -> None:
+def basic_search(index, query: str, namespace: str, top_k: int = 5):
     """
     Performs a basic vector search on the index.
 
@@ -19,13 +24,17 @@ def basic_search(index, query: str, namespace: str) -> None:
         index: Pinecone index object.
         query (str): Search query text.
         namespace (str): Namespace to search in.
+        top_k (int): Number of results to return.
+
+    Returns:
+        The search response.
     """
     info("🔎 Performing basic search for query: '%s'", query)
 
     result = index.search(
         namespace=namespace,
         query={
-            "top_k": 5,
+            "top_k": top_k,
             "inputs": {
                 "text": query
             }
@@ -34,6 +43,51 @@ def basic_search(index, query: str, namespace: str) -> None:
 
     info("📄 Basic Search Results:")
     info(result)
+    return result
+
+
+def basic_search_batch(index, queries: List[str], namespace: str, top_k: int = 5,
+                       max_workers: int = DEFAULT_FAN_OUT) -> list:
+    """
+    Performs several basic searches concurrently.
+
+    Pinecone's search endpoint takes one query per request, so the queries are
+    fanned out over a thread pool and the responses returned in query order.
+
+    Args:
+        index: Pinecone index object.
+        queries (List[str]): Search query texts.
+        namespace (str): Namespace to search in.
+        top_k (int): Number of results per query.
+        max_workers (int): Maximum number of requests in flight.
+
+    Returns:
+        list: One search response per query, aligned with ``queries``.
+    """
+    info("🔎 Performing %d basic searches with up to %d in flight", len(queries), max_workers)
+    return fan_out(lambda query: basic_search(index, query, namespace, top_k), queries, max_workers=max_workers)
+
+
+async def async_basic_search(index, query: str, namespace: str, top_k: int = 5,
+                             timeout: Optional[float] = None):
+    """
+    Performs a basic search without blocking the event loop.
+
+    The request runs on the thread pool of the "pinecone" limiter, which caps
+    the number of requests in flight and applies the timeout.
+
+    Args:
+        index: Pinecone index object.
+        query (str): Search query text.
+        namespace (str): Namespace to search in.
+        top_k (int): Number of results to return.
+        timeout (Optional[float]): Seconds to wait; defaults to the limiter timeout.
+
+    Returns:
+        The search response.
+    """
+    return await get_limiter("pinecone").run_blocking(basic_search, index, query, namespace, top_k, timeout=timeout)
+
 
 def reranked_search(index, query: str, namespace: str) -> None:
     """
@@ -63,4 +117,53 @@ def reranked_search(index, query: str, namespace: str) -> None:
     )
 
     info("📄 Reranked Search Results:")
-    info(result)
\ No newline at end of file
+    info(result)
+
+
+def local_reranked_search(index, query: str, namespace: str, top_k: int = 5,
+                          candidates: Optional[int] = None,
+                          reranker: Optional[CrossEncoderReranker] = None,
+                          budget_ms: Optional[float] = RERANK_BUDGET_MS) -> List[SearchResult]:
+    """
+    Performs a reranked search with the local cross-encoder instead of the hosted reranker.
+
+    The index returns the top-N candidates and their text, and they are
+    re-scored on this machine, so the query makes one round trip and no call
+    to the hosted rerank model.
+
+    Args:
+        index: Pinecone index object.
+        query (str): Search query text.
+        namespace (str): Namespace to search in.
+        top_k (int): Number of results to return.
+        candidates (Optional[int]): Candidates to fetch; chosen by the reranker by default.
+        reranker (Optional[CrossEncoderReranker]): Reranker; the shared default model otherwise.
+        budget_ms (Optional[float]): Time limit of the reranking stage.
+
+    Returns:
+        List[SearchResult]: Top hits by cross-encoder score, with their fields as payload.
+    """
+    reranker = reranker or get_reranker()
+    count = candidates or reranker.candidate_count(top_k, budget_ms)
+    info("🎯 Performing locally reranked search over %d candidates", count)
+
+    result = index.search(
+        namespace=namespace,
+        query={
+            "top_k": count,
+            "inputs": {
+                "text": query
+            }
+        },
+        fields=["category", "chunk_text"]
+    )
+    hits = [
+        SearchResult(id=hit["_id"], score=hit["_score"], payload=dict(hit.get("fields") or {}))
+        for hit in result["result"]["hits"]
+    ]
+    ranked = reranker.rerank(query, hits, k=top_k, text_field="chunk_text", budget_ms=budget_ms)
+
+    info("📄 Reranked Search Results:")
+    for hit in ranked:
+        info("%.4f  %s  %s", hit.score, hit.id, hit.payload.get("chunk_text", ""))
+    return ranked
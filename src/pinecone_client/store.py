@@ -0,0 +1,195 @@
+"""
+VectorStore adapter for Pinecone.
+
+Unlike the sample index in main.py, which embeds text server-side, this
+adapter works on a dense index holding client-side vectors so it can run the
+same workload as the other backends.
+
+Pinecone vector ids are strings, so integer point ids are sent as their
+decimal string and tagged in the ``_id_type`` metadata key; search turns
+tagged ids back into ints and drops the key from the returned payload.
+"""
+import sys
+import os
+import numbers
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from typing import Any, Dict, List, Optional, Sequence
+from src.pinecone_client.config import PINECONE_API_KEY
+from src.pinecone_client.index_utils import get_pinecone_pool, create_dense_index_if_needed
+from src.utils import info, error
+from src.utils.vector_store import VectorStore, SearchResult, Filters, PointId, as_vector, client_scope
+from src.utils.filter_expr import Node, Compare, In, IsNull, And, Or, negate, parse_filter
+from src.utils.vector_buffers import as_matrix, iter_batches, to_lists
+from src.utils.query_cache import invalidate_collection
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, remove_texts, drop_sparse_index, payload_texts
+
+UPSERT_BATCH_SIZE = 100
+_OPERATORS = {"==": "$eq", "!=": "$ne", "<": "$lt", "<=": "$lte", ">": "$gt", ">=": "$gte"}
+# Metadata key marking integer point ids. The value is not stored, as 63-bit ids do not survive Pinecone's floats.
+ID_TYPE_FIELD = "_id_type"
+
+
+def record_metadata(point_id: PointId, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Metadata stored with a point: its payload, plus the id type tag for integer ids.
+    """
+    metadata = dict(payload)
+    if isinstance(point_id, numbers.Integral):
+        metadata[ID_TYPE_FIELD] = "int"
+    return metadata
+
+
+def restore_id(vector_id: str, metadata: Dict[str, Any]) -> PointId:
+    """
+    Point id of a Pinecone match; removes the id type tag from ``metadata``.
+    """
+    return int(vector_id) if metadata.pop(ID_TYPE_FIELD, None) == "int" else vector_id
+
+
+def _to_filter(node: Node) -> Dict[str, Any]:
+    if isinstance(node, Compare):
+        return {node.field: {_OPERATORS[node.op]: node.value}}
+    if isinstance(node, IsNull):
+        return {node.field: {"$exists": False}}
+    if isinstance(node, In):
+        return {node.field: {"$nin" if node.negate else "$in": sorted(node.values, key=repr)}}
+    if isinstance(node, And):
+        return {"$and": [_to_filter(item) for item in node.items]}
+    if isinstance(node, Or):
+        return {"$or": [_to_filter(item) for item in node.items]}
+    if isinstance(node.item, IsNull):
+        return {node.item.field: {"$exists": True}}
+    # Pinecone has no $not; push the negation down to the comparisons.
+    return _to_filter(negate(node.item))
+
+
+def build_filter(filters: Optional[Filters]) -> Optional[Dict[str, Any]]:
+    """
+    Translate a {field: value | [values]} dict or a Milvus-style expression into a Pinecone metadata filter.
+
+    Args:
+        filters (Optional[Filters]): Equality (scalar) or membership (list) conditions, or an
+            expression such as "subject == 'biology' and year >= 2020".
+
+    Returns:
+        Optional[Dict[str, Any]]: Filter using $eq / $in / $and / ... operators, or None.
+    """
+    if not filters:
+        return None
+    if isinstance(filters, str):
+        return _to_filter(parse_filter(filters))
+    return {
+        field: {"$in": list(value)} if isinstance(value, (list, tuple, set)) else {"$eq": value}
+        for field, value in filters.items()
+    }
+
+
+class PineconeStore(VectorStore):
+    """
+    Pinecone-backed VectorStore.
+
+    Args:
+        collection_name (str): Index name.
+        dimension (int): Vector dimension.
+        pc (Pinecone): Existing client; defaults to one leased from the shared pool
+            for PINECONE_API_KEY and returned on ``close``.
+        namespace (str): Namespace used for every operation.
+    """
+
+    backend = "pinecone"
+
+    def __init__(self, collection_name: str, dimension: int, pc=None, namespace: str = "default") -> None:
+        super().__init__(collection_name, dimension)
+        self._pool = None if pc is not None else get_pinecone_pool(PINECONE_API_KEY)
+        self.pc = pc if pc is not None else self._pool.acquire()
+        self.scope = client_scope(self.backend, self.pc)
+        self.namespace = namespace
+        self.index = None
+
+    def _get_index(self):
+        if self.index is None:
+            self.index = self.pc.Index(self.collection_name)
+        return self.index
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate and self.pc.has_index(self.collection_name):
+            info(f"🗑️ Deleting index: {self.collection_name}", service="Pinecone")
+            self.pc.delete_index(self.collection_name)
+            self.index = None
+            invalidate_collection(self.scope, self.collection_name)
+            drop_sparse_index(self.scope, self.collection_name)
+            drop_manifest(self.backend, self.collection_name)
+        create_dense_index_if_needed(self.pc, self.collection_name, self.dimension)
+
+    def upsert(
+        self,
+        ids: Sequence[Any],
+        vectors: Sequence[Sequence[float]],
+        payloads: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> int:
+        payloads = payloads or [{} for _ in ids]
+        index = self._get_index()
+        try:
+            # The JSON request body needs Python floats; convert one request's worth at a time.
+            for start, batch in iter_batches(as_matrix(vectors), UPSERT_BATCH_SIZE):
+                records = [
+                    {"id": str(ids[start + i]), "values": vector,
+                     "metadata": record_metadata(ids[start + i], payloads[start + i])}
+                    for i, vector in enumerate(to_lists(batch))
+                ]
+                index.upsert(vectors=records, namespace=self.namespace)
+            index_texts(self.scope, self.collection_name, ids, payload_texts(payloads))
+            info(f"✅ Upserted {len(ids)} vectors into '{self.collection_name}'", service="Pinecone")
+            return len(ids)
+        except Exception as exc:
+            error(f"❌ Failed to upsert vectors: {exc}", service="Pinecone")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            self._get_index().delete(ids=[str(point_id) for point_id in ids], namespace=self.namespace)
+            remove_texts(self.scope, self.collection_name, ids)
+            return len(ids)
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        # Index stats are eventually consistent; a count that lags only costs a re-upsert in sync.
+        namespaces = self._get_index().describe_index_stats()["namespaces"]
+        return namespaces[self.namespace]["vector_count"] if self.namespace in namespaces else 0
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+    ) -> List[SearchResult]:
+        try:
+            response = self._get_index().query(
+                vector=as_vector(query_vector),
+                top_k=k,
+                filter=build_filter(filters),
+                include_metadata=True,
+                namespace=self.namespace
+            )
+        except Exception as exc:
+            error(f"❌ Search failed: {exc}", service="Pinecone")
+            raise
+        results = []
+        for match in response["matches"]:
+            payload = dict(match.get("metadata") or {})
+            results.append(SearchResult(id=restore_id(match["id"], payload), score=float(match["score"]),
+                                        payload=payload))
+        return results
+
+    def close(self) -> None:
+        self.index = None
+        if self._pool is not None:
+            self._pool.release(self.pc)
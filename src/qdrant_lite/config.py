@@ -6,27 +6,44 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
-from qdrant_client.models import VectorParams, Distance
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from src.utils.logging_utils import info, error
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
+from typing import Any
 
 COLLECTION_NAME = "demo_collection"
 VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
+# Server URL; the local ":memory:" mode ignores payload indexes, so filtered workloads want a server.
+QDRANT_URL = os.getenv("QDRANT_URL", ":memory:")
 
 def get_qdrant_client() -> QdrantClient:
     try:
-        client = QdrantClient(":memory:")
+        client = QdrantClient(QDRANT_URL)
         info("✅ Qdrant client initialized")
         return client
     except Exception as e:
         error(f"❌ Failed to initialize Qdrant client: {e}")
         raise
 
-def get_embedding_model() -> SentenceTransformer:
+def is_persistent_client(client) -> bool:
+    """Whether the client's collections outlive the process; False for the local ":memory:" mode."""
+    return getattr(getattr(client, "_client", None), "persistent", True)
+
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    try:
+        client = AsyncQdrantClient(QDRANT_URL)
+        info("✅ Async Qdrant client initialized")
+        return client
+    except Exception as e:
+        error(f"❌ Failed to initialize async Qdrant client: {e}")
+        raise
+
+def get_embedding_model() -> Any:
     try:
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        info("📐 Embedding model loaded")
+        model = get_encoder(EMBEDDING_MODEL_NAME)
+        info("📐 Embedding model ready")
         return model
     except Exception as e:
         error(f"❌ Failed to load embedding model: {e}")
@@ -6,27 +6,123 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from qdrant_client.models import VectorParams, Distance, Batch, PayloadSchemaType
+from src.qdrant_lite.config import is_persistent_client
 from src.utils.logging_utils import info, error
-from typing import List
+from src.utils.async_utils import get_limiter
+from src.utils.vector_buffers import DEFAULT_CONVERT_BATCH
+from src.utils.columnar import ColumnBatch
+from src.utils.id_allocator import IdAllocator
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, drop_sparse_index
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+from src.utils.ingestion import ingest_stream, IngestStats, DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING
+from typing import Any, Callable, Iterable, List, Optional, Sequence
 
-def create_qdrant_collection(client, collection_name: str, vector_dim: int) -> None:
+PAYLOAD_INDEX_TYPES = {
+    "keyword": PayloadSchemaType.KEYWORD,
+    "integer": PayloadSchemaType.INTEGER,
+    "float": PayloadSchemaType.FLOAT,
+    "bool": PayloadSchemaType.BOOL,
+    "text": PayloadSchemaType.TEXT,
+}
+
+def create_payload_indexes(client, collection_name: str, payload_schema: Optional[PayloadSchema]) -> None:
+    """Build a payload index per declared field so filters on it skip the full payload scan.
+
+    Local (``:memory:`` / path) clients accept the calls but do not index; use a server for filtered workloads.
+    """
+    for field, field_type in validate_schema(payload_schema).items():
+        try:
+            client.create_payload_index(collection_name=collection_name, field_name=field,
+                                        field_schema=PAYLOAD_INDEX_TYPES[field_type], wait=True)
+            info(f"🗂️ Payload index on '{field}' ({field_type}) created for '{collection_name}'")
+        except Exception as e:
+            error(f"❌ Failed to create payload index on '{field}': {e}")
+            raise
+
+def create_qdrant_collection(client, collection_name: str, vector_dim: int,
+                             payload_schema: Optional[PayloadSchema] = None) -> None:
+    """Recreate a collection and index the payload fields of ``payload_schema`` (default ``PAYLOAD_SCHEMA``)."""
     try:
         client.recreate_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(size=vector_dim, distance=Distance.COSINE)
         )
         info(f"📦 Qdrant collection '{collection_name}' created")
+        create_payload_indexes(client, collection_name,
+                               DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema)
     except Exception as e:
         error(f"❌ Failed to create collection: {e}")
         raise
+    finally:
+        invalidate_collection(client_scope("qdrant", client), collection_name)
+        drop_sparse_index(client_scope("qdrant", client), collection_name)
+        if is_persistent_client(client):
+            drop_manifest("qdrant", collection_name)
+
+def to_qdrant_batch(batch: ColumnBatch) -> Batch:
+    """Column-oriented Qdrant upsert payload; vectors become lists here, one slice at a time."""
+    return Batch(ids=batch.id_list(), vectors=batch.vectors.tolist(), payloads=batch.payload_rows())
 
-def insert_data(client, collection_name: str, embeddings: List[List[float]], texts: List[str]) -> None:
+def insert_batch(client, collection_name: str, batch: ColumnBatch,
+                 batch_size: int = DEFAULT_CONVERT_BATCH) -> None:
+    """Upsert a ColumnBatch as column-oriented Batch requests of ``batch_size`` points."""
     try:
-        points = [PointStruct(id=i, vector=embeddings[i], payload={"text": texts[i]})
-                  for i in range(len(texts))]
-        client.upsert(collection_name=collection_name, points=points)
-        info("✅ Data inserted into Qdrant collection")
+        for part in batch.iter_slices(batch_size):
+            client.upsert(collection_name=collection_name, points=to_qdrant_batch(part))
+        index_texts(client_scope("qdrant", client), collection_name, batch.id_list(), batch.columns.get("text"))
+        info(f"✅ Inserted {len(batch)} points into Qdrant collection")
     except Exception as e:
         error(f"❌ Failed to insert data: {e}")
         raise
+    finally:
+        invalidate_collection(client_scope("qdrant", client), collection_name)
+
+def insert_data(client, collection_name: str, embeddings: Any, texts: List[str],
+                start_id: Optional[int] = None, batch_size: int = DEFAULT_CONVERT_BATCH,
+                ids: Optional[Sequence[int]] = None) -> None:
+    """Upsert texts with their embeddings (an ndarray, buffer or list of lists) in batches.
+
+    Ids are ``ids`` if given, consecutive from ``start_id`` if given, else content ids of the texts.
+    """
+    batch = ColumnBatch.from_texts(texts, embeddings, start_id, ids=ids)
+    insert_batch(client, collection_name, batch, batch_size)
+
+async def async_insert_data(client, collection_name: str, embeddings: Any, texts: List[str],
+                            start_id: Optional[int] = None, timeout: Optional[float] = None,
+                            batch_size: int = DEFAULT_CONVERT_BATCH,
+                            ids: Optional[Sequence[int]] = None) -> None:
+    """Native async upsert on an ``AsyncQdrantClient``, bounded by the "qdrant" limiter."""
+    try:
+        batch = ColumnBatch.from_texts(texts, embeddings, start_id, ids=ids)
+        for part in batch.iter_slices(batch_size):
+            await get_limiter("qdrant").run(
+                client.upsert(collection_name=collection_name, points=to_qdrant_batch(part)),
+                timeout=timeout
+            )
+        index_texts(client_scope("qdrant", client), collection_name, batch.id_list(), batch.columns.get("text"))
+        info("✅ Data inserted into Qdrant collection (async)")
+    except Exception as e:
+        error(f"❌ Failed to insert data asynchronously: {e}")
+        raise
+    finally:
+        invalidate_collection(client_scope("qdrant", client), collection_name)
+
+def stream_insert_data(client, collection_name: str, documents: Iterable[str],
+                       encode_fn: Callable[[List[str]], Any],
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       max_pending: int = DEFAULT_MAX_PENDING,
+                       allocator: Optional[IdAllocator] = None) -> IngestStats:
+    """Encode and upsert an arbitrarily large stream of texts batch by batch.
+
+    Points get ids reserved from ``allocator`` if given, else content ids, so
+    repeated or concurrent streams never overwrite each other's points.
+    """
+    def write(texts, embeddings, offset):
+        ids = allocator.allocate(len(texts)) if allocator is not None else None
+        insert_data(client, collection_name, embeddings, texts, ids=ids)
+
+    return ingest_stream(documents, encode_fn, write, batch_size=batch_size, max_pending=max_pending)
@@ -4,24 +4,33 @@ import os
 # Fix import path for development
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-from src.qdrant_lite.config import get_qdrant_client, get_embedding_model, COLLECTION_NAME, VECTOR_DIM
+from src.qdrant_lite.config import get_qdrant_client, get_embedding_model, is_persistent_client, COLLECTION_NAME, \
+    VECTOR_DIM, EMBEDDING_MODEL_NAME
 from src.qdrant_lite.index_utils import create_qdrant_collection, insert_data
 from src.qdrant_lite.search_utils import search_qdrant
+from src.utils.embedding_cache import get_embedding_cache
+from src.utils.sync import sync_collection, INCREMENTAL_SYNC
 
 def main():
     client = get_qdrant_client()
     model = get_embedding_model()
-
-    create_qdrant_collection(client, COLLECTION_NAME, VECTOR_DIM)
+    cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
 
     texts = [
         "Artificial intelligence was founded as an academic discipline in 1956.",
         "Alan Turing was the first person to conduct substantial research in AI."
     ]
-    embeddings = model.encode(texts).tolist()
-    insert_data(client, COLLECTION_NAME, embeddings, texts)
-
-    query = model.encode(["Who is Alan Turing?"]).tolist()[0]
+    if INCREMENTAL_SYNC and is_persistent_client(client):
+        # Only new or changed texts are embedded; the collection is kept across runs.
+        # The default ":memory:" client starts empty every run, so it always ingests.
+        documents = [(f"doc-{i}", text, {}) for i, text in enumerate(texts)]
+        sync_collection("qdrant", COLLECTION_NAME, VECTOR_DIM, documents, model, EMBEDDING_MODEL_NAME, client=client)
+    else:
+        create_qdrant_collection(client, COLLECTION_NAME, VECTOR_DIM)
+        embeddings = cache.encode(model, texts)
+        insert_data(client, COLLECTION_NAME, embeddings, texts)
+
+    query = model.encode(["Who is Alan Turing?"])[0]
     results = search_qdrant(client, COLLECTION_NAME, query)
 
     for result in results:
@@ -6,18 +6,124 @@ import os
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
+from qdrant_client.models import (Filter, FieldCondition, MatchValue, MatchAny, Range, SearchRequest,
+                                  IsEmptyCondition, PayloadField)
 from src.utils.logging_utils import info, error
-from typing import List
+from src.utils.async_utils import get_limiter
+from src.utils.vector_buffers import to_lists
+from src.utils.query_cache import QueryCache
+from src.utils.filter_expr import Node, Compare, In, IsNull, And, Or, parse_filter
+from src.utils.vector_store import Filters, client_scope
+from typing import Any, Optional
 
-def search_qdrant(client, collection_name: str, query: List[float], limit: int = 2):
+_RANGE_ARGS = {"<": "lt", "<=": "lte", ">": "gt", ">=": "gte"}
+
+def _to_condition(node: Node) -> Any:
+    if isinstance(node, Compare):
+        if node.op in _RANGE_ARGS:
+            if isinstance(node.value, (str, bool)):
+                raise ValueError(f"Qdrant range conditions need a number, got {node.value!r} for '{node.field}'")
+            return FieldCondition(key=node.field, range=Range(**{_RANGE_ARGS[node.op]: node.value}))
+        condition = FieldCondition(key=node.field, match=MatchValue(value=node.value))
+        return Filter(must_not=[condition]) if node.op == "!=" else condition
+    if isinstance(node, IsNull):
+        # is_empty matches a missing key or null (and also [], which matches() counts as a value).
+        return IsEmptyCondition(is_empty=PayloadField(key=node.field))
+    if isinstance(node, In):
+        condition = FieldCondition(key=node.field, match=MatchAny(any=sorted(node.values, key=repr)))
+        return Filter(must_not=[condition]) if node.negate else condition
+    if isinstance(node, And):
+        return Filter(must=[_to_condition(item) for item in node.items])
+    if isinstance(node, Or):
+        return Filter(should=[_to_condition(item) for item in node.items])
+    return Filter(must_not=[_to_condition(node.item)])
+
+def build_filter(filters: Optional[Filters]) -> Optional[Filter]:
+    """Translate a {field: value | [values]} dict or a Milvus-style expression into a Qdrant payload filter.
+
+    Expressions map ``and`` / ``or`` / ``not`` onto must / should / must_not and
+    ranges onto ``Range`` conditions, e.g. "subject == 'biology' and year >= 2020".
+    """
+    if not filters:
+        return None
+    if isinstance(filters, str):
+        condition = _to_condition(parse_filter(filters))
+        return condition if isinstance(condition, Filter) else Filter(must=[condition])
+    conditions = []
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(FieldCondition(key=key, match=MatchAny(any=list(value))))
+        else:
+            conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+    return Filter(must=conditions)
+
+def search_qdrant(client, collection_name: str, query: Any, limit: int = 2,
+                  query_filter: Optional[Filter] = None, cache: Optional[QueryCache] = None):
+    """Search one query vector; an ndarray is passed to the client as is.
+
+    With a ``cache``, a query answered before is served from it.
+    """
+    if cache is not None:
+        return cache.cached(client_scope("qdrant", client), collection_name, query, limit, query_filter,
+                            lambda: search_qdrant(client, collection_name, query, limit, query_filter))
     try:
         results = client.search(
             collection_name=collection_name,
             query_vector=query,
+            query_filter=query_filter,
             limit=limit
         )
-        info(f"🔍 Search completed with {len(results)} results")
+        info("🔍 Search completed with %d results", len(results), operation="search")
         return results
     except Exception as e:
         error(f"❌ Failed to search: {e}")
         raise
+
+def search_qdrant_batch(client, collection_name: str, queries: Any, limit: int = 2,
+                        query_filter: Optional[Filter] = None):
+    """Search many query vectors in one request; results are aligned with the queries."""
+    try:
+        requests = [SearchRequest(vector=query, limit=limit, filter=query_filter, with_payload=True)
+                    for query in to_lists(queries)]
+        results = client.search_batch(collection_name=collection_name, requests=requests)
+        info("🔍 Batch search completed for %d queries", len(results), operation="batch_search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to run batch search: {e}")
+        raise
+
+
+async def async_search_qdrant(client, collection_name: str, query: Any, limit: int = 2,
+                              query_filter: Optional[Filter] = None, timeout: Optional[float] = None):
+    """Native async search on an ``AsyncQdrantClient``, bounded by the "qdrant" limiter."""
+    try:
+        results = await get_limiter("qdrant").run(
+            client.search(
+                collection_name=collection_name,
+                query_vector=query,
+                query_filter=query_filter,
+                limit=limit
+            ),
+            timeout=timeout
+        )
+        info("🔍 Async search completed with %d results", len(results), operation="search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to run async search: {e}")
+        raise
+
+async def async_search_qdrant_batch(client, collection_name: str, queries: Any, limit: int = 2,
+                                    query_filter: Optional[Filter] = None, timeout: Optional[float] = None):
+    """Native async batch search on an ``AsyncQdrantClient``; results are aligned with the queries."""
+    try:
+        requests = [SearchRequest(vector=query, limit=limit, filter=query_filter, with_payload=True)
+                    for query in to_lists(queries)]
+        results = await get_limiter("qdrant").run(
+            client.search_batch(collection_name=collection_name, requests=requests),
+            timeout=timeout
+        )
+        info("🔍 Async batch search completed for %d queries", len(results), operation="batch_search")
+        return results
+    except Exception as e:
+        error(f"❌ Failed to run async batch search: {e}")
+        raise
@@ -0,0 +1,104 @@
+"""VectorStore adapter for Qdrant"""
+import sys
+import os
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from qdrant_client.models import PointIdsList, VectorParams, Distance
+from src.qdrant_lite.config import get_qdrant_client, is_persistent_client
+from src.qdrant_lite.index_utils import create_qdrant_collection, create_payload_indexes, to_qdrant_batch
+from src.qdrant_lite.search_utils import search_qdrant, search_qdrant_batch, build_filter
+from src.utils.logging_utils import info, error
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.vector_buffers import as_matrix, as_query, DEFAULT_CONVERT_BATCH
+from src.utils.columnar import ColumnBatch
+from src.utils.query_cache import invalidate_collection
+from src.utils.sparse_index import index_texts, remove_texts
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def _to_result(point) -> SearchResult:
+    return SearchResult(id=point.id, score=point.score, payload=dict(point.payload or {}))
+
+
+class QdrantStore(VectorStore):
+    """Qdrant-backed VectorStore. Uses the configured client unless one is given.
+
+    Fields of ``payload_schema`` (default ``PAYLOAD_SCHEMA``) get a payload index when the collection is created.
+    """
+
+    backend = "qdrant"
+
+    def __init__(self, collection_name: str, dimension: int, client=None,
+                 payload_schema: Optional[PayloadSchema] = None) -> None:
+        super().__init__(collection_name, dimension)
+        self.client = client if client is not None else get_qdrant_client()
+        self.scope = client_scope(self.backend, self.client)
+        self.persistent = is_persistent_client(self.client)
+        self.payload_schema = validate_schema(DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema)
+
+    def create_collection(self, recreate: bool = False) -> None:
+        if recreate:
+            create_qdrant_collection(self.client, self.collection_name, self.dimension, self.payload_schema)
+            return
+        try:
+            if not self.client.collection_exists(self.collection_name):
+                self.client.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE)
+                )
+                info(f"📦 Qdrant collection '{self.collection_name}' created")
+                create_payload_indexes(self.client, self.collection_name, self.payload_schema)
+        except Exception as e:
+            error(f"❌ Failed to create collection: {e}")
+            raise
+
+    def upsert(self, ids: Sequence[Any], vectors: Sequence[Sequence[float]],
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        return self.upsert_batch(ColumnBatch.from_rows(ids, vectors, payloads))
+
+    def upsert_batch(self, batch: ColumnBatch) -> int:
+        try:
+            for part in batch.iter_slices(DEFAULT_CONVERT_BATCH):
+                self.client.upsert(collection_name=self.collection_name, points=to_qdrant_batch(part))
+            index_texts(self.scope, self.collection_name, batch.id_list(), batch.columns.get("text"))
+            info(f"✅ Upserted {len(batch)} points into Qdrant collection '{self.collection_name}'")
+            return len(batch)
+        except Exception as e:
+            error(f"❌ Failed to upsert points: {e}")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            self.client.delete(collection_name=self.collection_name,
+                               points_selector=PointIdsList(points=list(ids)))
+            remove_texts(self.scope, self.collection_name, ids)
+            return len(ids)
+        except Exception as e:
+            error(f"❌ Failed to delete points: {e}")
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return self.client.count(collection_name=self.collection_name, exact=True).count
+
+    def search(self, query_vector: Sequence[float], k: int = 10,
+               filters: Optional[Filters] = None) -> List[SearchResult]:
+        points = search_qdrant(self.client, self.collection_name, as_query(query_vector),
+                               limit=k, query_filter=build_filter(filters))
+        return [_to_result(point) for point in points]
+
+    def batch_search(self, query_vectors: Sequence[Sequence[float]], k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        batches = search_qdrant_batch(self.client, self.collection_name, as_matrix(query_vectors),
+                                      limit=k, query_filter=build_filter(filters))
+        return [[_to_result(point) for point in points] for points in batches]
+
+    def close(self) -> None:
+        self.client.close()
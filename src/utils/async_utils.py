@@ -0,0 +1,213 @@
+"""
+async_utils.py
+
+asyncio layer shared by the backend packages.
+
+Backends with a native async client await it directly; the others run their
+blocking calls on a bounded thread pool. Either way every call goes through
+an ``AsyncLimiter`` registered per backend, which caps the number of calls
+in flight (further callers wait on a semaphore, so thousands of pending
+queries cost only a coroutine each), applies a timeout and supports
+cancellation. For blocking calls the semaphore slot is held until the worker
+thread actually finishes, so timeouts cannot push more work onto a backend
+than its limit allows.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import warning
+
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 30.0
+
+
+class AsyncLimiter:
+    """
+    Per-backend concurrency limit, timeout and executor for async calls.
+
+    Args:
+        name (str): Backend name, used for thread names and log messages.
+        max_concurrency (int): Calls allowed in flight at once.
+        timeout (Optional[float]): Default per-call timeout in seconds; None disables it.
+        max_threads (Optional[int]): Worker threads for blocking calls; defaults to max_concurrency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_threads: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._max_threads = max_threads or max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per running loop: asyncio primitives must not be shared across loops.
+        # Entries go away with their loop, so short-lived asyncio.run() loops do not accumulate.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_threads, thread_name_prefix=f"{self.name}-aio"
+                )
+            return self._executor
+
+    async def run(self, awaitable: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Await a native coroutine under the concurrency limit and timeout.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time.
+        """
+        async with self._semaphore():
+            try:
+                return await asyncio.wait_for(awaitable, timeout if timeout is not None else self.timeout)
+            except asyncio.TimeoutError:
+                warning(f"Async call timed out on backend '{self.name}'", service="async_utils")
+                raise
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any,
+                           timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Run a blocking function on the backend's thread pool under the limit and timeout.
+
+        Cancelling the awaiting task (or a timeout) cancels the call if it has not
+        started yet; a call already running is left to finish in its thread.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout if timeout is not None else self.timeout
+            )
+        except asyncio.TimeoutError:
+            warning(f"Blocking call timed out on backend '{self.name}'", service="async_utils")
+            raise
+
+    async def gather(self, calls: Sequence[Awaitable[Any]]) -> List[Any]:
+        """
+        Await many calls concurrently; results are aligned with ``calls``.
+        """
+        return list(await asyncio.gather(*calls))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_limiters: Dict[str, AsyncLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(backend: str) -> AsyncLimiter:
+    """
+    Return the limiter of a backend, creating one with default limits on first use.
+
+    Args:
+        backend (str): Backend name, e.g. "qdrant".
+
+    Returns:
+        AsyncLimiter: The shared limiter.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(backend)
+        if limiter is None:
+            limiter = AsyncLimiter(backend)
+            _limiters[backend] = limiter
+        return limiter
+
+
+def configure_limiter(
+    backend: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    max_threads: Optional[int] = None,
+) -> AsyncLimiter:
+    """
+    Replace the limiter of a backend with one using the given limits.
+
+    Args:
+        backend (str): Backend name.
+        max_concurrency (int): Calls allowed in flight at once.
+        timeout (Optional[float]): Per-call timeout in seconds.
+        max_threads (Optional[int]): Worker threads for blocking calls.
+
+    Returns:
+        AsyncLimiter: The new limiter.
+    """
+    with _limiters_lock:
+        old = _limiters.get(backend)
+        limiter = AsyncLimiter(backend, max_concurrency, timeout, max_threads)
+        _limiters[backend] = limiter
+    if old is not None:
+        old.shutdown()
+    return limiter
+
+
+class AsyncVectorStore:
+    """
+    Async facade over any ``VectorStore``, running its calls through the backend limiter.
+
+    Args:
+        store (VectorStore): Synchronous store to wrap.
+        limiter (Optional[AsyncLimiter]): Limiter to use; defaults to the one of ``store.backend``.
+    """
+
+    def __init__(self, store: Any, limiter: Optional[AsyncLimiter] = None) -> None:
+        self.store = store
+        self.limiter = limiter or get_limiter(store.backend)
+
+    async def upsert(self, ids: Sequence[Any], vectors: Any,
+                     payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        return await self.limiter.run_blocking(self.store.upsert, ids, vectors, payloads)
+
+    async def delete(self, ids: Sequence[Any]) -> int:
+        return await self.limiter.run_blocking(self.store.delete, ids)
+
+    async def search(self, query_vector: Any, k: int = 10,
+                     filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+        return await self.limiter.run_blocking(self.store.search, query_vector, k=k, filters=filters)
+
+    async def batch_search(self, query_vectors: Any, k: int = 10,
+                           filters: Optional[Dict[str, Any]] = None) -> List[List[Any]]:
+        return await self.limiter.run_blocking(self.store.batch_search, query_vectors, k=k, filters=filters)
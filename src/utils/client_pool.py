@@ -0,0 +1,363 @@
+"""
+client_pool.py
+
+Bounded, health-checked pools of database clients shared across modules.
+
+A pool hands out clients through the ``connection()`` context manager (or
+``acquire``/``release``). Clients are created lazily by a factory, up to
+``max_size``; callers beyond that wait until one is returned. A client that
+has been idle longer than ``health_check_interval`` is checked before it is
+handed out, and a client whose lease ended in an error is checked before it
+goes back to the pool, so a dead connection is dropped and replaced on the
+next acquire instead of failing every later call. An optional keep-alive
+thread pings idle clients so that server-side connections stay warm and
+clients idle longer than ``max_idle_seconds`` are closed.
+
+Factories and health checks are plain callables, so a pool can be pointed at
+a local mock server by passing a factory that connects there.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, warning, error
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+DEFAULT_MAX_IDLE_SECONDS = 600.0
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no client becomes available within the acquire timeout."""
+
+
+@dataclass
+class _Entry:
+    client: Any
+    created_at: float
+    last_used: float
+    last_checked: float
+
+
+class ClientPool:
+    """
+    Bounded pool of reusable clients.
+
+    Args:
+        name (str): Pool name used in log messages.
+        factory (Callable[[], Any]): Creates and connects a new client.
+        health_check (Optional[Callable[[Any], bool]]): Returns True while a client is usable.
+            Exceptions count as unhealthy. Without one, clients are always considered healthy.
+        close (Optional[Callable[[Any], None]]): Closes a client; defaults to calling ``client.close()`` if present.
+        max_size (int): Maximum number of clients, leased and idle together.
+        acquire_timeout (float): Seconds to wait for a free client before raising.
+        health_check_interval (float): Idle time after which a client is checked before reuse.
+        max_idle_seconds (Optional[float]): Idle clients older than this are closed by the keep-alive thread.
+        keepalive_interval (Optional[float]): Seconds between keep-alive sweeps; None disables the thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        health_check: Optional[Callable[[Any], bool]] = None,
+        close: Optional[Callable[[Any], None]] = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        max_idle_seconds: Optional[float] = DEFAULT_MAX_IDLE_SECONDS,
+        keepalive_interval: Optional[float] = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.name = name
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_seconds = max_idle_seconds
+        self._factory = factory
+        self._health_check = health_check
+        self._close = close
+        self._idle: List[_Entry] = []
+        self._leased: Dict[int, _Entry] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._reserved = 0
+        self._created = 0
+        self._reconnects = 0
+        self._waits = 0
+        self._keepalive_stop = threading.Event()
+        self._keepalive: Optional[threading.Thread] = None
+        if keepalive_interval:
+            self._keepalive = threading.Thread(
+                target=self._keepalive_loop, args=(keepalive_interval,),
+                name=f"{name}-keepalive", daemon=True
+            )
+            self._keepalive.start()
+
+    @property
+    def size(self) -> int:
+        """Number of clients currently open, leased or idle."""
+        return len(self._idle) + len(self._leased) + self._reserved
+
+    def _is_healthy(self, client: Any) -> bool:
+        if self._health_check is None:
+            return True
+        try:
+            return bool(self._health_check(client))
+        except Exception as exc:
+            warning(f"Health check failed on pool '{self.name}': {exc}", service="client_pool")
+            return False
+
+    def _close_client(self, client: Any) -> None:
+        try:
+            if self._close is not None:
+                self._close(client)
+            elif hasattr(client, "close"):
+                client.close()
+        except Exception as exc:
+            warning(f"Failed to close client of pool '{self.name}': {exc}", service="client_pool")
+
+    def _create(self) -> _Entry:
+        client = self._factory()
+        now = time.monotonic()
+        with self._condition:
+            self._created += 1
+            created = self._created
+        info(f"Opened client {created} of pool '{self.name}'", service="client_pool")
+        return _Entry(client, now, now, now)
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Lease a healthy client, creating one if the pool is below its size limit.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait; defaults to ``acquire_timeout``.
+
+        Returns:
+            Any: The client. Return it with ``release``.
+
+        Raises:
+            PoolTimeoutError: If no client becomes available in time.
+            RuntimeError: If the pool is closed.
+        """
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError(f"Client pool '{self.name}' is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        self._leased[id(entry.client)] = entry
+                        break
+                    if self.size < self.max_size:
+                        # Reserve the slot while connecting outside the lock.
+                        entry = None
+                        self._reserved += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No client available in pool '{self.name}' "
+                                               f"after waiting for {self.max_size} leased clients")
+                    self._waits += 1
+                    self._condition.wait(remaining)
+
+            if entry is None:
+                try:
+                    entry = self._create()
+                except Exception as exc:
+                    with self._condition:
+                        self._reserved -= 1
+                        self._condition.notify()
+                    error(f"Failed to open client for pool '{self.name}': {exc}", service="client_pool")
+                    raise
+                with self._condition:
+                    self._reserved -= 1
+                    self._leased[id(entry.client)] = entry
+                entry.last_used = time.monotonic()
+                return entry.client
+
+            if time.monotonic() - entry.last_checked >= self.health_check_interval:
+                healthy = self._is_healthy(entry.client)
+                entry.last_checked = time.monotonic()
+                if not healthy:
+                    with self._condition:
+                        self._leased.pop(id(entry.client), None)
+                    self._discard(entry)
+                    continue
+            entry.last_used = time.monotonic()
+            return entry.client
+
+    def _discard(self, entry: _Entry) -> None:
+        self._close_client(entry.client)
+        with self._condition:
+            self._reconnects += 1
+            self._condition.notify()
+        warning(f"Dropped unhealthy client from pool '{self.name}'; it will be reopened lazily",
+                service="client_pool")
+
+    def release(self, client: Any, healthy: Optional[bool] = None) -> None:
+        """
+        Return a leased client to the pool.
+
+        Args:
+            client (Any): Client obtained from ``acquire``.
+            healthy (Optional[bool]): False closes and drops the client instead of
+                returning it to the pool.
+        """
+        with self._condition:
+            entry = self._leased.pop(id(client), None)
+        if entry is None:
+            warning(f"Released a client that does not belong to pool '{self.name}'", service="client_pool")
+            return
+        if healthy is False or self._closed:
+            if healthy is False:
+                self._discard(entry)
+            else:
+                self._close_client(client)
+            return
+        entry.last_used = time.monotonic()
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Lease a client for the duration of a ``with`` block.
+
+        If the block raises, the client is health-checked before it goes back
+        to the pool and dropped if the check fails.
+        """
+        client = self.acquire(timeout)
+        try:
+            yield client
+        except BaseException:
+            self.release(client, healthy=self._is_healthy(client))
+            raise
+        else:
+            self.release(client)
+
+    def _keepalive_loop(self, interval: float) -> None:
+        while not self._keepalive_stop.wait(interval):
+            self.sweep()
+
+    def sweep(self) -> None:
+        """
+        Health-check idle clients and close the ones that are dead or idle too long.
+        """
+        # Entries being checked stay counted in ``size`` through ``_reserved``.
+        with self._condition:
+            entries, self._idle = self._idle, []
+            self._reserved += len(entries)
+        keep = []
+        now = time.monotonic()
+        for entry in entries:
+            if self.max_idle_seconds is not None and now - entry.last_used > self.max_idle_seconds:
+                self._close_client(entry.client)
+                continue
+            if self._is_healthy(entry.client):
+                entry.last_checked = time.monotonic()
+                keep.append(entry)
+            else:
+                self._discard(entry)
+        with self._condition:
+            self._reserved -= len(entries)
+            self._idle.extend(keep)
+            self._condition.notify_all()
+
+    def owns(self, client: Any) -> bool:
+        """Whether the client is currently leased from or idle in this pool."""
+        with self._condition:
+            return id(client) in self._leased or any(entry.client is client for entry in self._idle)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "open": self.size,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "created": self._created,
+                "reconnects": self._reconnects,
+                "waits": self._waits,
+            }
+
+    def close(self) -> None:
+        """
+        Close idle clients and stop the keep-alive thread; leased clients are closed on release.
+        """
+        self._keepalive_stop.set()
+        with self._condition:
+            self._closed = True
+            entries, self._idle = self._idle, []
+            self._condition.notify_all()
+        for entry in entries:
+            self._close_client(entry.client)
+        info(f"Closed client pool '{self.name}'", service="client_pool")
+
+
+_pools: Dict[str, ClientPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: str, builder: Callable[[], ClientPool]) -> ClientPool:
+    """
+    Return the process-wide pool registered under ``key``, building it on first use.
+
+    A pool that has been closed is replaced by a new one.
+
+    Args:
+        key (str): Registry key, e.g. "weaviate:localhost:8080".
+        builder (Callable[[], ClientPool]): Creates the pool when it does not exist yet.
+
+    Returns:
+        ClientPool: The shared pool.
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = builder()
+            _pools[key] = pool
+        return pool
+
+
+def find_pool_key(client: Any) -> Optional[str]:
+    """
+    Return the registry key of the pool a client belongs to.
+
+    Args:
+        client (Any): Any client.
+
+    Returns:
+        Optional[str]: Key passed to ``get_pool``, or None if no registered pool holds the client.
+    """
+    with _pools_lock:
+        pools = list(_pools.items())
+    for key, pool in pools:
+        if pool.owns(client):
+            return key
+    return None
+
+
+def close_pools() -> None:
+    """
+    Close every registered pool.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
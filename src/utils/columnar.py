@@ -0,0 +1,171 @@
+"""
+columnar.py
+
+Column-oriented batches for bulk ingest.
+
+A ``ColumnBatch`` holds one ids array, one float32 vector matrix and one list
+per payload field instead of a dict (or PointStruct) per row. Backends that
+accept column-oriented writes (Qdrant's ``Batch``) take the columns as they
+are; row-oriented clients get their rows from ``to_rows``, which builds them
+in one pass over zipped columns rather than an indexed loop per entity.
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.vector_buffers import as_matrix, DEFAULT_CONVERT_BATCH
+from src.utils.id_allocator import resolve_ids
+
+
+@dataclass
+class ColumnBatch:
+    """
+    Ids, vectors and payload columns of a batch of points.
+
+    Attributes:
+        ids (np.ndarray): Point ids, int64 or string.
+        vectors (np.ndarray): (n, dim) float32 matrix.
+        columns (Dict[str, List[Any]]): Payload field name to one value per point;
+            None marks a missing value.
+    """
+    ids: np.ndarray
+    vectors: np.ndarray
+    columns: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.ids = np.asarray(self.ids)
+        self.vectors = as_matrix(self.vectors)
+        if self.vectors.shape[0] != len(self.ids):
+            raise ValueError(f"Got {len(self.ids)} ids but {self.vectors.shape[0]} vectors")
+        for name, values in self.columns.items():
+            if len(values) != len(self.ids):
+                raise ValueError(f"Column '{name}' has {len(values)} values for {len(self.ids)} ids")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Sequence[str],
+        embeddings: Any,
+        start_id: Optional[int] = None,
+        columns: Optional[Dict[str, Any]] = None,
+        ids: Optional[Sequence[int]] = None,
+    ) -> "ColumnBatch":
+        """
+        Build a batch with integer ids and a "text" column.
+
+        Ids are picked by ``resolve_ids``: explicit ``ids``, else consecutive
+        ids from ``start_id``, else content ids of the texts.
+
+        Args:
+            texts (Sequence[str]): Document texts.
+            embeddings (Any): Embedding matrix, one row per text.
+            start_id (Optional[int]): Id of the first text, for positional ids.
+            columns (Optional[Dict[str, Any]]): Extra payload columns; a scalar is repeated for every row.
+            ids (Optional[Sequence[int]]): Ids of the texts, e.g. reserved from an ``IdAllocator``.
+
+        Returns:
+            ColumnBatch: The batch.
+        """
+        count = len(texts)
+        payload_columns: Dict[str, List[Any]] = {"text": list(texts)}
+        for name, values in (columns or {}).items():
+            if isinstance(values, (list, tuple, np.ndarray)):
+                payload_columns[name] = list(values)
+            else:
+                payload_columns[name] = [values] * count
+        return cls(resolve_ids(texts, ids=ids, start_id=start_id), embeddings, payload_columns)
+
+    @classmethod
+    def from_rows(
+        cls,
+        ids: Sequence[Any],
+        vectors: Any,
+        payloads: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> "ColumnBatch":
+        """
+        Build a batch from row-oriented payload dicts.
+
+        Args:
+            ids (Sequence[Any]): Point ids.
+            vectors (Any): Vector matrix.
+            payloads (Optional[Sequence[Dict[str, Any]]]): One payload dict per point.
+
+        Returns:
+            ColumnBatch: The batch; fields missing from some payloads are None there.
+        """
+        columns: Dict[str, List[Any]] = {}
+        if payloads:
+            names = dict.fromkeys(name for payload in payloads for name in payload)
+            columns = {name: [payload.get(name) for payload in payloads] for name in names}
+        return cls(np.asarray(ids), vectors, columns)
+
+    def slice(self, start: int, stop: int) -> "ColumnBatch":
+        """
+        Rows ``start:stop`` as a new batch; ids and vectors are views.
+        """
+        return ColumnBatch(
+            self.ids[start:stop],
+            self.vectors[start:stop],
+            {name: values[start:stop] for name, values in self.columns.items()},
+        )
+
+    def deduplicated(self) -> "ColumnBatch":
+        """
+        The batch with one row per id; where ids repeat, the last row wins, as in sequential upserts.
+        """
+        _, last_reversed = np.unique(self.ids[::-1], return_index=True)
+        if len(last_reversed) == len(self):
+            return self
+        keep = np.sort(len(self) - 1 - last_reversed)
+        return ColumnBatch(
+            self.ids[keep],
+            self.vectors[keep],
+            {name: [values[i] for i in keep] for name, values in self.columns.items()},
+        )
+
+    def iter_slices(self, batch_size: int = DEFAULT_CONVERT_BATCH) -> Iterator["ColumnBatch"]:
+        for start in range(0, len(self), batch_size):
+            yield self.slice(start, start + batch_size)
+
+    def id_list(self) -> List[Any]:
+        """Ids as Python ints or strings, converted in one call."""
+        return self.ids.tolist()
+
+    def payload_rows(self) -> List[Dict[str, Any]]:
+        """
+        One payload dict per point, skipping missing (None) values.
+        """
+        if not self.columns:
+            return [{} for _ in range(len(self))]
+        names = list(self.columns)
+        return [
+            {name: value for name, value in zip(names, values) if value is not None}
+            for values in zip(*(self.columns[name] for name in names))
+        ]
+
+    def to_rows(self, id_field: str = "id", vector_field: str = "vector") -> List[Dict[str, Any]]:
+        """
+        Entity dicts for row-oriented insert APIs; vectors stay ndarray row views.
+
+        Args:
+            id_field (str): Key of the id in each row.
+            vector_field (str): Key of the vector in each row.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per point.
+        """
+        return [
+            {**payload, id_field: point_id, vector_field: vector}
+            for point_id, vector, payload in zip(self.id_list(), self.vectors, self.payload_rows())
+        ]
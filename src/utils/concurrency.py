@@ -0,0 +1,54 @@
+"""
+concurrency.py
+
+Helpers for fanning work out over a thread pool while keeping results
+aligned with their inputs.
+
+Used by the batched search APIs of backends whose clients only accept one
+query per request: the queries are issued concurrently and the results come
+back in query order, so callers cannot tell them apart from a native batch.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+DEFAULT_FAN_OUT = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fan_out(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = DEFAULT_FAN_OUT,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> List[R]:
+    """
+    Apply ``fn`` to every item concurrently and return results in input order.
+
+    Args:
+        fn (Callable[[T], R]): Function applied to each item.
+        items (Iterable[T]): Inputs.
+        max_workers (int): Threads used when no executor is given.
+        executor (Optional[ThreadPoolExecutor]): Shared executor to run on.
+
+    Returns:
+        List[R]: ``[fn(item) for item in items]``, computed concurrently.
+
+    Raises:
+        Exception: The first exception raised by ``fn``, in input order.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1 and executor is None:
+        return [fn(item) for item in items]
+    if executor is not None:
+        return list(executor.map(fn, items))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
@@ -0,0 +1,358 @@
+"""
+embedding_cache.py
+
+Content-addressed cache placed in front of ``model.encode()``.
+
+Embeddings are keyed by a SHA-1 digest of the model name, the encode options
+and the normalized text, so re-ingesting an unchanged corpus never reaches the
+model. Two tiers are kept:
+
+- an in-memory LRU of recently used vectors;
+- an on-disk store made of a raw float32 matrix (``vectors.f32``, read through
+  ``numpy.memmap``) and an append-only index of fixed-width digests
+  (``keys.bin``) whose row order matches the matrix.
+
+Appends hold an exclusive lock on ``.lock`` (POSIX ``flock``), so several
+processes can share a directory: each one first picks up the rows the others
+appended. Vectors are flushed before their keys; a torn write leaves rows
+without keys, which are cut off before the next append so key row numbers and
+matrix rows stay aligned.
+
+Only misses are sent to the model, in one batched call per ``encode``.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, one writer per directory
+    fcntl = None
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "embeddings")
+DEFAULT_MEMORY_ITEMS = 100_000
+DIGEST_SIZE = 20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing so trivial differences share one entry.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: NFC-normalized text with collapsed, trimmed whitespace.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + memory-mapped disk) embedding cache for one model.
+
+    Args:
+        model_name (str): Name of the model whose embeddings are cached.
+        cache_dir (Optional[str]): Directory for the disk tier. None keeps the cache in memory only.
+        max_memory_items (int): Capacity of the in-memory LRU tier.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        max_memory_items: int = DEFAULT_MEMORY_ITEMS,
+    ) -> None:
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self.dim: Optional[int] = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._rows: Dict[bytes, int] = {}
+        self._num_rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self._directory: Optional[str] = None
+
+        if cache_dir is not None:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+            self._directory = os.path.join(cache_dir, safe_name)
+            os.makedirs(self._directory, exist_ok=True)
+            self._load_index()
+
+    # ------------------------------------------------------------------ disk tier
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self._directory, "meta.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._directory, "vectors.f32")
+
+    @property
+    def _keys_path(self) -> str:
+        return os.path.join(self._directory, "keys.bin")
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self._directory, ".lock")
+
+    @contextmanager
+    def _disk_lock(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _sync_rows(self) -> None:
+        """
+        Pick up rows appended since the last sync and cut off a torn tail; call with the disk lock held.
+        """
+        row_bytes = 4 * self.dim
+        key_rows = os.path.getsize(self._keys_path) // DIGEST_SIZE if os.path.exists(self._keys_path) else 0
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        num_rows = min(key_rows, vector_rows)
+        # A write torn between vectors and keys leaves orphan vectors (or a partial row);
+        # new rows must start right after the last complete one.
+        for path, size in ((self._vectors_path, num_rows * row_bytes), (self._keys_path, num_rows * DIGEST_SIZE)):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                os.truncate(path, size)
+        if num_rows > self._num_rows:
+            with open(self._keys_path, "rb") as handle:
+                handle.seek(self._num_rows * DIGEST_SIZE)
+                raw_keys = handle.read((num_rows - self._num_rows) * DIGEST_SIZE)
+            for offset in range(num_rows - self._num_rows):
+                key = raw_keys[offset * DIGEST_SIZE:(offset + 1) * DIGEST_SIZE]
+                self._rows.setdefault(key, self._num_rows + offset)
+        self._num_rows = num_rows
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as handle:
+                self.dim = int(json.load(handle)["dim"])
+            with self._disk_lock():
+                self._sync_rows()
+            info(
+                f"Opened embedding cache for '{self.model_name}' with {self._num_rows} vectors",
+                service="embedding_cache",
+            )
+        except (OSError, ValueError, KeyError) as exc:
+            error(f"Ignoring unreadable embedding cache at '{self._directory}': {exc}",
+                  service="embedding_cache")
+            self._rows.clear()
+            self._num_rows = 0
+            self.dim = None
+
+    def _disk_matrix(self) -> np.ndarray:
+        if self._mmap is None or self._mmap.shape[0] < self._num_rows:
+            self._mmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r",
+                                   shape=(self._num_rows, self.dim))
+        return self._mmap
+
+    def _append_to_disk(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        if self._directory is None:
+            return
+        with self._disk_lock():
+            if not os.path.exists(self._meta_path):
+                with open(self._meta_path, "w", encoding="utf-8") as handle:
+                    json.dump({"model_name": self.model_name, "dim": self.dim}, handle)
+            self._sync_rows()
+            # Another process may have stored some of these keys meanwhile.
+            new_rows = [row for row, key in enumerate(keys) if key not in self._rows]
+            if not new_rows:
+                return
+            with open(self._vectors_path, "ab") as handle:
+                handle.write(np.ascontiguousarray(vectors[new_rows], dtype=np.float32).tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            with open(self._keys_path, "ab") as handle:
+                handle.write(b"".join(keys[row] for row in new_rows))
+            for offset, row in enumerate(new_rows):
+                self._rows[keys[row]] = self._num_rows + offset
+            self._num_rows += len(new_rows)
+
+    # ------------------------------------------------------------------ memory tier
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------ public API
+
+    def make_key(self, text: str, options: str = "") -> bytes:
+        """
+        Compute the cache key for a text.
+
+        Args:
+            text (str): Text to embed.
+            options (str): Serialized encode options that change the output.
+
+        Returns:
+            bytes: 20-byte SHA-1 digest.
+        """
+        payload = "\x00".join((self.model_name, options, normalize_text(text)))
+        return hashlib.sha1(payload.encode("utf-8")).digest()
+
+    def lookup(self, keys: Iterable[bytes]) -> Tuple[Dict[bytes, np.ndarray], List[bytes]]:
+        """
+        Resolve keys against both tiers.
+
+        Args:
+            keys (Iterable[bytes]): Cache keys.
+
+        Returns:
+            Tuple[Dict[bytes, np.ndarray], List[bytes]]: Found vectors and the keys that missed.
+        """
+        found: Dict[bytes, np.ndarray] = {}
+        missing: List[bytes] = []
+        missing_set = set()
+        with self._lock:
+            for key in keys:
+                if key in found or key in missing_set:
+                    continue
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    found[key] = vector
+                    continue
+                row = self._rows.get(key)
+                if row is not None:
+                    vector = np.array(self._disk_matrix()[row])
+                    self._remember(key, vector)
+                    self.hits_disk += 1
+                    found[key] = vector
+                    continue
+                self.misses += 1
+                missing.append(key)
+                missing_set.add(key)
+        return found, missing
+
+    def store(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        """
+        Add freshly computed vectors to both tiers.
+
+        Args:
+            keys (List[bytes]): Cache keys, one per row.
+            vectors (np.ndarray): Matrix of shape (len(keys), dim).
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+            new_keys, new_rows = [], []
+            for row, key in enumerate(keys):
+                self._remember(key, vectors[row].copy())
+                if key not in self._rows:
+                    new_keys.append(key)
+                    new_rows.append(row)
+            if new_keys:
+                self._append_to_disk(new_keys, vectors[new_rows])
+
+    def encode(self, model: Any, texts: List[str], **encode_kwargs: Any) -> np.ndarray:
+        """
+        Embed texts, sending only cache misses to the model.
+
+        Args:
+            model (Any): Object exposing ``encode(list[str]) -> ndarray``.
+            texts (List[str]): Texts to embed.
+            **encode_kwargs: Extra arguments forwarded to ``model.encode``; they are part of the key.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim), in input order.
+        """
+        options = json.dumps(encode_kwargs, sort_keys=True, default=str) if encode_kwargs else ""
+        keys = [self.make_key(text, options) for text in texts]
+        found, missing = self.lookup(keys)
+
+        if missing:
+            first_text = {}
+            for key, text in zip(keys, texts):
+                first_text.setdefault(key, text)
+            miss_texts = [first_text[key] for key in missing]
+            try:
+                encoded = np.asarray(model.encode(miss_texts, **encode_kwargs), dtype=np.float32)
+            except Exception as exc:
+                error(f"Failed to encode {len(miss_texts)} cache misses: {exc}", service="embedding_cache")
+                raise
+            self.store(missing, encoded)
+            for row, key in enumerate(missing):
+                found[key] = encoded[row]
+
+        if not keys:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for sizing the cache.
+
+        Returns:
+            Dict[str, Any]: Counters, tier sizes and overall hit rate.
+        """
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_items": self._num_rows,
+            }
+
+
+_caches: Dict[Tuple[str, Optional[str]], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> EmbeddingCache:
+    """
+    Return the process-wide cache for a model, creating it on first use.
+
+    Args:
+        model_name (str): Model name the cache is bound to.
+        cache_dir (Optional[str]): Disk tier directory, or None for memory only.
+
+    Returns:
+        EmbeddingCache: Shared cache instance.
+    """
+    key = (model_name, cache_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(model_name, cache_dir=cache_dir)
+            _caches[key] = cache
+        return cache
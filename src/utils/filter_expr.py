@@ -0,0 +1,417 @@
+"""
+filter_expr.py
+
+Milvus-style boolean filter expressions.
+
+Expressions such as ``"subject == 'biology' and 2019 <= year < 2023"`` are
+parsed once into a small immutable tree that every backend can consume:
+
+- the in-process engines compile it into NumPy masks over dictionary-encoded
+  payload columns (see ``src.utils.payload_index``);
+- Qdrant and Weaviate translate it into their native filter objects;
+- Milvus receives the expression string as is.
+
+Supported syntax: comparisons ``== != < <= > >=`` between a field and a
+literal (either side), chained ranges (``1 < x <= 5``), ``in`` / ``not in``
+with a list literal, ``is null`` / ``is not null``, ``and`` / ``or`` /
+``not`` (also ``&&``, ``||``, ``!``) and parentheses. Literals are numbers,
+quoted strings and ``true`` / ``false`` (not allowed in ranges). Field names
+may contain dots for nested payload keys.
+
+A missing field reads as null: it fails ``==``, ``in`` and every range and
+satisfies ``!=`` and ``not in``, so ``not (x < 5)`` also matches rows
+without ``x``. Backends without a NOT operator get ``negate``, which keeps
+this by turning a negated range into "opposite range or ``is null``".
+
+The dict filters used elsewhere in the repo ({field: value | [values]}) map
+onto the same tree, so every store accepts either form.
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+COMPARISONS = ("==", "!=", "<", "<=", ">", ">=")
+RANGE_OPS = ("<", "<=", ">", ">=")
+_FLIPPED = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+_NEGATED = {"==": "!=", "!=": "==", "<": ">=", "<=": ">", ">": "<=", ">=": "<"}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<op>==|!=|<=|>=|<|>|&&|\|\||!|\(|\)|\[|\]|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+    )""", re.VERBOSE)
+_KEYWORDS = {"and": "&&", "or": "||", "not": "!", "in": "in", "is": "is", "null": "null"}
+_LITERALS = {"true": True, "false": False}
+
+
+class FilterSyntaxError(ValueError):
+    """
+    Raised for an expression that cannot be parsed.
+    """
+
+
+@dataclass(frozen=True)
+class Compare:
+    """``field op value``; ``op`` is one of ``COMPARISONS``."""
+    field: str
+    op: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class In:
+    """``field in [values]``, or ``field not in [values]`` when ``negate``."""
+    field: str
+    values: FrozenSet[Any]
+    negate: bool = False
+
+
+@dataclass(frozen=True)
+class IsNull:
+    """``field is null``: the field is missing or null."""
+    field: str
+
+
+@dataclass(frozen=True)
+class And:
+    items: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    items: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    item: "Node"
+
+
+Node = Union[Compare, In, IsNull, And, Or, Not]
+
+
+def _tokenize(expression: str) -> List[Tuple[str, Any, int]]:
+    tokens = []
+    position = 0
+    end = len(expression.rstrip())
+    while position < end:
+        match = _TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise FilterSyntaxError(f"Unexpected character at {position} in filter: {expression!r}")
+        start = match.start(match.lastgroup)
+        kind, text = match.lastgroup, match.group(match.lastgroup)
+        if kind == "number":
+            value: Any = float(text) if any(c in text for c in ".eE") else int(text)
+            tokens.append(("literal", value, start))
+        elif kind == "string":
+            tokens.append(("literal", re.sub(r"\\(.)", r"\1", text[1:-1]), start))
+        elif kind == "name" and text.lower() in _KEYWORDS:
+            tokens.append(("op", _KEYWORDS[text.lower()], start))
+        elif kind == "name" and text.lower() in _LITERALS:
+            tokens.append(("literal", _LITERALS[text.lower()], start))
+        else:
+            tokens.append((kind, text, start))
+        position = match.end()
+    tokens.append(("end", None, end))
+    return tokens
+
+
+def _flatten(items: List["Node"], kind: type) -> Tuple["Node", ...]:
+    # "a < x < b and c" is one conjunction of three conditions, not a nested one.
+    flat: List[Node] = []
+    for item in items:
+        flat.extend(item.items if isinstance(item, kind) else (item,))
+    return tuple(flat)
+
+
+class _Parser:
+    """
+    Recursive descent: or -> and -> unary -> primary, loosest binding first.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> Tuple[str, Any, int]:
+        return self.tokens[self.position]
+
+    def _accept(self, op: str) -> bool:
+        kind, text, _ = self._peek()
+        if kind == "op" and text == op:
+            self.position += 1
+            return True
+        return False
+
+    def _fail(self, what: str) -> FilterSyntaxError:
+        kind, text, start = self._peek()
+        found = "end of expression" if kind == "end" else repr(text)
+        return FilterSyntaxError(f"Expected {what} at {start}, found {found} in filter: {self.expression!r}")
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek()[0] != "end":
+            raise self._fail("'and', 'or' or end of expression")
+        return node
+
+    def _or(self) -> Node:
+        items = [self._and()]
+        while self._accept("||"):
+            items.append(self._and())
+        return items[0] if len(items) == 1 else Or(_flatten(items, Or))
+
+    def _and(self) -> Node:
+        items = [self._unary()]
+        while self._accept("&&"):
+            items.append(self._unary())
+        return items[0] if len(items) == 1 else And(_flatten(items, And))
+
+    def _unary(self) -> Node:
+        if self._accept("!"):
+            return Not(self._unary())
+        if self._accept("("):
+            node = self._or()
+            if not self._accept(")"):
+                raise self._fail("')'")
+            return node
+        return self._comparison()
+
+    def _operand(self) -> Tuple[str, Any]:
+        kind, text, _ = self._peek()
+        if kind not in ("name", "literal"):
+            raise self._fail("a field name or literal")
+        self.position += 1
+        return kind, text
+
+    def _comparison(self) -> Node:
+        operands = [self._operand()]
+        if operands[0][0] == "name":
+            negate = False
+            if self._peek()[:2] == ("op", "!") and self.tokens[self.position + 1][:2] == ("op", "in"):
+                self.position += 1
+                negate = True
+            if self._accept("in"):
+                return In(operands[0][1], frozenset(self._list()), negate)
+            if self._accept("is"):
+                negate = self._accept("!")
+                if not self._accept("null"):
+                    raise self._fail("'null'")
+                return Not(IsNull(operands[0][1])) if negate else IsNull(operands[0][1])
+        ops = []
+        while self._peek()[0] == "op" and self._peek()[1] in COMPARISONS:
+            ops.append(self._peek()[1])
+            self.position += 1
+            operands.append(self._operand())
+        if not ops:
+            raise self._fail("a comparison operator or 'in'")
+        comparisons = []
+        for op, (left_kind, left), (right_kind, right) in zip(ops, operands, operands[1:]):
+            if op in RANGE_OPS and (isinstance(left, bool) or isinstance(right, bool)):
+                raise FilterSyntaxError(f"Range '{op}' cannot compare with a boolean in filter: {self.expression!r}")
+            if left_kind == "name" and right_kind == "literal":
+                comparisons.append(Compare(left, op, right))
+            elif left_kind == "literal" and right_kind == "name":
+                comparisons.append(Compare(right, _FLIPPED[op], left))
+            else:
+                raise FilterSyntaxError(
+                    f"Comparison '{op}' needs one field and one literal in filter: {self.expression!r}")
+        return comparisons[0] if len(comparisons) == 1 else And(tuple(comparisons))
+
+    def _list(self) -> List[Any]:
+        if not self._accept("["):
+            raise self._fail("'['")
+        values = []
+        if not self._accept("]"):
+            while True:
+                kind, value, _ = self._peek()
+                if kind != "literal":
+                    raise self._fail("a literal")
+                self.position += 1
+                values.append(value)
+                if self._accept("]"):
+                    break
+                if not self._accept(","):
+                    raise self._fail("',' or ']'")
+        return values
+
+
+@lru_cache(maxsize=1024)
+def parse_filter(expression: str) -> Node:
+    """
+    Parse a filter expression; results are cached per expression string.
+
+    Args:
+        expression (str): Milvus-style boolean expression.
+
+    Returns:
+        Node: Expression tree.
+
+    Raises:
+        FilterSyntaxError: If the expression is malformed.
+    """
+    return _Parser(expression).parse()
+
+
+def from_dict(filters: Dict[str, Any]) -> Node:
+    """
+    Tree of a {field: value | [values]} filter: equality or membership per field, all required.
+    """
+    items = tuple(
+        In(field, frozenset(value)) if isinstance(value, (list, tuple, set, frozenset))
+        else Compare(field, "==", value)
+        for field, value in filters.items()
+    )
+    return items[0] if len(items) == 1 else And(items)
+
+
+def to_node(filters: Any) -> Optional[Node]:
+    """
+    Normalize any accepted filter form to a tree.
+
+    Args:
+        filters (Any): None, an expression string, a {field: value | [values]} dict or a tree.
+
+    Returns:
+        Optional[Node]: The tree, or None when nothing is filtered.
+    """
+    if not filters:
+        return None
+    if isinstance(filters, str):
+        return parse_filter(filters)
+    if isinstance(filters, dict):
+        return from_dict(filters)
+    if isinstance(filters, (Compare, In, IsNull, And, Or, Not)):
+        return filters
+    raise TypeError(f"Unsupported filter of type {type(filters).__name__}")
+
+
+def negate(node: Node) -> Node:
+    """
+    Push a negation down to the leaves (De Morgan), for backends without a NOT operator.
+
+    ``matches(negate(node), p) == (not matches(node, p))`` for every payload whose
+    values have the literal's type or are missing: a negated range is the opposite
+    range or ``is null``. The only NOT left is ``Not(IsNull(field))``.
+    """
+    if isinstance(node, Compare):
+        negated = Compare(node.field, _NEGATED[node.op], node.value)
+        return Or((negated, IsNull(node.field))) if node.op in RANGE_OPS else negated
+    if isinstance(node, IsNull):
+        return Not(node)
+    if isinstance(node, In):
+        return In(node.field, node.values, not node.negate)
+    if isinstance(node, And):
+        return Or(tuple(negate(item) for item in node.items))
+    if isinstance(node, Or):
+        return And(tuple(negate(item) for item in node.items))
+    return node.item
+
+
+def fields(node: Optional[Node]) -> FrozenSet[str]:
+    """
+    Payload fields referenced by an expression.
+    """
+    if node is None:
+        return frozenset()
+    if isinstance(node, (Compare, In, IsNull)):
+        return frozenset((node.field,))
+    if isinstance(node, Not):
+        return fields(node.item)
+    return frozenset().union(*(fields(item) for item in node.items))
+
+
+def field_value(payload: Dict[str, Any], field: str) -> Any:
+    """
+    Value of a possibly dotted field in a payload; None when missing.
+    """
+    if field in payload or "." not in field:
+        return payload.get(field)
+    value: Any = payload
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _compare(value: Any, op: str, literal: Any) -> bool:
+    if op == "==":
+        return value == literal
+    if op == "!=":
+        return value != literal
+    try:
+        if op == "<":
+            return value < literal
+        if op == "<=":
+            return value <= literal
+        if op == ">":
+            return value > literal
+        return value >= literal
+    except TypeError:
+        # Missing values and mismatched types never satisfy a range.
+        return False
+
+
+def matches(node: Optional[Node], payload: Dict[str, Any]) -> bool:
+    """
+    Evaluate an expression against one payload; the row-by-row reference of the vectorized masks.
+
+    A missing field reads as None: it fails ``==``, ``in`` and every range and satisfies ``!=``.
+    """
+    if node is None:
+        return True
+    if isinstance(node, Compare):
+        return _compare(field_value(payload, node.field), node.op, node.value)
+    if isinstance(node, IsNull):
+        return field_value(payload, node.field) is None
+    if isinstance(node, In):
+        value = field_value(payload, node.field)
+        try:
+            found = value in node.values
+        except TypeError:
+            found = False
+        return found != node.negate
+    if isinstance(node, And):
+        return all(matches(item, payload) for item in node.items)
+    if isinstance(node, Or):
+        return any(matches(item, payload) for item in node.items)
+    return not matches(node.item, payload)
+
+
+def _format_literal(value: Any) -> str:
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def format_filter(node: Node) -> str:
+    """
+    Milvus expression string of a tree; ``parse_filter(format_filter(node)) == node``.
+    """
+    if isinstance(node, Compare):
+        return f"{node.field} {node.op} {_format_literal(node.value)}"
+    if isinstance(node, IsNull):
+        return f"{node.field} is null"
+    if isinstance(node, In):
+        values = ", ".join(_format_literal(v) for v in sorted(node.values, key=repr))
+        return f"{node.field} {'not in' if node.negate else 'in'} [{values}]"
+    if isinstance(node, And):
+        return " and ".join(f"({format_filter(item)})" if isinstance(item, Or) else format_filter(item)
+                            for item in node.items)
+    if isinstance(node, Or):
+        return " or ".join(format_filter(item) for item in node.items)
+    return f"not ({format_filter(node.item)})"
@@ -0,0 +1,255 @@
+"""
+hybrid.py
+
+Hybrid sparse + dense retrieval.
+
+``hybrid_search`` runs the dense search of any ``VectorStore`` and a BM25
+search of the collection's ``BM25Index`` for the same query and fuses the two
+ranked lists, so documents that match on exact tokens are found without
+raising k on the dense side. Two fusions are provided:
+
+- ``reciprocal_rank_fusion``: sum of ``weight / (rrf_k + rank)``; uses ranks
+  only, so the two score scales never have to be compared;
+- ``weighted_fusion``: ``alpha * dense + (1 - alpha) * sparse`` over
+  min-max normalized scores, for when the score gaps carry signal.
+
+``HybridStore`` wraps a store so its writes also maintain the sparse index.
+Environment: ``HYBRID_FUSION`` ("rrf" or "weighted"), ``HYBRID_ALPHA``.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info
+from src.utils.sparse_index import BM25Index, get_sparse_index
+from src.utils.vector_buffers import as_matrix
+from src.utils.vector_store import VectorStore, SearchResult, Filters, PointId
+from src.utils.columnar import ColumnBatch
+
+DEFAULT_RRF_K = 60
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "rrf")
+HYBRID_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.5"))
+FUSION_METHODS = ("rrf", "weighted")
+
+
+def sparse_results(index: BM25Index, query: str, k: int, text_field: str = "text") -> List[SearchResult]:
+    """
+    BM25 hits as ``SearchResult`` objects, with the indexed text as payload when kept.
+    """
+    results = []
+    for point_id, score in index.search(query, k):
+        text = index.text(point_id)
+        results.append(SearchResult(id=point_id, score=score, payload={text_field: text} if text is not None else {}))
+    return results
+
+
+def _merge_payloads(result_lists: Sequence[Sequence[SearchResult]]) -> Dict[PointId, Dict[str, Any]]:
+    # The first list (dense) carries the full stored payload; sparse hits only carry the text.
+    payloads: Dict[PointId, Dict[str, Any]] = {}
+    for results in result_lists:
+        for result in results:
+            if result.id not in payloads or not payloads[result.id]:
+                payloads[result.id] = result.payload
+    return payloads
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[SearchResult]],
+    k: Optional[int] = None,
+    rrf_k: int = DEFAULT_RRF_K,
+    weights: Optional[Sequence[float]] = None,
+) -> List[SearchResult]:
+    """
+    Fuse ranked lists by reciprocal rank.
+
+    Args:
+        result_lists (Sequence[Sequence[SearchResult]]): Ranked lists, best hit first.
+        k (Optional[int]): Results to return; all fused hits by default.
+        rrf_k (int): Rank offset; larger values flatten the contribution of top ranks.
+        weights (Optional[Sequence[float]]): Per-list weights, 1 each by default.
+
+    Returns:
+        List[SearchResult]: Hits by decreasing fused score.
+    """
+    weights = weights or [1.0] * len(result_lists)
+    scores: Dict[PointId, float] = {}
+    for results, weight in zip(result_lists, weights):
+        for rank, result in enumerate(results, start=1):
+            scores[result.id] = scores.get(result.id, 0.0) + weight / (rrf_k + rank)
+    payloads = _merge_payloads(result_lists)
+    fused = sorted(scores.items(), key=lambda item: -item[1])
+    return [SearchResult(id=point_id, score=score, payload=payloads[point_id])
+            for point_id, score in fused[:k]]
+
+
+def _min_max(results: Sequence[SearchResult]) -> Dict[PointId, float]:
+    if not results:
+        return {}
+    low = min(r.score for r in results)
+    span = max(r.score for r in results) - low
+    return {r.id: (r.score - low) / span if span > 0 else 1.0 for r in results}
+
+
+def weighted_fusion(
+    dense: Sequence[SearchResult],
+    sparse: Sequence[SearchResult],
+    alpha: float = HYBRID_ALPHA,
+    k: Optional[int] = None,
+) -> List[SearchResult]:
+    """
+    Fuse dense and sparse hits by a weighted sum of min-max normalized scores.
+
+    Args:
+        dense (Sequence[SearchResult]): Dense hits.
+        sparse (Sequence[SearchResult]): BM25 hits.
+        alpha (float): Weight of the dense score; the sparse score gets ``1 - alpha``.
+        k (Optional[int]): Results to return; all fused hits by default.
+
+    Returns:
+        List[SearchResult]: Hits by decreasing fused score; a hit missing from one list scores 0 there.
+    """
+    dense_scores, sparse_scores = _min_max(dense), _min_max(sparse)
+    payloads = _merge_payloads([dense, sparse])
+    fused = sorted(
+        ((point_id, alpha * dense_scores.get(point_id, 0.0) + (1.0 - alpha) * sparse_scores.get(point_id, 0.0))
+         for point_id in payloads),
+        key=lambda item: -item[1],
+    )
+    return [SearchResult(id=point_id, score=score, payload=payloads[point_id]) for point_id, score in fused[:k]]
+
+
+def fuse(dense: Sequence[SearchResult], sparse: Sequence[SearchResult], k: int,
+         method: str = HYBRID_FUSION, alpha: float = HYBRID_ALPHA) -> List[SearchResult]:
+    """
+    Fuse dense and sparse hits with ``method`` ("rrf" or "weighted").
+
+    For "rrf", ``alpha`` and ``1 - alpha`` weight the dense and sparse lists.
+    """
+    if method == "rrf":
+        return reciprocal_rank_fusion([dense, sparse], k=k, weights=[2.0 * alpha, 2.0 * (1.0 - alpha)])
+    if method == "weighted":
+        return weighted_fusion(dense, sparse, alpha=alpha, k=k)
+    raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+
+
+def hybrid_search(
+    store: VectorStore,
+    query: str,
+    encode_fn: Callable[[List[str]], Any],
+    k: int = 10,
+    filters: Optional[Filters] = None,
+    index: Optional[BM25Index] = None,
+    method: str = HYBRID_FUSION,
+    alpha: float = HYBRID_ALPHA,
+    depth: Optional[int] = None,
+    text_field: str = "text",
+) -> List[SearchResult]:
+    """
+    Dense and BM25 search of one query, fused into a single ranking.
+
+    Payload filters are only understood by the store, so with ``filters``
+    sparse hits are kept only if the dense side returned them too; they then
+    reorder the filtered dense hits rather than add new ones.
+
+    Args:
+        store (VectorStore): Any backend store.
+        query (str): Query text.
+        encode_fn (Callable[[List[str]], Any]): Maps a batch of texts to an embedding matrix.
+        k (int): Results to return.
+        filters (Optional[Filters]): Payload filter of the dense search.
+        index (Optional[BM25Index]): Sparse index; the process-wide one of the store's collection by default.
+        method (str): "rrf" or "weighted".
+        alpha (float): Weight of the dense side.
+        depth (Optional[int]): Hits taken from each side before fusion; k by default.
+        text_field (str): Payload field the fused sparse-only hits carry their text in.
+
+    Returns:
+        List[SearchResult]: Top k fused hits; scores are fusion scores.
+    """
+    started = time.perf_counter()
+    index = index if index is not None else get_sparse_index(store.scope, store.collection_name)
+    depth = depth or k
+    dense = store.search(as_matrix(encode_fn([query]))[0], k=depth, filters=filters)
+    sparse = sparse_results(index, query, depth, text_field)
+    if filters:
+        allowed = {result.id for result in dense}
+        sparse = [result for result in sparse if result.id in allowed]
+    fused = fuse(dense, sparse, k, method, alpha)
+    info("Fused %d dense and %d sparse hits", len(dense), len(sparse), service="hybrid",
+         operation="hybrid_search", latency_ms=(time.perf_counter() - started) * 1000.0,
+         collection=store.collection_name)
+    return fused
+
+
+class HybridStore(VectorStore):
+    """
+    ``VectorStore`` wrapper that keeps a BM25 index of the stored texts.
+
+    Upserts index the ``text_field`` of each payload and deletes remove the
+    ids, so ``search_text`` can run hybrid queries against any backend.
+
+    Args:
+        store (VectorStore): Store to wrap.
+        index (Optional[BM25Index]): Sparse index; the collection's process-wide one by default.
+        text_field (str): Payload field holding the document text.
+    """
+
+    def __init__(self, store: VectorStore, index: Optional[BM25Index] = None, text_field: str = "text") -> None:
+        super().__init__(store.collection_name, store.dimension)
+        self.store = store
+        self.backend = store.backend
+        self.scope = store.scope
+        self.persistent = store.persistent
+        self.index = index if index is not None else get_sparse_index(store.scope, store.collection_name)
+        self.text_field = text_field
+
+    def create_collection(self, recreate: bool = False) -> None:
+        self.store.create_collection(recreate=recreate)
+        if recreate:
+            self.index.clear()
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        count = self.store.upsert(ids, vectors, payloads)
+        payloads = payloads or [{} for _ in ids]
+        self.index.add(list(ids), [payload.get(self.text_field) or "" for payload in payloads])
+        return count
+
+    def upsert_batch(self, batch: ColumnBatch) -> int:
+        count = self.store.upsert_batch(batch)
+        texts = batch.columns.get(self.text_field) or [None] * len(batch)
+        self.index.add(batch.id_list(), [text or "" for text in texts])
+        return count
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        count = self.store.delete(ids)
+        self.index.remove(ids)
+        return count
+
+    def count(self) -> Optional[int]:
+        return self.store.count()
+
+    def search(self, query_vector: Any, k: int = 10, filters: Optional[Filters] = None) -> List[SearchResult]:
+        return self.store.search(query_vector, k=k, filters=filters)
+
+    def batch_search(self, query_vectors: Any, k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        return self.store.batch_search(query_vectors, k=k, filters=filters)
+
+    def search_text(self, text: str, encode_fn: Callable[[List[str]], Any], k: int = 10,
+                    filters: Optional[Filters] = None, method: str = HYBRID_FUSION,
+                    alpha: float = HYBRID_ALPHA) -> List[SearchResult]:
+        """
+        Hybrid search by query text, see ``hybrid_search``.
+        """
+        return hybrid_search(self.store, text, encode_fn, k=k, filters=filters, index=self.index,
+                             method=method, alpha=alpha, text_field=self.text_field)
+
+    def close(self) -> None:
+        self.store.close()
@@ -0,0 +1,222 @@
+"""
+id_allocator.py
+
+Point id allocation that stays unique across runs, threads and processes.
+
+Two strategies replace positional ``range(len(texts))`` ids:
+
+- content ids: a 63-bit hash of the normalized text, so re-ingesting the same
+  text overwrites its own point instead of another document's;
+- a persisted monotonic counter (``IdAllocator``) kept in a SQLite file.
+  Each allocator reserves blocks of ids from the file inside an immediate
+  transaction, so processes sharing the file never receive the same id, and
+  hands them out in-process under a lock. Ids left in a block when a process
+  exits are never reused; the sequence has gaps but no repeats.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+from src.utils.embedding_cache import normalize_text
+
+DEFAULT_ID_PATH = os.path.join(ROOT_DIR, ".cache", "ids.sqlite")
+DEFAULT_ID_BLOCK = 1024
+_ID_MASK = (1 << 63) - 1
+
+
+def stable_point_id(doc_id: str) -> int:
+    """
+    Deterministic 63-bit integer point id for a document id.
+
+    Accepted by every backend (Qdrant unsigned ids, Milvus INT64 primary keys,
+    Weaviate and Pinecone through their own id mapping). The collision
+    probability stays below 1e-5 even for 10M documents.
+
+    Args:
+        doc_id (str): Document id.
+
+    Returns:
+        int: Non-negative 63-bit integer.
+    """
+    digest = hashlib.blake2b(doc_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & _ID_MASK
+
+
+def content_ids(texts: Sequence[str]) -> np.ndarray:
+    """
+    Deterministic 63-bit ids derived from the normalized texts.
+
+    Hashed in a separate domain from ``stable_point_id`` so a text never maps
+    to the id of an unrelated document id string.
+
+    Args:
+        texts (Sequence[str]): Document texts.
+
+    Returns:
+        np.ndarray: int64 ids, one per text.
+    """
+    ids = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=8, person=b"content").digest()
+        ids[i] = int.from_bytes(digest, "big") & _ID_MASK
+    return ids
+
+
+class IdAllocator:
+    """
+    Persisted monotonic id counter, safe across threads and processes.
+
+    Args:
+        path (str): SQLite file holding the counters; created if missing.
+        name (str): Counter name, typically the collection name.
+        block_size (int): Ids reserved from the file per transaction.
+    """
+
+    def __init__(self, path: str = DEFAULT_ID_PATH, name: str = "default",
+                 block_size: int = DEFAULT_ID_BLOCK) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._next = 0
+        self._end = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # A forked child must neither share the parent's connection nor its reserved block.
+            self._db = None
+            self._next = self._end = 0
+            self._pid = os.getpid()
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, next_id INTEGER NOT NULL)")
+        return self._db
+
+    def _reserve(self, count: int) -> int:
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT next_id FROM counters WHERE name = ?", (self.name,)).fetchone()
+            start = row[0] if row else 0
+            db.execute("INSERT OR REPLACE INTO counters (name, next_id) VALUES (?, ?)", (self.name, start + count))
+            db.execute("COMMIT")
+            return start
+        except Exception as exc:
+            db.execute("ROLLBACK")
+            error(f"Failed to reserve {count} ids for '{self.name}': {exc}", service="id_allocator")
+            raise
+
+    def allocate(self, count: int) -> range:
+        """
+        Reserve ``count`` consecutive ids.
+
+        Args:
+            count (int): Number of ids.
+
+        Returns:
+            range: The ids; never handed out again by any allocator on the same file and name.
+        """
+        if count < 0:
+            raise ValueError("count must be non-negative")
+        with self._lock:
+            if self._pid != os.getpid() or count > self._end - self._next:
+                size = max(self.block_size, count)
+                self._next = self._reserve(size)
+                self._end = self._next + size
+            start = self._next
+            self._next += count
+            return range(start, start + count)
+
+    def next_id(self) -> int:
+        """
+        Reserve a single id.
+        """
+        return self.allocate(1)[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
+            self._next = self._end = 0
+
+
+_allocators: Dict[Tuple[str, str], IdAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_id_allocator(name: str = "default", path: str = DEFAULT_ID_PATH,
+                     block_size: int = DEFAULT_ID_BLOCK) -> IdAllocator:
+    """
+    Return the process-wide allocator for a counter, creating it on first use.
+
+    Args:
+        name (str): Counter name, typically the collection name.
+        path (str): SQLite file holding the counters.
+        block_size (int): Ids reserved from the file per transaction.
+
+    Returns:
+        IdAllocator: Shared allocator instance.
+    """
+    key = (name, os.path.abspath(path))
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = IdAllocator(path, name, block_size)
+            _allocators[key] = allocator
+            info(f"Id allocator '{name}' opened at {path}", service="id_allocator")
+        return allocator
+
+
+def resolve_ids(
+    texts: Sequence[str],
+    ids: Optional[Sequence[int]] = None,
+    start_id: Optional[int] = None,
+    allocator: Optional[IdAllocator] = None,
+) -> np.ndarray:
+    """
+    Pick point ids for a batch of texts.
+
+    Explicit ``ids`` win, then positional ids from ``start_id``, then ids
+    reserved from ``allocator``; otherwise the ids are content ids.
+
+    Args:
+        texts (Sequence[str]): Document texts.
+        ids (Optional[Sequence[int]]): Ids given by the caller.
+        start_id (Optional[int]): First id of a consecutive range.
+        allocator (Optional[IdAllocator]): Counter to reserve ids from.
+
+    Returns:
+        np.ndarray: int64 ids, one per text.
+
+    Raises:
+        ValueError: If ``ids`` does not have one id per text.
+    """
+    if ids is not None:
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(texts):
+            raise ValueError(f"Got {len(ids)} ids for {len(texts)} texts")
+        return ids
+    if start_id is not None:
+        return np.arange(start_id, start_id + len(texts), dtype=np.int64)
+    if allocator is not None:
+        reserved = allocator.allocate(len(texts))
+        return np.arange(reserved.start, reserved.stop, dtype=np.int64)
+    return content_ids(texts)
@@ -0,0 +1,199 @@
+"""
+ingestion.py
+
+Streaming, batched ingestion pipeline shared by the vector database backends.
+
+Documents are pulled lazily from any iterable in fixed-size batches. The
+calling thread encodes batch N+1 while a writer thread pushes batch N to the
+backend, and the two stages are connected by a bounded queue so the encoder
+blocks instead of buffering the corpus when the backend falls behind. Memory
+use therefore stays proportional to ``batch_size * max_pending`` regardless of
+corpus size.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_PENDING = 2
+
+EncodeFn = Callable[[List[str]], Any]
+WriteFn = Callable[[List[str], Any, int], Optional[int]]
+
+_SENTINEL = object()
+
+
+@dataclass
+class IngestStats:
+    """
+    Summary of a streaming ingestion run.
+
+    Attributes:
+        documents (int): Number of documents written.
+        failed (int): Number of documents the backend rejected, as reported by the write function.
+        batches (int): Number of batches written.
+        encode_seconds (float): Time spent inside the encode function.
+        write_seconds (float): Time spent inside the write function.
+        elapsed_seconds (float): Wall-clock time of the whole run.
+    """
+    documents: int = 0
+    failed: int = 0
+    batches: int = 0
+    encode_seconds: float = 0.0
+    write_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def iter_batches(documents: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[str]]:
+    """
+    Pull fixed-size batches from an iterable without materializing it.
+
+    Args:
+        documents (Iterable[str]): Source documents.
+        batch_size (int): Maximum number of documents per batch.
+
+    Yields:
+        List[str]: The next batch; the last one may be shorter.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    iterator = iter(documents)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def encode_batches(
+    documents: Iterable[str],
+    encode_fn: EncodeFn,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: Optional[IngestStats] = None,
+) -> Iterator[Tuple[int, List[str], Any]]:
+    """
+    Generator stage that encodes documents batch by batch.
+
+    Args:
+        documents (Iterable[str]): Source documents.
+        encode_fn (EncodeFn): Callable mapping a list of texts to an embedding matrix.
+        batch_size (int): Documents per batch.
+        stats (Optional[IngestStats]): Accumulates encode time when given.
+
+    Yields:
+        Tuple[int, List[str], Any]: Offset of the batch in the stream, its texts and embeddings.
+    """
+    offset = 0
+    for batch in iter_batches(documents, batch_size):
+        started = time.perf_counter()
+        embeddings = encode_fn(batch)
+        if stats is not None:
+            stats.encode_seconds += time.perf_counter() - started
+        yield offset, batch, embeddings
+        offset += len(batch)
+
+
+def ingest_stream(
+    documents: Iterable[str],
+    encode_fn: EncodeFn,
+    write_fn: WriteFn,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> IngestStats:
+    """
+    Encode and write documents with the two stages overlapped.
+
+    Args:
+        documents (Iterable[str]): Source documents; consumed lazily.
+        encode_fn (EncodeFn): Callable mapping a list of texts to an embedding matrix.
+        write_fn (WriteFn): Callable ``(texts, embeddings, offset)`` writing one batch to the backend;
+            it may return the number of documents the backend rejected.
+        batch_size (int): Documents per batch.
+        max_pending (int): Encoded batches allowed to wait for the writer before encoding blocks.
+
+    Returns:
+        IngestStats: Counters and timings for the run.
+
+    Raises:
+        Exception: The first error raised by either stage; the other stage is stopped.
+    """
+    stats = IngestStats()
+    pending: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_pending))
+    failure: List[BaseException] = []
+    stop = threading.Event()
+
+    def writer() -> None:
+        while True:
+            item = pending.get()
+            if item is _SENTINEL:
+                return
+            if stop.is_set():
+                continue
+            offset, texts, embeddings = item
+            try:
+                started = time.perf_counter()
+                rejected = write_fn(texts, embeddings, offset) or 0
+                stats.write_seconds += time.perf_counter() - started
+                stats.documents += len(texts) - rejected
+                stats.failed += rejected
+                stats.batches += 1
+            except BaseException as exc:  # re-raised in the calling thread
+                failure.append(exc)
+                stop.set()
+
+    def put(item: Any) -> None:
+        # Poll so a writer failure cannot leave the encoder blocked on a full queue.
+        while True:
+            try:
+                pending.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if stop.is_set() and item is not _SENTINEL:
+                    return
+
+    started = time.perf_counter()
+    writer_thread = threading.Thread(target=writer, name="ingest-writer", daemon=True)
+    writer_thread.start()
+    try:
+        for item in encode_batches(documents, encode_fn, batch_size, stats):
+            if stop.is_set():
+                break
+            put(item)
+    except BaseException as exc:
+        failure.append(exc)
+        stop.set()
+    finally:
+        put(_SENTINEL)
+        writer_thread.join()
+        stats.elapsed_seconds = time.perf_counter() - started
+
+    if failure:
+        error(f"Streaming ingestion failed after {stats.documents} documents: {failure[0]}",
+              service="ingestion")
+        raise failure[0]
+
+    if stats.failed:
+        error(f"{stats.failed} documents were rejected by the backend", service="ingestion")
+    info(
+        f"Ingested {stats.documents} documents in {stats.batches} batches "
+        f"({stats.docs_per_second:.1f} docs/s, encode {stats.encode_seconds:.2f}s, "
+        f"write {stats.write_seconds:.2f}s)",
+        service="ingestion",
+    )
+    return stats
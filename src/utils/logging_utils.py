@@ -3,96 +3,330 @@ logging_utils.py
 
 Generalized logging utility for multi-service and multi-module Python projects.
 
-This module provides standardized logging functions for different logging levels 
-(info, debug, warning, error). It supports tagging logs with optional service 
-names for clearer tracing in distributed or modular systems. Logs are formatted 
-with timestamps and output to stdout and a log file.
+This module provides standardized logging functions for different logging levels
+(info, debug, warning, error). It supports tagging logs with optional service
+names for clearer tracing in distributed or modular systems, plus structured
+fields (operation, latency and arbitrary key/values).
+
+Logging stays off the hot path:
+
+- callers enqueue records on a ``QueueHandler``; a background listener thread
+  formats them and writes to stdout (text) and a rotating log file (one JSON
+  object per line);
+- messages may be %-style templates with arguments, which are only merged
+  when the record is emitted, and the level check runs before anything is
+  built, so a disabled call costs a dict lookup;
+- levels can be set per service (``set_level`` or ``LOG_LEVELS``, e.g.
+  ``"search_utils=WARNING,store=DEBUG"``).
+
+Handlers are created on the first log call rather than at import time.
+Environment: ``LOG_LEVEL``, ``LOG_LEVELS``, ``LOG_DIR``, ``LOG_MAX_BYTES``,
+``LOG_BACKUP_COUNT``.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Union
 import os
 
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
-# Ensure logs directory exists
-os.makedirs("logs", exist_ok=True)
+LOG_DIR = os.getenv("LOG_DIR", os.path.join(ROOT_DIR, "logs"))
+LOG_FILE = "logs.log"
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Setup logger
+# Setup logger; handlers are attached lazily by ``configure_logging``
 logger = logging.getLogger("multi_service_logger")
 logger.setLevel(logging.DEBUG)
+logger.propagate = False
+
+def _parse_level(level: Union[int, str]) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level '{level}'")
+    return value
+
+
+def _parse_service_levels(spec: str) -> Dict[str, int]:
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        service, _, level = item.partition("=")
+        levels[service.strip()] = _parse_level(level)
+    return levels
+
+
+_default_level = _parse_level(os.getenv("LOG_LEVEL", "DEBUG"))
+_service_levels: Dict[str, int] = _parse_service_levels(os.getenv("LOG_LEVELS", ""))
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
 
-# Formatter style
-formatter = logging.Formatter(
-    fmt="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable console format: timestamp, level, service tag, message and
+    any structured fields as trailing key=value pairs.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(fmt="%(asctime)s [%(levelname)s] %(message)s", datefmt=DATE_FORMAT)
 
-# Console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        service = getattr(record, "service", None)
+        if service:
+            head, sep, tail = text.partition("] ")
+            text = f"{head}{sep}[{service}] {tail}"
+        extras = []
+        operation = getattr(record, "operation", None)
+        if operation:
+            extras.append(f"op={operation}")
+        latency = getattr(record, "latency_ms", None)
+        if latency is not None:
+            extras.append(f"latency_ms={latency:.3f}")
+        extras.extend(f"{key}={value}" for key, value in (getattr(record, "fields", None) or {}).items())
+        return f"{text} ({', '.join(extras)})" if extras else text
 
-# File handler
-file_handler = logging.FileHandler(f"{ROOT_DIR}/logs/logs.log", mode='a', encoding='utf-8')
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
 
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record with the structured fields at the top level.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime(DATE_FORMAT, time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for name in ("service", "operation", "latency_ms"):
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that enqueues the record untouched.
 
-def info(message: str, service: Optional[str] = None) -> None:
+    The stock ``prepare`` formats the message and copies the record on the
+    calling thread so it can be pickled; the queue never leaves this process,
+    so that work is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(log_dir: Optional[str] = LOG_DIR, console: bool = True) -> None:
+    """
+    Attach the queue handler and start the background listener.
+
+    Called automatically on the first log call; call it explicitly to pick a
+    different directory or to disable console output. Calling it again
+    replaces the previous handlers.
+
+    Args:
+        log_dir (Optional[str]): Directory of the rotating JSON log file; None disables the file.
+        console (bool): Also write human-readable lines to stdout.
+    """
+    with _configure_lock:
+        _configure(log_dir, console)
+
+
+def _configure(log_dir: Optional[str], console: bool) -> None:
+    global _listener
+    handlers = []
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(TextFormatter())
+        handlers.append(console_handler)
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, LOG_FILE), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=False)
+    listener.start()
+    # Swap the queue in before stopping the old listener so no record is left undrained.
+    logger.handlers = [_InProcessQueueHandler(records)]
+    _shutdown_listener()
+    _listener = listener
+
+
+def _shutdown_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def flush() -> None:
+    """
+    Write out every queued record and stop the listener; the next log call restarts it.
+    """
+    with _configure_lock:
+        logger.handlers = []
+        _shutdown_listener()
+
+
+atexit.register(flush)
+
+
+def set_level(level: Union[int, str], service: Optional[str] = None) -> None:
+    """
+    Set the minimum level globally or for one service.
+
+    Args:
+        level (Union[int, str]): Level such as "INFO" or logging.WARNING.
+        service (Optional[str]): Service to configure; None sets the default level.
+    """
+    global _default_level
+    if service is None:
+        _default_level = _parse_level(level)
+    else:
+        _service_levels[service] = _parse_level(level)
+
+
+def is_enabled(level: int, service: Optional[str] = None) -> bool:
+    """
+    Whether a record at ``level`` from ``service`` would be logged.
+    """
+    return level >= _service_levels.get(service, _default_level)
+
+
+def log(
+    level: int,
+    message: str,
+    *args: Any,
+    service: Optional[str] = None,
+    operation: Optional[str] = None,
+    latency_ms: Optional[float] = None,
+    **fields: Any,
+) -> None:
+    """
+    Log a message with optional %-style arguments and structured fields.
+
+    Nothing is formatted when the level is disabled for the service.
+
+    Args:
+        level (int): Logging level.
+        message (str): Message, or %-style template for ``args``.
+        *args: Template arguments, merged when the record is emitted.
+        service (Optional[str]): Optional name of the service or module logging the message.
+        operation (Optional[str]): Operation the record describes, e.g. "search".
+        latency_ms (Optional[float]): Duration of the operation in milliseconds.
+        **fields: Extra structured key/values.
+    """
+    if level < _service_levels.get(service, _default_level):
+        return
+    if not logger.handlers:
+        with _configure_lock:
+            if not logger.handlers:
+                _configure(LOG_DIR, console=True)
+    # makeRecord + handle skips Logger.log's stack walk for the caller's file and line.
+    logger.handle(logger.makeRecord(logger.name, level, "(unknown file)", 0, message, args, None, extra={
+        "service": service, "operation": operation, "latency_ms": latency_ms, "fields": fields or None,
+    }))
+
+
+def info(message: str, *args: Any, service: Optional[str] = None, **fields: Any) -> None:
     """
     Log an informational message.
 
     Args:
-        message (str): The message to log.
+        message (str): The message to log, or a %-style template for ``args``.
+        *args: Template arguments.
         service (Optional[str]): Optional name of the service or module logging the message.
+        **fields: Structured fields (operation, latency_ms, ...).
     """
-    if service:
-        logger.info("[%s] %s", service, message)
-    else:
-        logger.info(message)
+    if logging.INFO >= _service_levels.get(service, _default_level):
+        log(logging.INFO, message, *args, service=service, **fields)
 
 
-def debug(message: str, service: Optional[str] = None) -> None:
+def debug(message: str, *args: Any, service: Optional[str] = None, **fields: Any) -> None:
     """
     Log a debug-level message for diagnostic purposes.
 
     Args:
-        message (str): The message to log.
+        message (str): The message to log, or a %-style template for ``args``.
+        *args: Template arguments.
         service (Optional[str]): Optional name of the service or module logging the message.
+        **fields: Structured fields (operation, latency_ms, ...).
     """
-    if service:
-        logger.debug("[%s] %s", service, message)
-    else:
-        logger.debug(message)
+    if logging.DEBUG >= _service_levels.get(service, _default_level):
+        log(logging.DEBUG, message, *args, service=service, **fields)
 
 
-def warning(message: str, service: Optional[str] = None) -> None:
+def warning(message: str, *args: Any, service: Optional[str] = None, **fields: Any) -> None:
     """
     Log a warning message indicating a potential issue.
 
     Args:
-        message (str): The warning message to log.
+        message (str): The warning message to log, or a %-style template for ``args``.
+        *args: Template arguments.
         service (Optional[str]): Optional name of the service or module logging the message.
+        **fields: Structured fields (operation, latency_ms, ...).
     """
-    if service:
-        logger.warning("[%s] %s", service, message)
-    else:
-        logger.warning(message)
+    if logging.WARNING >= _service_levels.get(service, _default_level):
+        log(logging.WARNING, message, *args, service=service, **fields)
 
 
-def error(message: str, service: Optional[str] = None) -> None:
+def error(message: str, *args: Any, service: Optional[str] = None, **fields: Any) -> None:
     """
     Log an error message indicating a failure or serious issue.
 
     Args:
-        message (str): The error message to log.
+        message (str): The error message to log, or a %-style template for ``args``.
+        *args: Template arguments.
         service (Optional[str]): Optional name of the service or module logging the message.
+        **fields: Structured fields (operation, latency_ms, ...).
     """
-    if service:
-        logger.error("[%s] %s", service, message)
-    else:
-        logger.error(message)
+    if logging.ERROR >= _service_levels.get(service, _default_level):
+        log(logging.ERROR, message, *args, service=service, **fields)
+
+
+@contextmanager
+def log_timing(operation: str, service: Optional[str] = None, level: int = logging.DEBUG,
+               **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and log one record with its latency when it exits.
+
+    The yielded dict can be filled with extra fields inside the block.
+
+    Args:
+        operation (str): Operation name, e.g. "search".
+        service (Optional[str]): Service tag.
+        level (int): Level of the record.
+        **fields: Structured fields known up front.
+    """
+    started = time.perf_counter()
+    extra = dict(fields)
+    try:
+        yield extra
+    finally:
+        if is_enabled(level, service):
+            log(level, "%s finished", operation, service=service, operation=operation,
+                latency_ms=(time.perf_counter() - started) * 1000.0, **extra)
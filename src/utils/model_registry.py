@@ -0,0 +1,234 @@
+"""
+model_registry.py
+
+Process-wide registry of embedding models shared by every vector database backend.
+
+Each model is keyed by (name, device, precision), loaded lazily on first use and
+then reused by all callers in the process, so running several backends side by
+side pays the load cost and the weight memory only once. Loading is guarded by a
+per-key lock: concurrent callers asking for the same model wait for the first
+load, while different models can load in parallel.
+
+Besides fp32/fp16 PyTorch weights, CPU-oriented variants can be selected:
+"int8" applies dynamic int8 quantization to the linear layers, "onnx" and
+"onnx-int8" load an ONNX Runtime session exported by
+``src.utils.onnx_encoder.export_onnx`` from a local directory. A precision can
+be attached to the name as ``"<name>@<precision>"`` so that one string
+identifies the model everywhere it is used as a key (embedding cache, sync
+manifest); ``EMBEDDING_MODEL`` is that string built from the environment.
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+from src.utils.resource_utils import current_rss_bytes, format_bytes
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+DEFAULT_DEVICE = "auto"
+DEFAULT_PRECISION = "fp32"
+SUPPORTED_PRECISIONS = ("fp32", "fp16", "int8", "onnx", "onnx-int8")
+ONNX_PRECISIONS = ("onnx", "onnx-int8")
+
+ModelKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class ModelStats:
+    """
+    Load statistics for a registered model.
+
+    Attributes:
+        name (str): Model name or local path.
+        device (str): Device the model was requested on.
+        precision (str): Weight precision.
+        load_seconds (float): Wall-clock time spent loading the model.
+        rss_delta_bytes (Optional[int]): Growth of resident memory caused by the load.
+        rss_after_bytes (Optional[int]): Resident memory of the process after the load.
+    """
+    name: str
+    device: str
+    precision: str
+    load_seconds: float
+    rss_delta_bytes: Optional[int]
+    rss_after_bytes: Optional[int]
+
+
+_models: Dict[ModelKey, Any] = {}
+_stats: Dict[ModelKey, ModelStats] = {}
+_key_locks: Dict[ModelKey, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def model_spec(name: str, precision: str = DEFAULT_PRECISION) -> str:
+    """
+    Single-string identifier of a model and its precision.
+
+    Args:
+        name (str): Model name or local path.
+        precision (str): Weight precision.
+
+    Returns:
+        str: ``name`` for fp32, otherwise ``"<name>@<precision>"``.
+    """
+    return name if precision == DEFAULT_PRECISION else f"{name}@{precision}"
+
+
+def parse_model_spec(spec: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a ``model_spec`` string into name and precision.
+
+    Args:
+        spec (str): Model name, optionally suffixed with ``@<precision>``.
+
+    Returns:
+        Tuple[str, Optional[str]]: Name and precision, or None if the spec carries none.
+    """
+    name, _, precision = spec.rpartition("@")
+    if name and precision in SUPPORTED_PRECISIONS:
+        return name, precision
+    return spec, None
+
+
+EMBEDDING_MODEL = model_spec(
+    os.getenv("EMBEDDING_MODEL", DEFAULT_MODEL_NAME),
+    os.getenv("EMBEDDING_PRECISION", DEFAULT_PRECISION),
+)
+
+
+def _make_key(name: str, device: Optional[str], precision: str) -> ModelKey:
+    name, spec_precision = parse_model_spec(name)
+    precision = spec_precision or precision
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(
+            f"Unsupported precision '{precision}', expected one of {SUPPORTED_PRECISIONS}"
+        )
+    return (name, device or DEFAULT_DEVICE, precision)
+
+
+def _load_model(name: str, device: str, precision: str) -> Any:
+    if precision in ONNX_PRECISIONS:
+        from src.utils.onnx_encoder import OnnxEncoder
+
+        return OnnxEncoder(name, quantized=precision == "onnx-int8")
+
+    from sentence_transformers import SentenceTransformer
+
+    if precision == "int8":
+        import torch
+
+        # Dynamic quantization only runs on CPU.
+        model = SentenceTransformer(name, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    model = SentenceTransformer(name, device=None if device == DEFAULT_DEVICE else device)
+    if precision == "fp16":
+        model = model.half()
+    return model
+
+
+def get_model(
+    name: str = DEFAULT_MODEL_NAME,
+    device: Optional[str] = None,
+    precision: str = DEFAULT_PRECISION,
+) -> Any:
+    """
+    Return the shared embedding model, loading it on first use.
+
+    Args:
+        name (str): SentenceTransformer model name or local path (the export directory for
+            ONNX precisions), optionally suffixed with ``@<precision>``.
+        device (Optional[str]): Device such as "cpu" or "cuda". None lets the library choose.
+        precision (str): Weight precision, one of SUPPORTED_PRECISIONS; a suffix in ``name`` wins.
+
+    Returns:
+        SentenceTransformer: The shared model instance.
+
+    Raises:
+        ValueError: If the precision is not supported.
+        Exception: If the model fails to load.
+    """
+    key = _make_key(name, device, precision)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        model = _models.get(key)
+        if model is not None:
+            return model
+        try:
+            rss_before = current_rss_bytes()
+            started = time.perf_counter()
+            model = _load_model(*key)
+            elapsed = time.perf_counter() - started
+            rss_after = current_rss_bytes()
+        except Exception as exc:
+            error(f"Failed to load embedding model '{name}': {exc}", service="model_registry")
+            raise
+
+        delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        _stats[key] = ModelStats(
+            name=key[0],
+            device=key[1],
+            precision=key[2],
+            load_seconds=elapsed,
+            rss_delta_bytes=delta,
+            rss_after_bytes=rss_after,
+        )
+        _models[key] = model
+        info(
+            f"Embedding model '{key[0]}' loaded on {key[1]} ({key[2]}) in {elapsed:.2f}s, "
+            f"{format_bytes(delta, signed=True)} resident (total {format_bytes(rss_after)})",
+            service="model_registry",
+        )
+        return model
+
+
+def model_stats() -> List[ModelStats]:
+    """
+    Return load statistics for every model loaded so far.
+
+    Returns:
+        List[ModelStats]: One entry per loaded (name, device, precision) key.
+    """
+    with _registry_lock:
+        return list(_stats.values())
+
+
+def release_model(
+    name: str = DEFAULT_MODEL_NAME,
+    device: Optional[str] = None,
+    precision: str = DEFAULT_PRECISION,
+) -> bool:
+    """
+    Drop a model from the registry so its memory can be reclaimed.
+
+    Callers still holding a reference keep a working model; only the registry
+    entry is removed.
+
+    Args:
+        name (str): Model name.
+        device (Optional[str]): Device the model was requested on.
+        precision (str): Weight precision.
+
+    Returns:
+        bool: True if a model was removed.
+    """
+    key = _make_key(name, device, precision)
+    with _registry_lock:
+        _stats.pop(key, None)
+        removed = _models.pop(key, None) is not None
+    if removed:
+        info(f"Released embedding model '{key[0]}' ({key[1]}, {key[2]})", service="model_registry")
+    return removed
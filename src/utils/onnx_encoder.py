@@ -0,0 +1,187 @@
+"""
+onnx_encoder.py
+
+ONNX Runtime embedding backend for CPU inference.
+
+``export_onnx`` writes a SentenceTransformer model to a local directory as an
+ONNX graph of its transformer (``model.onnx``), an optional dynamically
+int8-quantized copy (``model_int8.onnx``), the fast tokenizer and a small
+``encoder_config.json`` with the pooling settings. ``OnnxEncoder`` loads that
+directory with onnxruntime and the ``tokenizers`` library only, so inference
+needs neither torch nor sentence-transformers, and keeps the model's
+``encode(list[str]) -> ndarray`` contract.
+
+onnxruntime and tokenizers are optional dependencies, imported when an
+encoder is created.
+"""
+
+import json
+import os
+import sys
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+CONFIG_FILE = "encoder_config.json"
+DEFAULT_ONNX_BATCH = 64
+DEFAULT_MAX_LENGTH = 256
+
+
+class OnnxEncoder:
+    """
+    Sentence encoder backed by an exported ONNX transformer.
+
+    Args:
+        path (str): Directory written by ``export_onnx``.
+        quantized (bool): Load the int8 graph instead of the fp32 one.
+        intra_op_threads (Optional[int]): ONNX Runtime threads; defaults to
+            ``OMP_NUM_THREADS`` when set, otherwise the runtime's own choice.
+    """
+
+    def __init__(self, path: str, quantized: bool = False, intra_op_threads: Optional[int] = None) -> None:
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            error(f"ONNX encoder needs onnxruntime and tokenizers: {exc}", service="onnx_encoder")
+            raise
+
+        with open(os.path.join(path, CONFIG_FILE), "r", encoding="utf-8") as handle:
+            config = json.load(handle)
+        self.path = path
+        self.normalize = bool(config.get("normalize", True))
+        self.max_length = int(config.get("max_length", DEFAULT_MAX_LENGTH))
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.enable_padding(pad_id=int(config.get("pad_token_id", 0)),
+                                      pad_token=config.get("pad_token", "[PAD]"))
+
+        options = onnxruntime.SessionOptions()
+        threads = intra_op_threads if intra_op_threads is not None else int(os.getenv("OMP_NUM_THREADS", "0"))
+        options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model_file = os.path.join(path, ONNX_INT8_FILE if quantized else ONNX_FILE)
+        self.session = onnxruntime.InferenceSession(model_file, options, providers=["CPUExecutionProvider"])
+        self._input_names = {node.name for node in self.session.get_inputs()}
+        self._dimension = int(config.get("dimension") or self.session.get_outputs()[0].shape[-1])
+        info(f"ONNX encoder loaded from '{model_file}' ({threads or 'default'} threads)", service="onnx_encoder")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def _encode_batch(self, texts: List[str], normalize: bool) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+        hidden = self.session.run(None, feeds)[0]
+        # Mean pooling over real tokens, as in the SentenceTransformer pooling layer.
+        mask = feeds["attention_mask"][:, :, np.newaxis].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32, copy=False)
+
+    def encode(
+        self,
+        sentences: Sequence[str],
+        batch_size: int = DEFAULT_ONNX_BATCH,
+        normalize_embeddings: Optional[bool] = None,
+        **_: Any,
+    ) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            sentences (Sequence[str]): Texts to embed.
+            batch_size (int): Texts per session run.
+            normalize_embeddings (Optional[bool]): Override the exported normalization setting.
+            **_: Other SentenceTransformer ``encode`` options, accepted and ignored.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(sentences), dim).
+        """
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        sentences = list(sentences)
+        if not sentences:
+            return np.empty((0, self._dimension), dtype=np.float32)
+        normalize = self.normalize if normalize_embeddings is None else normalize_embeddings
+        return np.concatenate([
+            self._encode_batch(sentences[start:start + batch_size], normalize)
+            for start in range(0, len(sentences), batch_size)
+        ])
+
+
+def export_onnx(model_name: str, output_dir: str, quantize: bool = True, opset: int = 14) -> str:
+    """
+    Export a SentenceTransformer model for ``OnnxEncoder``.
+
+    Args:
+        model_name (str): Model name or local path.
+        output_dir (str): Directory to write; created if missing.
+        quantize (bool): Also write a dynamically int8-quantized graph.
+        opset (int): ONNX opset version.
+
+    Returns:
+        str: ``output_dir``.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        model = SentenceTransformer(model_name, device="cpu")
+        transformer = model[0].auto_model.eval()
+        tokenizer = model.tokenizer
+        tokenizer.save_pretrained(output_dir)
+
+        sample = tokenizer(["an example sentence"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+        onnx_path = os.path.join(output_dir, ONNX_FILE)
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(sample[name] for name in input_names),
+                onnx_path,
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+            )
+
+        config = {
+            "model_name": model_name,
+            "dimension": model.get_sentence_embedding_dimension(),
+            "max_length": model.max_seq_length,
+            "normalize": any(type(module).__name__ == "Normalize" for module in model),
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": tokenizer.pad_token_id,
+        }
+        with open(os.path.join(output_dir, CONFIG_FILE), "w", encoding="utf-8") as handle:
+            json.dump(config, handle, indent=2)
+
+        if quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            quantize_dynamic(onnx_path, os.path.join(output_dir, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+        info(f"Exported '{model_name}' to ONNX in '{output_dir}'", service="onnx_encoder")
+        return output_dir
+    except Exception as exc:
+        error(f"Failed to export '{model_name}' to ONNX: {exc}", service="onnx_encoder")
+        raise
@@ -0,0 +1,252 @@
+"""
+parallel_encoder.py
+
+Multi-process embedding for CPU-only ingestion nodes.
+
+A single ``SentenceTransformer.encode`` call does not saturate a many-core
+machine, so ``ParallelEncoder`` shards each call into batches and runs them on
+a pool of worker processes. Each worker loads its own copy of the model
+through the model registry and limits itself to ``threads_per_worker`` torch
+threads, so ``workers * threads_per_worker`` should roughly match the core
+count.
+
+Embeddings come back through one shared-memory float32 block per call: the
+parent allocates the (n, dim) matrix, every worker writes its rows in place
+and only row counts travel back over the pipe, never pickled vectors.
+
+``ParallelEncoder`` exposes the same ``encode`` method as the model, so it can
+be passed anywhere a model is, including ``EmbeddingCache.encode``.
+``get_encoder`` returns the shared pool when ``EMBEDDING_WORKERS`` is above 1
+and the plain model otherwise.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+from src.utils.model_registry import get_model, DEFAULT_MODEL_NAME, DEFAULT_PRECISION
+
+DEFAULT_THREADS_PER_WORKER = 2
+DEFAULT_SHARD_SIZE = 256
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "0"))
+EMBEDDING_THREADS_PER_WORKER = int(os.getenv("EMBEDDING_THREADS_PER_WORKER", str(DEFAULT_THREADS_PER_WORKER)))
+
+# Model held by a worker process, set by ``_init_worker``.
+_worker_model: Any = None
+
+
+def default_workers(threads_per_worker: int = DEFAULT_THREADS_PER_WORKER) -> int:
+    """
+    Number of workers that fills the machine with ``threads_per_worker`` threads each.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, threads_per_worker))
+
+
+def _init_worker(model_name: str, precision: str, threads: int) -> None:
+    global _worker_model
+    # Must be set before torch is imported for its OpenMP pool to honour it.
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        # ONNX-only workers read OMP_NUM_THREADS themselves.
+        pass
+    _worker_model = get_model(model_name, device="cpu", precision=precision)
+
+
+def _worker_dimension() -> int:
+    return int(_worker_model.get_sentence_embedding_dimension())
+
+
+def _encode_shard(shm_name: str, shape: Tuple[int, int], start: int, texts: List[str],
+                  encode_kwargs: Dict[str, Any]) -> int:
+    vectors = np.asarray(_worker_model.encode(texts, **encode_kwargs), dtype=np.float32)
+    # Spawned workers share the parent's resource tracker, so attaching does not take ownership.
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[start:start + len(texts)] = vectors
+        del out
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class ParallelEncoder:
+    """
+    Process pool that embeds text batches in parallel, one model copy per worker.
+
+    Args:
+        model_name (str): SentenceTransformer model name or local path.
+        workers (Optional[int]): Worker processes; defaults to filling the cores.
+        threads_per_worker (int): Torch threads used by each worker.
+        shard_size (int): Texts sent to a worker per task.
+        precision (str): Weight precision of the worker models.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        workers: Optional[int] = None,
+        threads_per_worker: int = DEFAULT_THREADS_PER_WORKER,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        precision: str = DEFAULT_PRECISION,
+    ) -> None:
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        self.model_name = model_name
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers or default_workers(self.threads_per_worker)
+        self.shard_size = shard_size
+        self.precision = precision
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dimension: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # "spawn" keeps workers free of the parent's torch threads and client sockets.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.precision, self.threads_per_worker),
+                )
+                info(f"Started {self.workers} embedding workers x {self.threads_per_worker} threads "
+                     f"for '{self.model_name}'", service="parallel_encoder")
+            return self._pool
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """
+        Embedding dimension of the model, read once from a worker.
+        """
+        if self._dimension is None:
+            self._dimension = self._get_pool().submit(_worker_dimension).result()
+        return self._dimension
+
+    def encode(self, texts: Sequence[str], **encode_kwargs: Any) -> np.ndarray:
+        """
+        Embed texts on the worker pool.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+            **encode_kwargs: Extra arguments forwarded to each worker's ``model.encode``.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim), in input order.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        dimension = self.get_sentence_embedding_dimension()
+        if not texts:
+            return np.empty((0, dimension), dtype=np.float32)
+
+        pool = self._get_pool()
+        shape = (len(texts), dimension)
+        shm = SharedMemory(create=True, size=shape[0] * shape[1] * 4)
+        try:
+            futures = [
+                pool.submit(_encode_shard, shm.name, shape, start, texts[start:start + self.shard_size],
+                            encode_kwargs)
+                for start in range(0, len(texts), self.shard_size)
+            ]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                future.result()
+            wait(pending)
+            # Copy out so the block can be released; one memcpy instead of unpickling rows.
+            view = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            vectors = view.copy()
+            del view
+            return vectors
+        except Exception as exc:
+            error(f"Parallel encode of {len(texts)} texts failed: {exc}", service="parallel_encoder")
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """
+        Shut the worker processes down.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def __enter__(self) -> "ParallelEncoder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_encoders: Dict[Tuple[str, int, int, int, str], ParallelEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_parallel_encoder(
+    model_name: str = DEFAULT_MODEL_NAME,
+    workers: Optional[int] = None,
+    threads_per_worker: int = EMBEDDING_THREADS_PER_WORKER,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    precision: str = DEFAULT_PRECISION,
+) -> ParallelEncoder:
+    """
+    Return the process-wide encoder pool for a configuration, creating it on first use.
+
+    Args:
+        model_name (str): Model name or local path.
+        workers (Optional[int]): Worker processes; defaults to filling the cores.
+        threads_per_worker (int): Torch threads used by each worker.
+        shard_size (int): Texts sent to a worker per task.
+        precision (str): Weight precision of the worker models.
+
+    Returns:
+        ParallelEncoder: Shared encoder.
+    """
+    workers = workers or default_workers(threads_per_worker)
+    key = (model_name, workers, threads_per_worker, shard_size, precision)
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            encoder = ParallelEncoder(model_name, workers, threads_per_worker, shard_size, precision)
+            _encoders[key] = encoder
+        return encoder
+
+
+def get_encoder(model_name: str = DEFAULT_MODEL_NAME, precision: str = DEFAULT_PRECISION) -> Any:
+    """
+    Return the object to call ``encode`` on for a model.
+
+    Args:
+        model_name (str): Model name or local path.
+        precision (str): Weight precision.
+
+    Returns:
+        Any: The shared ``ParallelEncoder`` when ``EMBEDDING_WORKERS`` is above 1,
+            otherwise the shared in-process model.
+    """
+    if EMBEDDING_WORKERS > 1:
+        return get_parallel_encoder(model_name, EMBEDDING_WORKERS, precision=precision)
+    return get_model(model_name, precision=precision)
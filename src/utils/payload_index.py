@@ -0,0 +1,408 @@
+"""
+payload_index.py
+
+Vectorized evaluation of filter expressions over in-process payloads.
+
+The in-process engines keep one payload dict per row. ``PayloadIndex``
+turns the fields a filter touches into columns and evaluates the expression
+tree of ``src.utils.filter_expr`` with NumPy instead of row by row:
+
+- each field is dictionary-encoded: one int32 code per row plus the list of
+  distinct values and their row counts;
+- ``==`` / ``in`` become a lookup of the accepted codes and one gather over
+  the code column; the bitmap of a single value is cached per field (LRU);
+- ranges on numeric fields compare a float64 column, with a sorted copy for
+  estimating how many rows fall in the range; ranges on strings are decided
+  per distinct value;
+- ``and`` / ``or`` / ``not`` combine the leaf masks, and whole-expression
+  masks are cached until the rows change.
+
+Columns are extended in place when rows are only appended; an engine that
+rewrites or moves rows calls ``invalidate``.
+
+``plan`` picks the search strategy from the estimated selectivity (exact per
+leaf from the value counts and for ranges on one field, independence assumed
+otherwise): pre-filtering searches only the matching rows and pays off when
+few match, either as a fraction of the collection or in absolute terms (the
+"full scan threshold" of Qdrant); post-filtering runs the unfiltered search
+and drops rows that fail the mask, over-fetching by the inverse selectivity.
+Environment: ``FILTER_PREFILTER_SELECTIVITY``, ``FILTER_FULL_SCAN_ROWS``,
+``FILTER_BITMAP_CACHE``.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.filter_expr import Node, Compare, In, IsNull, And, Or, Not, RANGE_OPS, to_node, field_value
+
+PREFILTER_SELECTIVITY = float(os.getenv("FILTER_PREFILTER_SELECTIVITY", "0.05"))
+FULL_SCAN_ROWS = int(os.getenv("FILTER_FULL_SCAN_ROWS", "10000"))
+DEFAULT_BITMAP_CACHE = int(os.getenv("FILTER_BITMAP_CACHE", "32"))
+DEFAULT_MASK_CACHE = 64
+
+_UNHASHABLE = object()
+
+
+def _key(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        return _UNHASHABLE
+    return value
+
+
+def _as_number(value: Any) -> float:
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return np.nan
+
+
+class FieldIndex:
+    """
+    Dictionary-encoded column of one payload field.
+
+    Args:
+        field (str): Payload key; dots address nested keys.
+        bitmap_cache (int): Single-value bitmaps kept for ``==`` / ``in`` lookups.
+    """
+
+    def __init__(self, field: str, bitmap_cache: int = DEFAULT_BITMAP_CACHE) -> None:
+        self.field = field
+        self.bitmap_cache = bitmap_cache
+        self.values: List[Any] = []
+        self._code_of: Dict[Any, int] = {}
+        self.codes = np.empty(0, dtype=np.int32)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._bitmaps: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._numeric: Optional[np.ndarray] = None
+        self._sorted: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def extend(self, payloads: Sequence[Dict[str, Any]]) -> None:
+        """
+        Append the field's value of each payload.
+        """
+        code_of, values = self._code_of, self.values
+
+        def encode(value: Any) -> int:
+            code = code_of.get(value)
+            if code is None:
+                code = code_of[value] = len(values)
+                values.append(value)
+            return code
+
+        new = np.fromiter((encode(_key(field_value(payload, self.field))) for payload in payloads),
+                          dtype=np.int32, count=len(payloads))
+        self.codes = np.concatenate([self.codes, new]) if len(self.codes) else new
+        counts = np.bincount(new, minlength=len(values))
+        counts[:len(self.counts)] += self.counts
+        self.counts = counts
+        self._bitmaps.clear()
+        self._numeric = self._sorted = None
+
+    def code(self, value: Any) -> Optional[int]:
+        try:
+            return self._code_of.get(value)
+        except TypeError:
+            return None
+
+    def bitmap(self, code: int) -> np.ndarray:
+        """
+        Rows holding the value with ``code``; cached, do not modify.
+        """
+        mask = self._bitmaps.get(code)
+        if mask is None:
+            mask = self.codes == code
+            self._bitmaps[code] = mask
+            while len(self._bitmaps) > self.bitmap_cache:
+                self._bitmaps.popitem(last=False)
+        else:
+            self._bitmaps.move_to_end(code)
+        return mask
+
+    def accepted(self, values: Any) -> np.ndarray:
+        """
+        Boolean array over codes, True for the codes of ``values``.
+        """
+        accepted = np.zeros(len(self.values), dtype=bool)
+        codes = [code for code in (self.code(value) for value in values) if code is not None]
+        accepted[codes] = True
+        return accepted
+
+    def numeric(self) -> np.ndarray:
+        """
+        Per-row float64 column; NaN where the value is missing or not a number.
+        """
+        if self._numeric is None:
+            by_code = np.fromiter((_as_number(value) for value in self.values), dtype=np.float64,
+                                  count=len(self.values))
+            self._numeric = by_code[self.codes]
+        return self._numeric
+
+    def sorted_numeric(self) -> np.ndarray:
+        if self._sorted is None:
+            column = self.numeric()
+            self._sorted = np.sort(column[~np.isnan(column)])
+        return self._sorted
+
+    def range_codes(self, op: str, literal: Any) -> np.ndarray:
+        """
+        Boolean array over codes accepted by a range on a non-numeric literal.
+        """
+        accepted = np.zeros(len(self.values), dtype=bool)
+        for code, value in enumerate(self.values):
+            if isinstance(value, type(literal)) or isinstance(literal, type(value)):
+                try:
+                    accepted[code] = {"<": value < literal, "<=": value <= literal,
+                                      ">": value > literal, ">=": value >= literal}[op]
+                except TypeError:
+                    pass
+        return accepted
+
+
+def _numeric_literal(value: Any) -> bool:
+    # Booleans compare as 0 / 1 with numbers, as they do in ``matches``.
+    return isinstance(value, (int, float))
+
+
+_RANGE_UFUNCS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+class PayloadIndex:
+    """
+    Filter masks and selectivity estimates over an engine's payload rows.
+
+    The index reads the engine's payload list; pass the same list object on
+    every call. Appending rows is picked up lazily, any other change needs
+    ``invalidate``.
+
+    Args:
+        bitmap_cache (int): Single-value bitmaps kept per field.
+        mask_cache (int): Whole-expression masks kept until the rows change.
+    """
+
+    def __init__(self, bitmap_cache: int = DEFAULT_BITMAP_CACHE, mask_cache: int = DEFAULT_MASK_CACHE) -> None:
+        self.bitmap_cache = bitmap_cache
+        self.mask_cache = mask_cache
+        self._fields: Dict[str, FieldIndex] = {}
+        self._masks: "OrderedDict[Node, np.ndarray]" = OrderedDict()
+        self._source: Optional[List[Dict[str, Any]]] = None
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        """
+        Drop every column and cached mask, e.g. after rows were overwritten or moved.
+        """
+        with self._lock:
+            self._fields.clear()
+            self._masks.clear()
+            self._source = None
+            self._size = 0
+
+    def _sync(self, payloads: List[Dict[str, Any]]) -> None:
+        if payloads is not self._source or len(payloads) < self._size:
+            self.invalidate()
+            self._source = payloads
+        if len(payloads) != self._size:
+            self._size = len(payloads)
+            self._masks.clear()
+
+    def _field(self, field: str, payloads: List[Dict[str, Any]]) -> FieldIndex:
+        index = self._fields.get(field)
+        if index is None:
+            index = self._fields[field] = FieldIndex(field, self.bitmap_cache)
+        if len(index) < len(payloads):
+            index.extend(payloads[len(index):])
+        return index
+
+    def mask(self, filters: Any, payloads: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Boolean mask of the rows matching a filter.
+
+        Args:
+            filters (Any): Expression string, {field: value | [values]} dict or tree.
+            payloads (List[Dict[str, Any]]): The engine's payload rows.
+
+        Returns:
+            Optional[np.ndarray]: One bool per row, or None when unfiltered; cached, do not modify.
+        """
+        node = to_node(filters)
+        if node is None:
+            return None
+        with self._lock:
+            self._sync(payloads)
+            mask = self._masks.get(node)
+            if mask is None:
+                mask = self._evaluate(node, payloads)
+                self._masks[node] = mask
+                while len(self._masks) > self.mask_cache:
+                    self._masks.popitem(last=False)
+            else:
+                self._masks.move_to_end(node)
+            return mask
+
+    def _evaluate(self, node: Node, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        if isinstance(node, Compare):
+            field = self._field(node.field, payloads)
+            if node.op in ("==", "!="):
+                code = field.code(node.value)
+                mask = field.bitmap(code) if code is not None else np.zeros(len(field), dtype=bool)
+                return ~mask if node.op == "!=" else mask
+            if _numeric_literal(node.value):
+                return _RANGE_UFUNCS[node.op](field.numeric(), node.value)
+            return field.range_codes(node.op, node.value)[field.codes]
+        if isinstance(node, IsNull):
+            field = self._field(node.field, payloads)
+            code = field.code(None)
+            return field.bitmap(code) if code is not None else np.zeros(len(field), dtype=bool)
+        if isinstance(node, In):
+            field = self._field(node.field, payloads)
+            if len(node.values) == 1:
+                code = field.code(next(iter(node.values)))
+                mask = field.bitmap(code) if code is not None else np.zeros(len(field), dtype=bool)
+            else:
+                mask = field.accepted(node.values)[field.codes]
+            return ~mask if node.negate else mask
+        if isinstance(node, Not):
+            return ~self._evaluate(node.item, payloads)
+        masks = [self._evaluate(item, payloads) for item in node.items]
+        combine = np.logical_and if isinstance(node, And) else np.logical_or
+        result = masks[0].copy()
+        for mask in masks[1:]:
+            combine(result, mask, out=result)
+        return result
+
+    def selectivity(self, filters: Any, payloads: List[Dict[str, Any]]) -> float:
+        """
+        Estimated fraction of rows matching a filter, without evaluating the mask.
+
+        Leaves are exact (value counts, sorted numeric columns); ``and`` / ``or``
+        assume independent conditions.
+        """
+        node = to_node(filters)
+        if node is None or not payloads:
+            return 1.0
+        with self._lock:
+            self._sync(payloads)
+            mask = self._masks.get(node)
+            if mask is not None:
+                return float(np.count_nonzero(mask)) / len(mask)
+            return self._estimate(node, payloads)
+
+    def _estimate(self, node: Node, payloads: List[Dict[str, Any]]) -> float:
+        rows = len(payloads)
+        if isinstance(node, Compare):
+            field = self._field(node.field, payloads)
+            if node.op in ("==", "!="):
+                code = field.code(node.value)
+                share = field.counts[code] / rows if code is not None else 0.0
+                return 1.0 - share if node.op == "!=" else share
+            if _numeric_literal(node.value):
+                return self._interval_share(field, [node]) / rows
+            return float(field.counts[field.range_codes(node.op, node.value)].sum()) / rows
+        if isinstance(node, IsNull):
+            field = self._field(node.field, payloads)
+            code = field.code(None)
+            return field.counts[code] / rows if code is not None else 0.0
+        if isinstance(node, In):
+            field = self._field(node.field, payloads)
+            share = float(field.counts[field.accepted(node.values)].sum()) / rows
+            return 1.0 - share if node.negate else share
+        if isinstance(node, Not):
+            return 1.0 - self._estimate(node.item, payloads)
+        if isinstance(node, Or):
+            return 1.0 - float(np.prod([1.0 - self._estimate(item, payloads) for item in node.items]))
+        # Bounds on the same numeric field are far from independent; count their interval exactly.
+        estimates, ranges = [], {}
+        for item in node.items:
+            if isinstance(item, Compare) and item.op in RANGE_OPS and _numeric_literal(item.value):
+                ranges.setdefault(item.field, []).append(item)
+            else:
+                estimates.append(self._estimate(item, payloads))
+        for field, bounds in ranges.items():
+            estimates.append(self._interval_share(self._field(field, payloads), bounds) / rows)
+        return float(np.prod(estimates))
+
+    @staticmethod
+    def _interval_share(field: FieldIndex, bounds: List[Compare]) -> int:
+        ordered = field.sorted_numeric()
+        low, high = 0, len(ordered)
+        for bound in bounds:
+            side = "left" if bound.op in ("<", ">=") else "right"
+            position = int(np.searchsorted(ordered, bound.value, side=side))
+            if bound.op in ("<", "<="):
+                high = min(high, position)
+            else:
+                low = max(low, position)
+        return max(0, high - low)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Indexed fields with their distinct values and cached bitmaps.
+        """
+        with self._lock:
+            return {
+                "rows": self._size,
+                "cached_masks": len(self._masks),
+                "fields": {name: {"distinct": len(field.values), "bitmaps": len(field._bitmaps)}
+                           for name, field in self._fields.items()},
+            }
+
+
+@dataclass
+class FilterPlan:
+    """
+    How to run one filtered search.
+
+    Attributes:
+        strategy (str): "none" (unfiltered), "pre" (search only matching rows) or
+            "post" (search everything, drop rows failing ``mask``).
+        selectivity (float): Estimated fraction of rows matching.
+        mask (Optional[np.ndarray]): Matching rows; None when unfiltered.
+    """
+    strategy: str
+    selectivity: float
+    mask: Optional[np.ndarray] = None
+
+    def overfetch(self, k: int, limit: int) -> int:
+        """
+        Candidates to fetch for ``k`` filtered hits when post-filtering, capped at ``limit``.
+        """
+        return min(limit, max(k, int(np.ceil(k / max(self.selectivity, 1e-9) * 1.2))))
+
+
+def plan(index: PayloadIndex, filters: Any, payloads: List[Dict[str, Any]],
+         threshold: float = PREFILTER_SELECTIVITY, full_scan_rows: int = 0) -> FilterPlan:
+    """
+    Choose pre- or post-filtering for a search over ``payloads``.
+
+    Args:
+        index (PayloadIndex): The engine's payload index.
+        filters (Any): Expression string, {field: value | [values]} dict or tree.
+        payloads (List[Dict[str, Any]]): The engine's payload rows.
+        threshold (float): Estimated selectivity at or below which rows are pre-filtered.
+        full_scan_rows (int): Estimated matching rows at or below which rows are pre-filtered
+            whatever their share.
+
+    Returns:
+        FilterPlan: Strategy, selectivity estimate and the row mask.
+    """
+    if to_node(filters) is None:
+        return FilterPlan("none", 1.0)
+    selectivity = index.selectivity(filters, payloads)
+    pre = selectivity <= threshold or selectivity * len(payloads) <= full_scan_rows
+    strategy = "pre" if pre else "post"
+    return FilterPlan(strategy, selectivity, index.mask(filters, payloads))
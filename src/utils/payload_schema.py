@@ -0,0 +1,68 @@
+"""
+payload_schema.py
+
+Declared schema of the filterable payload fields of a collection.
+
+Filtered queries on a field without a payload (Qdrant) or scalar (Milvus)
+index make the server check every candidate's payload. A schema lists the
+fields worth indexing and how they are queried, so collection creation can
+build the matching index for each backend:
+
+- ``keyword``: exact matches and ``in`` on strings (categories, tags, ids);
+- ``integer``: equality and ranges on whole numbers (years, counts);
+- ``float``: ranges on real numbers (prices, scores);
+- ``bool``: flags;
+- ``text``: full-text matching on strings.
+
+A schema is a plain {field: type} dict, e.g. ``{"subject": "keyword",
+"year": "integer"}``. ``PAYLOAD_SCHEMA`` (``"subject=keyword,year=integer"``)
+sets the schema used when none is passed.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+PayloadSchema = Dict[str, str]
+FIELD_TYPES = ("keyword", "integer", "float", "bool", "text")
+
+
+def validate_schema(schema: Optional[PayloadSchema]) -> PayloadSchema:
+    """
+    Check a schema and normalize its type names.
+
+    Args:
+        schema (Optional[PayloadSchema]): {field: type}; None means no indexed fields.
+
+    Returns:
+        PayloadSchema: The schema with lowercase type names.
+
+    Raises:
+        ValueError: If a type is not one of ``FIELD_TYPES``.
+    """
+    normalized = {}
+    for field, field_type in (schema or {}).items():
+        field_type = field_type.strip().lower()
+        if field_type not in FIELD_TYPES:
+            raise ValueError(f"Unknown payload field type '{field_type}' for '{field}', "
+                             f"expected one of {FIELD_TYPES}")
+        normalized[field] = field_type
+    return normalized
+
+
+def parse_payload_schema(spec: str) -> PayloadSchema:
+    """
+    Parse a "field=type,field=type" specification.
+    """
+    schema = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        field, _, field_type = item.partition("=")
+        schema[field.strip()] = field_type or "keyword"
+    return validate_schema(schema)
+
+
+DEFAULT_PAYLOAD_SCHEMA: PayloadSchema = parse_payload_schema(os.getenv("PAYLOAD_SCHEMA", ""))
@@ -0,0 +1,353 @@
+"""
+query_cache.py
+
+Result cache for repeated searches.
+
+Entries are keyed by (scope, collection, query, k, filter, extra) where the
+scope is the ``client_scope`` of the store (backend plus client or pool, so
+equally named collections of different backends never meet) and the query is
+either a normalized text or a quantized vector, so the same question asked
+twice skips the store round-trip and, when cached by text, the embedding too.
+Eviction is LRU with a per-entry TTL.
+
+Invalidation is per scope and collection through generation counters shared
+by every cache in the process. The backend write helpers (``insert_data``,
+``insert_batch``, ``insert_documents``, collection re-creation) and the
+``upsert`` / ``upsert_batch`` / ``delete`` methods of every ``VectorStore``
+adapter call ``invalidate_collection``, which bumps the collection's
+generation; entries recorded under an older generation are treated as
+misses. Writes made by other processes, or through an unpooled client other
+than the one searched, are not seen, and the TTL bounds how stale those
+results can get.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info
+from src.utils.embedding_cache import normalize_text
+from src.utils.vector_buffers import as_matrix, as_query
+from src.utils.vector_store import VectorStore, SearchResult, Filters
+from src.utils.columnar import ColumnBatch
+
+DEFAULT_QUERY_CACHE_ITEMS = int(os.getenv("QUERY_CACHE_ITEMS", "10000"))
+DEFAULT_QUERY_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL", "300"))
+# Vectors closer than this per component share a cache entry.
+DEFAULT_QUANTIZATION_STEP = 1e-4
+
+_generations: Dict[Tuple[Hashable, str], int] = {}
+_generations_lock = threading.Lock()
+
+
+def collection_generation(scope: Hashable, collection_name: str) -> int:
+    """
+    Current write generation of a collection.
+    """
+    with _generations_lock:
+        return _generations.get((scope, collection_name), 0)
+
+
+def invalidate_collection(scope: Hashable, collection_name: str) -> int:
+    """
+    Mark every cached result of a collection as stale.
+
+    Args:
+        scope (Hashable): ``client_scope`` of the client that wrote, or ``VectorStore.scope``.
+        collection_name (str): Collection that was written to.
+
+    Returns:
+        int: The collection's new generation.
+    """
+    with _generations_lock:
+        generation = _generations.get((scope, collection_name), 0) + 1
+        _generations[(scope, collection_name)] = generation
+        return generation
+
+
+def query_key(query: Any, step: float = DEFAULT_QUANTIZATION_STEP) -> Tuple[str, str]:
+    """
+    Cache key of a query text or vector.
+
+    Args:
+        query (Any): Query text, or a vector as an ndarray, buffer or list.
+        step (float): Quantization step applied to vector components.
+
+    Returns:
+        Tuple[str, str]: ("text", normalized text) or ("vector", digest of the quantized vector).
+    """
+    if isinstance(query, str):
+        return "text", normalize_text(query).casefold()
+    quantized = np.round(as_query(query) / step).astype(np.int32)
+    return "vector", hashlib.blake2b(quantized.tobytes(), digest_size=16).hexdigest()
+
+
+def filter_key(filters: Any) -> str:
+    """
+    Cache key of a filter: an expression string, a dict or a client filter object.
+    """
+    if filters is None or isinstance(filters, str):
+        return filters or ""
+    return json.dumps(filters, sort_keys=True, default=str)
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of search results, invalidated per scope and collection.
+
+    Args:
+        max_items (int): Entries kept before the least recently used is evicted.
+        ttl_seconds (float): Lifetime of an entry; 0 disables expiry.
+        step (float): Quantization step for vector keys.
+    """
+
+    def __init__(self, max_items: int = DEFAULT_QUERY_CACHE_ITEMS,
+                 ttl_seconds: float = DEFAULT_QUERY_TTL_SECONDS,
+                 step: float = DEFAULT_QUANTIZATION_STEP) -> None:
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.step = step
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stale = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+
+    def make_key(self, scope: Hashable, collection_name: str, query: Any, k: int, filters: Any = None,
+                 extra: Hashable = None) -> Hashable:
+        return (scope, collection_name, query_key(query, self.step), k, filter_key(filters), extra)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look an entry up.
+
+        Returns:
+            Tuple[bool, Any]: (found, value); expired and stale entries count as misses and are dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            generation, expires_at, value = entry
+            if generation != collection_generation(key[0], key[1]):
+                del self._entries[key]
+                self.stale += 1
+                self.misses += 1
+                return False, None
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Store a result computed while the collection was at ``generation``.
+        """
+        if generation != collection_generation(key[0], key[1]):
+            # A write landed while the result was being computed.
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        with self._lock:
+            self._entries[key] = (generation, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def cached(self, scope: Hashable, collection_name: str, query: Any, k: int, filters: Any,
+               compute: Callable[[], Any], extra: Hashable = None) -> Any:
+        """
+        Return the cached result of a single search, computing it on a miss.
+
+        Args:
+            scope (Hashable): Scope of the store searched, see ``client_scope``.
+            collection_name (str): Collection searched.
+            query (Any): Query text or vector.
+            k (int): Number of results.
+            filters (Any): Filter expression, dict or client filter object.
+            compute (Callable[[], Any]): Runs the search.
+            extra (Hashable): Other arguments that change the result, e.g. output fields.
+
+        Returns:
+            Any: The search result; hits return the cached object itself.
+        """
+        key = self.make_key(scope, collection_name, query, k, filters, extra)
+        found, value = self.get(key)
+        if found:
+            return value
+        generation = collection_generation(scope, collection_name)
+        value = compute()
+        self.put(key, value, generation)
+        return value
+
+    def cached_batch(self, scope: Hashable, collection_name: str, queries: Sequence[Any], k: int,
+                     filters: Any, compute: Callable[[List[int]], List[Any]],
+                     extra: Hashable = None) -> List[Any]:
+        """
+        Per-query caching of a batched search; only the misses are searched, in one call.
+
+        Args:
+            scope (Hashable): Scope of the store searched, see ``client_scope``.
+            collection_name (str): Collection searched.
+            queries (Sequence[Any]): Query texts or vectors.
+            k (int): Number of results per query.
+            filters (Any): Filter applied to every query.
+            compute (Callable[[List[int]], List[Any]]): Searches the queries at the given
+                positions and returns their results in that order.
+            extra (Hashable): Other arguments that change the result.
+
+        Returns:
+            List[Any]: One result per query, in query order.
+        """
+        keys = [self.make_key(scope, collection_name, query, k, filters, extra) for query in queries]
+        results: List[Any] = [None] * len(keys)
+        missing: List[int] = []
+        for position, key in enumerate(keys):
+            found, value = self.get(key)
+            if found:
+                results[position] = value
+            else:
+                missing.append(position)
+        if missing:
+            generation = collection_generation(scope, collection_name)
+            for position, value in zip(missing, compute(missing)):
+                results[position] = value
+                self.put(keys[position], value, generation)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for sizing the cache.
+
+        Returns:
+            Dict[str, Any]: Counters, size and overall hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "items": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_default_cache: Optional[QueryCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """
+    Return the process-wide query cache, creating it on first use.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache()
+            info(f"Query cache enabled ({_default_cache.max_items} items, ttl {_default_cache.ttl_seconds}s)",
+                 service="query_cache")
+        return _default_cache
+
+
+class CachedStore(VectorStore):
+    """
+    ``VectorStore`` wrapper that caches searches and invalidates them on writes.
+
+    ``search_text`` additionally caches by query text, so a repeated question
+    is neither embedded nor searched again.
+
+    Args:
+        store (VectorStore): Store to wrap.
+        cache (Optional[QueryCache]): Cache to use; the process-wide one by default.
+    """
+
+    def __init__(self, store: VectorStore, cache: Optional[QueryCache] = None) -> None:
+        super().__init__(store.collection_name, store.dimension)
+        self.store = store
+        self.backend = store.backend
+        self.scope = store.scope
+        self.persistent = store.persistent
+        self.cache = cache if cache is not None else get_query_cache()
+
+    def create_collection(self, recreate: bool = False) -> None:
+        self.store.create_collection(recreate=recreate)
+        invalidate_collection(self.scope, self.collection_name)
+
+    def upsert(self, ids: Sequence[Any], vectors: Any,
+               payloads: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        try:
+            return self.store.upsert(ids, vectors, payloads)
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def upsert_batch(self, batch: ColumnBatch) -> int:
+        try:
+            return self.store.upsert_batch(batch)
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            return self.store.delete(ids)
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> Optional[int]:
+        return self.store.count()
+
+    def search(self, query_vector: Any, k: int = 10, filters: Optional[Filters] = None) -> List[SearchResult]:
+        return self.cache.cached(self.scope, self.collection_name, query_vector, k, filters,
+                                 lambda: self.store.search(query_vector, k=k, filters=filters))
+
+    def batch_search(self, query_vectors: Any, k: int = 10,
+                     filters: Optional[Filters] = None) -> List[List[SearchResult]]:
+        matrix = as_matrix(query_vectors)
+        return self.cache.cached_batch(
+            self.scope, self.collection_name, matrix, k, filters,
+            lambda positions: self.store.batch_search(matrix[positions], k=k, filters=filters),
+        )
+
+    def search_text(self, text: str, encode_fn: Callable[[List[str]], Any], k: int = 10,
+                    filters: Optional[Filters] = None) -> List[SearchResult]:
+        """
+        Search by query text; a cache hit skips both embedding and search.
+
+        Args:
+            text (str): Query text.
+            encode_fn (Callable[[List[str]], Any]): Maps a batch of texts to an embedding matrix.
+            k (int): Number of results.
+            filters (Optional[Filters]): Payload filter.
+
+        Returns:
+            List[SearchResult]: Hits ordered by decreasing score.
+        """
+        return self.cache.cached(self.scope, self.collection_name, text, k, filters,
+                                 lambda: self.search(as_matrix(encode_fn([text]))[0], k=k, filters=filters))
+
+    def close(self) -> None:
+        self.store.close()
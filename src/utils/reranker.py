@@ -0,0 +1,313 @@
+"""
+reranker.py
+
+Local cross-encoder reranking for any backend.
+
+``rerank_search`` asks a ``VectorStore`` for the top-N candidates of a query
+and re-scores every (query, candidate text) pair with a CPU cross-encoder,
+which reads both texts together and ranks far better than vector similarity,
+without the network hop of a hosted reranker.
+
+Keeping the stage cheap:
+
+- pairs are scored in batched forward passes; candidates are taken in rank
+  order, a few batches at a time, and sorted by length inside that window so
+  each batch pads to similar lengths;
+- N adapts to the cost: by default it is a multiple of k, and with a latency
+  budget it is capped by what the measured per-pair cost allows;
+- scoring stops when the budget runs out; candidates left unscored keep their
+  retrieval order after the reranked ones;
+- scores are cached per (model, query, text), so repeated queries and
+  candidates shared between queries are not scored twice.
+
+sentence-transformers is imported when the first model is loaded.
+Environment: ``RERANKER_MODEL``, ``RERANK_BUDGET_MS``, ``LOCAL_RERANK``.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, debug, error
+from src.utils.embedding_cache import normalize_text
+from src.utils.vector_buffers import as_matrix
+from src.utils.vector_store import VectorStore, SearchResult, Filters
+
+DEFAULT_RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+DEFAULT_RERANK_BATCH = 32
+DEFAULT_MAX_LENGTH = 512
+# Candidates fetched per requested result when no budget limits N.
+DEFAULT_CANDIDATE_FACTOR = 4
+DEFAULT_MIN_CANDIDATES = 20
+DEFAULT_MAX_CANDIDATES = 100
+DEFAULT_SCORE_CACHE_ITEMS = 50_000
+# Batches length-sorted together; larger windows pad less but follow rank order more loosely.
+DEFAULT_WINDOW_BATCHES = 4
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "0")) or None
+LOCAL_RERANK = os.getenv("LOCAL_RERANK", "0") == "1"
+
+
+def _load_cross_encoder(model_name: str, max_length: int) -> Any:
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name, device="cpu", max_length=max_length)
+
+
+class CrossEncoderReranker:
+    """
+    Batched, budgeted cross-encoder scoring with a score cache.
+
+    Args:
+        model_name (str): Cross-encoder model name or local path.
+        batch_size (int): Pairs per forward pass.
+        max_length (int): Token limit of a (query, text) pair.
+        min_candidates (int): Smallest N fetched when no budget limits it.
+        max_candidates (int): Largest N ever fetched.
+        cache_items (int): Scores kept in the LRU cache; 0 disables it.
+        window_batches (int): Batches whose candidates are length-sorted together;
+            1 scores in plain rank order.
+        model (Any): Preloaded model with a ``predict(pairs, batch_size=...)`` method;
+            loaded from ``model_name`` on first use otherwise.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANKER_MODEL,
+        batch_size: int = DEFAULT_RERANK_BATCH,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        min_candidates: int = DEFAULT_MIN_CANDIDATES,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        cache_items: int = DEFAULT_SCORE_CACHE_ITEMS,
+        window_batches: int = DEFAULT_WINDOW_BATCHES,
+        model: Any = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.min_candidates = min_candidates
+        self.max_candidates = max_candidates
+        self.cache_items = cache_items
+        self.window_batches = max(1, window_batches)
+        self.pairs_scored = 0
+        self.cache_hits = 0
+        self.truncated = 0
+        # Moving average of forward-pass seconds per pair, drives the adaptive N.
+        self.seconds_per_pair: Optional[float] = None
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._scores: "OrderedDict[bytes, float]" = OrderedDict()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    try:
+                        self._model = _load_cross_encoder(self.model_name, self.max_length)
+                    except Exception as exc:
+                        error("Failed to load reranker '%s': %s", self.model_name, exc, service="reranker")
+                        raise
+                    info("Reranker '%s' loaded in %.2fs", self.model_name, time.perf_counter() - started,
+                         service="reranker")
+        return self._model
+
+    def candidate_count(self, k: int, budget_ms: Optional[float] = None) -> int:
+        """
+        Number of candidates to fetch for k results.
+
+        Args:
+            k (int): Results wanted after reranking.
+            budget_ms (Optional[float]): Time the scoring may take.
+
+        Returns:
+            int: ``DEFAULT_CANDIDATE_FACTOR * k`` within [min_candidates, max_candidates],
+                lowered to what fits the budget at the measured per-pair cost, never below k.
+        """
+        count = min(max(k * DEFAULT_CANDIDATE_FACTOR, self.min_candidates), self.max_candidates)
+        if budget_ms and self.seconds_per_pair:
+            count = min(count, int(budget_ms / 1000.0 / self.seconds_per_pair))
+        return max(k, count)
+
+    def _cache_key(self, query: str, text: str) -> bytes:
+        return hashlib.blake2b(
+            "\0".join((self.model_name, normalize_text(query), normalize_text(text))).encode("utf-8"),
+            digest_size=16,
+        ).digest()
+
+    def _predict(self, pairs: List[List[str]]) -> np.ndarray:
+        started = time.perf_counter()
+        scores = np.asarray(self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False),
+                            dtype=np.float32).reshape(len(pairs))
+        per_pair = (time.perf_counter() - started) / len(pairs)
+        self.seconds_per_pair = per_pair if self.seconds_per_pair is None else \
+            0.8 * self.seconds_per_pair + 0.2 * per_pair
+        self.pairs_scored += len(pairs)
+        return scores
+
+    def score(self, query: str, texts: Sequence[str], budget_ms: Optional[float] = None) -> np.ndarray:
+        """
+        Cross-encoder scores of ``query`` against each text.
+
+        Args:
+            query (str): Query text.
+            texts (Sequence[str]): Candidate texts, best retrieval rank first.
+            budget_ms (Optional[float]): Stop starting new batches once this much time has passed.
+
+        Returns:
+            np.ndarray: float32 scores aligned with ``texts``; NaN for texts left unscored by the budget.
+        """
+        scores = np.full(len(texts), np.nan, dtype=np.float32)
+        keys = [self._cache_key(query, text) for text in texts]
+        missing = []
+        with self._cache_lock:
+            for position, key in enumerate(keys):
+                cached = self._scores.get(key)
+                if cached is None:
+                    missing.append(position)
+                else:
+                    self._scores.move_to_end(key)
+                    scores[position] = cached
+            self.cache_hits += len(texts) - len(missing)
+
+        deadline = time.perf_counter() + budget_ms / 1000.0 if budget_ms else None
+        window = self.batch_size * self.window_batches
+        done = 0
+        for window_start in range(0, len(missing), window):
+            # Character length stands in for token length.
+            ordered = sorted(missing[window_start:window_start + window], key=lambda p: len(texts[p]))
+            for start in range(0, len(ordered), self.batch_size):
+                if deadline is not None and done and time.perf_counter() >= deadline:
+                    self.truncated += 1
+                    debug("Rerank budget of %.1fms reached after %d of %d pairs", budget_ms, done, len(missing),
+                          service="reranker")
+                    return scores
+                batch = ordered[start:start + self.batch_size]
+                scores[batch] = self._predict([[query, texts[p]] for p in batch])
+                done += len(batch)
+                if self.cache_items > 0:
+                    with self._cache_lock:
+                        for p in batch:
+                            self._scores[keys[p]] = float(scores[p])
+                        while len(self._scores) > self.cache_items:
+                            self._scores.popitem(last=False)
+        return scores
+
+    def rerank(
+        self,
+        query: str,
+        results: Sequence[SearchResult],
+        k: Optional[int] = None,
+        text_field: str = "text",
+        budget_ms: Optional[float] = None,
+    ) -> List[SearchResult]:
+        """
+        Reorder search hits by cross-encoder score.
+
+        Args:
+            query (str): Query text.
+            results (Sequence[SearchResult]): Candidates in retrieval order.
+            k (Optional[int]): Results to return; all of them by default.
+            text_field (str): Payload field holding the candidate text.
+            budget_ms (Optional[float]): Scoring time limit, see ``score``.
+
+        Returns:
+            List[SearchResult]: Scored hits by decreasing cross-encoder score, carrying that
+                score, followed by any hits the budget left unscored in retrieval order
+                with their retrieval score.
+        """
+        results = list(results)
+        scores = self.score(query, [str(r.payload.get(text_field, "")) for r in results], budget_ms)
+        scored = [i for i in np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")
+                  if not np.isnan(scores[i])]
+        ranked = [SearchResult(id=results[i].id, score=float(scores[i]), payload=results[i].payload)
+                  for i in scored]
+        ranked.extend(results[i] for i in range(len(results)) if np.isnan(scores[i]))
+        return ranked[:k] if k is not None else ranked
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for sizing N, the budget and the cache.
+        """
+        with self._cache_lock:
+            return {
+                "pairs_scored": self.pairs_scored,
+                "cache_hits": self.cache_hits,
+                "cache_items": len(self._scores),
+                "truncated_queries": self.truncated,
+                "ms_per_pair": self.seconds_per_pair * 1000.0 if self.seconds_per_pair else None,
+            }
+
+
+_rerankers: Dict[str, CrossEncoderReranker] = {}
+_rerankers_lock = threading.Lock()
+
+
+def get_reranker(model_name: str = DEFAULT_RERANKER_MODEL) -> CrossEncoderReranker:
+    """
+    Return the process-wide reranker for a model, creating it on first use.
+
+    The model itself loads on the first scoring call.
+    """
+    with _rerankers_lock:
+        reranker = _rerankers.get(model_name)
+        if reranker is None:
+            reranker = CrossEncoderReranker(model_name)
+            _rerankers[model_name] = reranker
+        return reranker
+
+
+def rerank_search(
+    store: VectorStore,
+    query: str,
+    encode_fn: Callable[[List[str]], Any],
+    k: int = 10,
+    filters: Optional[Filters] = None,
+    reranker: Optional[CrossEncoderReranker] = None,
+    candidates: Optional[int] = None,
+    budget_ms: Optional[float] = RERANK_BUDGET_MS,
+    text_field: str = "text",
+) -> List[SearchResult]:
+    """
+    Vector search for top-N candidates followed by local cross-encoder reranking.
+
+    Args:
+        store (VectorStore): Any backend store.
+        query (str): Query text.
+        encode_fn (Callable[[List[str]], Any]): Maps a batch of texts to an embedding matrix.
+        k (int): Results to return.
+        filters (Optional[Filters]): Payload filter of the candidate search.
+        reranker (Optional[CrossEncoderReranker]): Reranker; the shared default model otherwise.
+        candidates (Optional[int]): Fixed N; chosen by ``candidate_count`` by default.
+        budget_ms (Optional[float]): Latency budget of the whole call, embedding and
+            retrieval included; reranking gets what is left of it.
+        text_field (str): Payload field holding the document text.
+
+    Returns:
+        List[SearchResult]: Top k hits, scored by the cross-encoder.
+    """
+    started = time.perf_counter()
+    reranker = reranker or get_reranker()
+    count = candidates or reranker.candidate_count(k, budget_ms)
+    hits = store.search(as_matrix(encode_fn([query]))[0], k=count, filters=filters)
+    remaining = budget_ms - (time.perf_counter() - started) * 1000.0 if budget_ms else None
+    # Always score at least one batch, even if retrieval used the whole budget.
+    ranked = reranker.rerank(query, hits, k=k, text_field=text_field,
+                             budget_ms=max(remaining, 1e-3) if remaining is not None else None)
+    info("Reranked %d candidates to %d results", len(hits), len(ranked), service="reranker",
+         operation="rerank_search", latency_ms=(time.perf_counter() - started) * 1000.0,
+         collection=store.collection_name)
+    return ranked
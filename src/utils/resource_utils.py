@@ -0,0 +1,80 @@
+"""
+resource_utils.py
+
+Helpers for reading the memory footprint of the current process.
+
+Used by the model registry and benchmarks to report resident memory without
+making psutil a hard dependency. Falls back to /proc on Linux and to
+``resource.getrusage`` elsewhere.
+"""
+
+import os
+import sys
+from typing import Optional
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Return the resident set size of the current process.
+
+    Returns:
+        Optional[int]: Resident memory in bytes, or None if it cannot be read.
+    """
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Return the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: Peak resident memory in bytes, or None if it cannot be read.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(num_bytes: Optional[int], signed: bool = False) -> str:
+    """
+    Format a byte count for log messages.
+
+    Args:
+        num_bytes (Optional[int]): Number of bytes.
+        signed (bool): Always show the sign, for deltas ("+87.3 MB", "-1.2 MB").
+
+    Returns:
+        str: Human readable size, e.g. "87.3 MB".
+    """
+    if num_bytes is None:
+        return "n/a"
+    size = float(num_bytes)
+    spec = "+.1f" if signed else ".1f"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024.0:
+            return f"{size:{spec}} {unit}"
+        size /= 1024.0
+    return f"{size:{spec}} TB"
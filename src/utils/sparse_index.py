@@ -0,0 +1,344 @@
+"""
+sparse_index.py
+
+In-process BM25 inverted index over document texts.
+
+Dense search misses queries that hinge on exact tokens (identifiers, names
+such as "DDR1"). ``BM25Index`` keeps a compact inverted index of the same
+texts the backends store so they can be searched lexically and fused with the
+dense results (see ``src.utils.hybrid``).
+
+Layout:
+
+- every term owns two typed arrays, doc numbers (int32, ascending) and term
+  frequencies (uint16), appended to as documents arrive;
+- documents are numbered in insertion order; replacing or deleting one only
+  marks its number dead, and the posting arrays are compacted once dead
+  documents outnumber live ones;
+- BM25 weights depend on the average document length, so the weight array
+  and the upper bound of a term are computed when a query first needs them
+  and cached until the next write.
+
+Top-k retrieval is term-at-a-time with MaxScore pruning: query terms are
+processed in decreasing order of their maximum weight into a score
+accumulator, and once the best possible score of an unseen document (the sum
+of the remaining upper bounds) falls below the current k-th score, the
+remaining terms only update the surviving candidates, looked up in their
+postings with a binary search instead of scanning them whole.
+
+Backends feed the process-wide index of a collection from their write
+helpers and ``VectorStore`` adapters (writes and deletes) when
+``SPARSE_INDEX`` is enabled; ``HybridStore`` maintains its own regardless.
+Process-wide indexes are keyed by the store's ``client_scope`` and the
+collection name, like the query cache, so equally named collections of
+different backends or clients stay apart. The index lives in memory and is
+rebuilt by re-ingesting.
+"""
+
+import os
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info
+from src.utils.embedding_cache import normalize_text
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+SPARSE_INDEX = os.getenv("SPARSE_INDEX", "0").lower() in ("1", "true", "yes")
+
+_TOKEN = re.compile(r"[^\W_]+")
+_MAX_TF = np.iinfo(np.uint16).max
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric tokens; "DDR1-x" gives ["ddr1", "x"].
+    """
+    return _TOKEN.findall(normalize_text(text).casefold())
+
+
+class BM25Index:
+    """
+    BM25 inverted index with array-backed posting lists.
+
+    Args:
+        k1 (float): Term-frequency saturation.
+        b (float): Document-length normalization.
+        keep_text (bool): Keep each document's text so hits can carry it as payload.
+    """
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B, keep_text: bool = True) -> None:
+        self.k1 = k1
+        self.b = b
+        self.keep_text = keep_text
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._terms: Dict[str, int] = {}
+        self._docs: List[array] = []
+        self._tfs: List[array] = []
+        self._ids: List[Any] = []
+        self._texts: List[Optional[str]] = []
+        self._lengths = array("I")
+        self._alive = bytearray()
+        self._number: Dict[Any, int] = {}
+        self._live_length = 0
+        self._version = 0
+        # term id -> (version, doc numbers, weights, upper bound)
+        self._weights: Dict[int, Tuple[int, np.ndarray, np.ndarray, float]] = {}
+        self._norm: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._number)
+
+    def add(self, ids: Sequence[Any], texts: Sequence[str]) -> None:
+        """
+        Index documents; an id indexed before is replaced.
+
+        Args:
+            ids (Sequence[Any]): Point ids, as stored in the vector backend.
+            texts (Sequence[str]): Document texts.
+        """
+        if len(ids) != len(texts):
+            raise ValueError(f"Got {len(ids)} ids but {len(texts)} texts")
+        with self._lock:
+            for point_id, text in zip(ids, texts):
+                point_id = point_id.item() if isinstance(point_id, np.generic) else point_id
+                self._kill(point_id)
+                text = text or ""
+                tokens = tokenize(text)
+                number = len(self._ids)
+                for term, tf in Counter(tokens).items():
+                    term_id = self._terms.get(term)
+                    if term_id is None:
+                        term_id = self._terms[term] = len(self._docs)
+                        self._docs.append(array("i"))
+                        self._tfs.append(array("H"))
+                    self._docs[term_id].append(number)
+                    self._tfs[term_id].append(min(tf, _MAX_TF))
+                self._ids.append(point_id)
+                self._texts.append(text if self.keep_text else None)
+                self._lengths.append(len(tokens))
+                self._alive.append(1)
+                self._number[point_id] = number
+                self._live_length += len(tokens)
+            self._version += 1
+
+    def remove(self, ids: Sequence[Any]) -> int:
+        """
+        Drop documents from the index.
+
+        Returns:
+            int: Number of ids that were indexed.
+        """
+        with self._lock:
+            removed = sum(self._kill(point_id.item() if isinstance(point_id, np.generic) else point_id)
+                          for point_id in ids)
+            if removed:
+                self._version += 1
+                if len(self._ids) - len(self._number) > len(self._number):
+                    self._compact()
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def _kill(self, point_id: Any) -> bool:
+        number = self._number.pop(point_id, None)
+        if number is None:
+            return False
+        self._alive[number] = 0
+        self._live_length -= self._lengths[number]
+        self._texts[number] = None
+        return True
+
+    def _compact(self) -> None:
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        renumber = np.cumsum(alive, dtype=np.int64) - 1
+        for term_id in range(len(self._docs)):
+            docs = np.frombuffer(self._docs[term_id], dtype=np.int32)
+            keep = alive[docs]
+            self._docs[term_id] = array("i", renumber[docs[keep]].astype(np.int32).tobytes())
+            self._tfs[term_id] = array("H", np.frombuffer(self._tfs[term_id], dtype=np.uint16)[keep].tobytes())
+        kept = np.flatnonzero(alive)
+        self._ids = [self._ids[n] for n in kept]
+        self._texts = [self._texts[n] for n in kept]
+        self._lengths = array("I", np.frombuffer(self._lengths, dtype=np.uint32)[kept].tobytes())
+        self._alive = bytearray(b"\x01" * len(kept))
+        self._number = {point_id: number for number, point_id in enumerate(self._ids)}
+        self._weights.clear()
+        self._norm = None
+
+    def _length_norm(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._norm is None or self._norm[0] != self._version:
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+            average = self._live_length / len(self._number) if self._number else 1.0
+            norm = self.k1 * (1.0 - self.b + self.b * lengths / max(average, 1e-9))
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            self._norm = (self._version, norm, alive)
+        return self._norm[1], self._norm[2]
+
+    def _postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray, float]:
+        cached = self._weights.get(term_id)
+        if cached is not None and cached[0] == self._version:
+            return cached[1], cached[2], cached[3]
+        norm, alive = self._length_norm()
+        docs = np.frombuffer(self._docs[term_id], dtype=np.int32)
+        tfs = np.frombuffer(self._tfs[term_id], dtype=np.uint16).astype(np.float32)
+        keep = alive[docs]
+        docs, tfs = docs[keep], tfs[keep]
+        live = len(self._number)
+        idf = np.log1p((live - len(docs) + 0.5) / (len(docs) + 0.5))
+        weights = (idf * tfs * (self.k1 + 1.0) / (tfs + norm[docs])).astype(np.float32)
+        upper = float(weights.max()) if len(weights) else 0.0
+        self._weights[term_id] = (self._version, docs, weights, upper)
+        return docs, weights, upper
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Any, float]]:
+        """
+        Top-k documents by BM25 score.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of documents.
+
+        Returns:
+            List[Tuple[Any, float]]: (point id, score) by decreasing score; only documents
+                sharing at least one token with the query.
+        """
+        with self._lock:
+            counts = Counter(self._terms[t] for t in tokenize(query) if t in self._terms)
+            if not counts or not self._number or k <= 0:
+                return []
+            lists = []
+            for term_id, query_tf in counts.items():
+                docs, weights, upper = self._postings(term_id)
+                if len(docs):
+                    lists.append((docs, weights * query_tf, upper * query_tf))
+            if not lists:
+                return []
+            lists.sort(key=lambda item: -item[2])
+
+            scores = np.zeros(len(self._ids), dtype=np.float32)
+            seen = np.zeros(len(self._ids), dtype=bool)
+            remaining = sum(upper for _, _, upper in lists)
+            touched: Optional[np.ndarray] = None
+            candidates: Optional[np.ndarray] = None
+            for docs, weights, upper in lists:
+                remaining -= upper
+                if candidates is None:
+                    scores[docs] += weights
+                    seen[docs] = True
+                    touched = np.flatnonzero(seen)
+                    if len(touched) > k:
+                        threshold = np.partition(scores[touched], len(touched) - k)[len(touched) - k]
+                        if remaining < threshold:
+                            # No document outside ``touched`` can reach the top k any more.
+                            candidates = touched[scores[touched] + remaining >= threshold]
+                else:
+                    positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                    hit = docs[positions] == candidates
+                    scores[candidates[hit]] += weights[positions[hit]]
+                    threshold = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+                    candidates = candidates[scores[candidates] + remaining >= threshold]
+
+            pool = candidates if candidates is not None else touched
+            if len(pool) > k:
+                pool = pool[np.argpartition(-scores[pool], k - 1)[:k]]
+            pool = pool[np.argsort(-scores[pool], kind="stable")]
+            return [(self._ids[n], float(scores[n])) for n in pool]
+
+    def text(self, point_id: Any) -> Optional[str]:
+        """
+        Indexed text of a document, if texts are kept.
+        """
+        with self._lock:
+            number = self._number.get(point_id)
+            return self._texts[number] if number is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Sizes of the index.
+        """
+        with self._lock:
+            postings = sum(len(docs) for docs in self._docs)
+            return {
+                "documents": len(self._number),
+                "dead_documents": len(self._ids) - len(self._number),
+                "terms": len(self._terms),
+                "postings": postings,
+                "posting_bytes": postings * 6,
+            }
+
+
+_indexes: Dict[Tuple[Hashable, str], BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_sparse_index(scope: Hashable, collection_name: str) -> BM25Index:
+    """
+    Return the process-wide BM25 index of a collection, creating it on first use.
+
+    Args:
+        scope (Hashable): ``client_scope`` of the client holding the collection, or ``VectorStore.scope``.
+        collection_name (str): Collection name.
+    """
+    with _indexes_lock:
+        index = _indexes.get((scope, collection_name))
+        if index is None:
+            index = _indexes[(scope, collection_name)] = BM25Index()
+            info("Sparse index created for '%s'", collection_name, service="sparse_index")
+        return index
+
+
+def drop_sparse_index(scope: Hashable, collection_name: str) -> None:
+    """
+    Forget a collection's index, e.g. when the collection is recreated.
+    """
+    with _indexes_lock:
+        _indexes.pop((scope, collection_name), None)
+
+
+def index_texts(scope: Hashable, collection_name: str, ids: Sequence[Any], texts: Optional[Sequence[Any]]) -> None:
+    """
+    Add written documents to the collection's index when ``SPARSE_INDEX`` is on.
+
+    Called by the backend write helpers and adapters after a successful
+    write; missing texts are indexed as empty documents. ``ids`` must be the
+    ids the backend's search hits report, which ``HybridStore`` also indexes
+    under.
+    """
+    if SPARSE_INDEX:
+        texts = texts if texts is not None else [None] * len(ids)
+        get_sparse_index(scope, collection_name).add(
+            list(ids), [text if isinstance(text, str) else "" for text in texts])
+
+
+def payload_texts(payloads: Optional[Sequence[Dict[str, Any]]], text_field: str = "text") -> Optional[List[Any]]:
+    """
+    The ``text_field`` of each payload, for ``index_texts``; None without payloads.
+    """
+    return [payload.get(text_field) for payload in payloads] if payloads else None
+
+
+def remove_texts(scope: Hashable, collection_name: str, ids: Sequence[Any]) -> None:
+    """
+    Drop deleted documents from the collection's index when ``SPARSE_INDEX`` is on.
+    """
+    if SPARSE_INDEX:
+        with _indexes_lock:
+            index = _indexes.get((scope, collection_name))
+        if index is not None:
+            index.remove(list(ids))
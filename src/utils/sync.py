@@ -0,0 +1,370 @@
+"""
+sync.py
+
+Incremental synchronization of a document corpus into a vector store.
+
+Instead of dropping the collection and re-ingesting everything on every
+start, a manifest records a content hash per document id. A sync pass
+streams the corpus, looks each batch up in the manifest and only embeds and
+upserts documents that are new or whose text or payload changed; documents
+that were not seen during the pass are deleted from the store at the end.
+
+The manifest is a SQLite file so that it scales to tens of millions of ids
+without being loaded into memory. Each pass runs under a new generation
+number: rows seen in the pass are stamped with it, and rows left with an
+older generation after a complete pass are the deleted documents. Manifest
+rows are only updated after the corresponding upsert or delete succeeded, so
+an interrupted pass is simply resumed by the next one.
+
+The manifest only describes the store as long as the collection survives:
+the collection helpers that drop and recreate a collection also delete its
+manifest, a pass that finds the collection empty starts from a clean
+manifest, and stores whose collections end with the process (in-memory
+clients) are refused.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.logging_utils import info, error
+from src.utils.embedding_cache import get_embedding_cache
+from src.utils.vector_store import create_store
+from src.utils.id_allocator import stable_point_id
+
+DEFAULT_MANIFEST_DIR = os.path.join(ROOT_DIR, ".cache", "manifests")
+DEFAULT_SYNC_BATCH_SIZE = 512
+# Entry points sync instead of dropping and re-ingesting their collection when set.
+INCREMENTAL_SYNC = os.getenv("INCREMENTAL_SYNC", "0").lower() in ("1", "true", "yes")
+# SQLite's default limit on bound parameters is 32766; stay well below it.
+_LOOKUP_CHUNK = 900
+
+Document = Tuple[str, str, Dict[str, Any]]
+EncodeFn = Callable[[List[str]], Any]
+
+
+def content_hash(text: str, payload: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Digest of a document's text and payload.
+
+    Args:
+        text (str): Document text.
+        payload (Optional[Dict[str, Any]]): Metadata stored with the document.
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(text.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(json.dumps(payload or {}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.digest()
+
+
+@dataclass
+class SyncStats:
+    """
+    Outcome of one sync pass.
+
+    Attributes:
+        added (int): Documents embedded and upserted for the first time.
+        updated (int): Documents re-embedded because their content changed.
+        unchanged (int): Documents skipped.
+        deleted (int): Documents removed from the store.
+        elapsed_seconds (float): Wall-clock time of the pass.
+    """
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.updated + self.deleted
+
+
+class SyncManifest:
+    """
+    SQLite-backed map of document id to content hash for one collection.
+
+    Args:
+        path (str): SQLite file; created if missing.
+        model_name (Optional[str]): Embedding model of the collection. When it differs
+            from the model recorded in the manifest every document is re-embedded.
+    """
+
+    def __init__(self, path: str, model_name: Optional[str] = None) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id TEXT PRIMARY KEY, hash BLOB NOT NULL, generation INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS documents_generation ON documents(generation)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+        if model_name is not None:
+            recorded = self._get_meta("model")
+            if recorded is not None and recorded != model_name:
+                # Keep the ids so removed documents are still detected, but force re-embedding.
+                self._db.execute("UPDATE documents SET hash = X''")
+                info(f"Embedding model changed from '{recorded}' to '{model_name}'; all documents will be "
+                     f"re-embedded", service="sync")
+            self._set_meta("model", model_name)
+            self._db.commit()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def reset(self) -> None:
+        """
+        Forget every document, e.g. when the collection turned out to be empty.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM documents")
+            self._db.commit()
+
+    def begin_pass(self) -> int:
+        """
+        Start a sync pass and return its generation number.
+        """
+        with self._lock:
+            generation = int(self._get_meta("generation") or 0) + 1
+            self._set_meta("generation", str(generation))
+            self._db.commit()
+            return generation
+
+    def lookup(self, doc_ids: Sequence[str]) -> Dict[str, bytes]:
+        """
+        Recorded hashes of the given ids; unknown ids are absent from the result.
+        """
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            for start in range(0, len(doc_ids), _LOOKUP_CHUNK):
+                chunk = doc_ids[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT doc_id, hash FROM documents WHERE doc_id IN ({placeholders})", chunk
+                )
+                found.update((doc_id, bytes(digest)) for doc_id, digest in rows)
+        return found
+
+    def record(self, entries: Sequence[Tuple[str, bytes]], generation: int) -> None:
+        """
+        Store the hashes of upserted documents and stamp them with the pass generation.
+        """
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO documents (doc_id, hash, generation) VALUES (?, ?, ?)",
+                [(doc_id, digest, generation) for doc_id, digest in entries],
+            )
+            self._db.commit()
+
+    def touch(self, doc_ids: Sequence[str], generation: int) -> None:
+        """
+        Stamp unchanged documents with the pass generation.
+        """
+        with self._lock:
+            self._db.executemany(
+                "UPDATE documents SET generation = ? WHERE doc_id = ?",
+                [(generation, doc_id) for doc_id in doc_ids],
+            )
+            self._db.commit()
+
+    def stale(self, generation: int, batch_size: int = DEFAULT_SYNC_BATCH_SIZE) -> Iterator[List[str]]:
+        """
+        Yield, in batches, the ids not seen during the pass of ``generation``.
+        """
+        with self._lock:
+            doc_ids = [row[0] for row in self._db.execute(
+                "SELECT doc_id FROM documents WHERE generation < ?", (generation,)
+            )]
+        for start in range(0, len(doc_ids), batch_size):
+            yield doc_ids[start:start + batch_size]
+
+    def forget(self, doc_ids: Sequence[str]) -> None:
+        """
+        Remove deleted documents from the manifest.
+        """
+        with self._lock:
+            self._db.executemany("DELETE FROM documents WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids])
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def manifest_path(backend: str, collection_name: str, manifest_dir: str = DEFAULT_MANIFEST_DIR) -> str:
+    """
+    Default manifest location for a backend collection.
+    """
+    return os.path.join(manifest_dir, f"{backend}-{collection_name}.sqlite")
+
+
+def drop_manifest(backend: str, collection_name: str, manifest_dir: str = DEFAULT_MANIFEST_DIR) -> None:
+    """
+    Delete the default manifest of a backend collection, e.g. when the collection is recreated.
+    """
+    path = manifest_path(backend, collection_name, manifest_dir)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def sync_store(
+    store: Any,
+    documents: Iterable[Document],
+    encode_fn: EncodeFn,
+    manifest: SyncManifest,
+    batch_size: int = DEFAULT_SYNC_BATCH_SIZE,
+    delete_missing: bool = True,
+    point_id_fn: Callable[[str], Any] = stable_point_id,
+) -> SyncStats:
+    """
+    Bring a vector store in line with a corpus, touching only what changed.
+
+    The collection is created if it does not exist but never dropped. The
+    document id is stored in the payload under "doc_id" and the text under
+    "text". If the collection is empty, the manifest is reset first, so a
+    collection created or emptied behind the manifest's back is refilled.
+
+    Args:
+        store (VectorStore): Target store.
+        documents (Iterable[Document]): (doc_id, text, payload) tuples; consumed lazily.
+        encode_fn (EncodeFn): Maps a batch of texts to an embedding matrix.
+        manifest (SyncManifest): Manifest of the collection.
+        batch_size (int): Documents looked up, embedded and upserted per batch.
+        delete_missing (bool): Delete documents absent from ``documents``. Disable
+            when syncing a partial corpus.
+        point_id_fn (Callable[[str], Any]): Maps a document id to the store's point id.
+
+    Returns:
+        SyncStats: Counts of added, updated, unchanged and deleted documents.
+
+    Raises:
+        ValueError: If the store's collections do not outlive the process.
+    """
+    stats = SyncStats()
+    started = time.perf_counter()
+    try:
+        if not store.persistent:
+            raise ValueError(f"The {store.backend} collection '{store.collection_name}' is held in memory and "
+                             f"does not outlive the process; ingest it instead of syncing")
+        store.create_collection(recreate=False)
+        if len(manifest) and store.count() == 0:
+            info(f"Collection '{store.collection_name}' is empty; resetting its manifest of {len(manifest)} "
+                 f"documents", service="sync")
+            manifest.reset()
+        generation = manifest.begin_pass()
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            known = manifest.lookup([doc_id for doc_id, _, _ in batch])
+            changed: List[Tuple[str, str, Dict[str, Any], bytes]] = []
+            unchanged: List[str] = []
+            for doc_id, text, payload in batch:
+                digest = content_hash(text, payload)
+                if known.get(doc_id) == digest:
+                    unchanged.append(doc_id)
+                else:
+                    changed.append((doc_id, text, payload, digest))
+                    if doc_id in known:
+                        stats.updated += 1
+                    else:
+                        stats.added += 1
+            if changed:
+                embeddings = encode_fn([text for _, text, _, _ in changed])
+                store.upsert(
+                    [point_id_fn(doc_id) for doc_id, _, _, _ in changed],
+                    embeddings,
+                    [{**(payload or {}), "text": text, "doc_id": doc_id} for doc_id, text, payload, _ in changed],
+                )
+                manifest.record([(doc_id, digest) for doc_id, _, _, digest in changed], generation)
+            if unchanged:
+                manifest.touch(unchanged, generation)
+                stats.unchanged += len(unchanged)
+
+        if delete_missing:
+            for doc_ids in manifest.stale(generation, batch_size):
+                store.delete([point_id_fn(doc_id) for doc_id in doc_ids])
+                manifest.forget(doc_ids)
+                stats.deleted += len(doc_ids)
+    except Exception as exc:
+        error(f"Sync of collection '{store.collection_name}' failed: {exc}", service="sync")
+        raise
+    finally:
+        stats.elapsed_seconds = time.perf_counter() - started
+
+    info(f"Synced '{store.collection_name}': {stats.added} added, {stats.updated} updated, "
+         f"{stats.unchanged} unchanged, {stats.deleted} deleted in {stats.elapsed_seconds:.2f}s", service="sync")
+    return stats
+
+
+def sync_collection(
+    backend: str,
+    collection_name: str,
+    dimension: int,
+    documents: Iterable[Document],
+    model: Any,
+    model_name: str,
+    batch_size: int = DEFAULT_SYNC_BATCH_SIZE,
+    delete_missing: bool = True,
+    **store_kwargs: Any,
+) -> SyncStats:
+    """
+    Sync a corpus into a backend collection using the default manifest location.
+
+    Embeddings go through the shared embedding cache of ``model_name``.
+
+    Args:
+        backend (str): Backend name understood by ``create_store``.
+        collection_name (str): Collection to sync.
+        dimension (int): Vector dimension.
+        documents (Iterable[Document]): (doc_id, text, payload) tuples.
+        model (Any): Embedding model exposing ``encode``.
+        model_name (str): Model name, recorded in the manifest.
+        batch_size (int): Documents per batch.
+        delete_missing (bool): Delete documents absent from ``documents``.
+        **store_kwargs: Extra arguments for the store adapter, e.g. ``client``.
+
+    Returns:
+        SyncStats: Counts of added, updated, unchanged and deleted documents.
+    """
+    cache = get_embedding_cache(model_name)
+    store = create_store(backend, collection_name, dimension, **store_kwargs)
+    manifest = SyncManifest(manifest_path(backend, collection_name), model_name=model_name)
+    try:
+        return sync_store(store, documents, lambda texts: cache.encode(model, texts), manifest,
+                          batch_size=batch_size, delete_missing=delete_missing)
+    finally:
+        manifest.close()
+        if "client" not in store_kwargs:
+            store.close()
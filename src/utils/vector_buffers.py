@@ -0,0 +1,94 @@
+"""
+vector_buffers.py
+
+Helpers for handing embeddings to clients without ``.tolist()`` round trips.
+
+Embeddings stay in one contiguous float32 ndarray from the encoder to the
+client call. ``as_matrix`` accepts ndarrays, memoryviews, buffers and nested
+lists and only copies when the input is not already C-contiguous float32.
+Clients that need Python lists get them through ``to_lists``, one batch at a
+time, so at most one batch of Python floats is alive at once instead of the
+whole corpus (a Python float list costs roughly 8x the ndarray).
+"""
+
+import os
+import sys
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+DEFAULT_CONVERT_BATCH = 1024
+
+
+def as_matrix(vectors: Any, dimension: Optional[int] = None) -> np.ndarray:
+    """
+    View vectors as a C-contiguous (n, dim) float32 matrix, copying only if needed.
+
+    Args:
+        vectors (Any): ndarray, float32 memoryview/buffer, or nested sequences.
+        dimension (Optional[int]): Row length, needed to reshape flat raw buffers.
+
+    Returns:
+        np.ndarray: 2-D float32 matrix; shares memory with ``vectors`` when possible.
+    """
+    if isinstance(vectors, memoryview) and vectors.format == "f":
+        matrix = np.asarray(vectors)
+    elif isinstance(vectors, (memoryview, bytes, bytearray)):
+        matrix = np.frombuffer(vectors, dtype=np.float32)
+    else:
+        matrix = np.asarray(vectors)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        if matrix.size == 0:
+            return matrix.reshape(0, dimension or 0)
+        matrix = matrix.reshape(-1, dimension or matrix.shape[0])
+    return matrix
+
+
+def as_query(vector: Any) -> np.ndarray:
+    """
+    View one query vector as a contiguous 1-D float32 array.
+
+    Args:
+        vector (Any): ndarray, memoryview or sequence of floats.
+
+    Returns:
+        np.ndarray: 1-D float32 vector.
+    """
+    return np.ascontiguousarray(np.asarray(vector), dtype=np.float32).reshape(-1)
+
+
+def iter_batches(matrix: np.ndarray, batch_size: int = DEFAULT_CONVERT_BATCH) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (offset, view) pairs over consecutive row blocks without copying.
+
+    Args:
+        matrix (np.ndarray): Matrix to split.
+        batch_size (int): Rows per block.
+
+    Yields:
+        Tuple[int, np.ndarray]: Offset of the first row and a view of the block.
+    """
+    for start in range(0, matrix.shape[0], batch_size):
+        yield start, matrix[start:start + batch_size]
+
+
+def to_lists(vectors: Any) -> List[List[float]]:
+    """
+    Convert one batch to lists of Python floats, for clients that accept nothing else.
+
+    Call it as late as possible, on a single batch.
+
+    Args:
+        vectors (Any): ndarray batch or already-converted lists.
+
+    Returns:
+        List[List[float]]: Row lists.
+    """
+    if isinstance(vectors, list):
+        return vectors
+    return as_matrix(vectors).tolist()
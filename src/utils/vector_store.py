@@ -0,0 +1,305 @@
+"""
+vector_store.py
+
+Backend-agnostic vector store interface.
+
+Every backend package exposes an adapter implementing ``VectorStore`` in its
+``store.py`` module (see ``STORE_ADAPTERS``), so the same workload can be run
+against any of them and results always come back as ``SearchResult`` objects.
+Adapters are looked up by name through ``create_store`` and imported lazily,
+so using one backend never requires the client libraries of the others.
+
+Filters are plain dictionaries mapping a payload field to either a value
+(equality) or a list/tuple/set of values (membership), or Milvus-style
+expression strings such as ``"subject == 'biology' and year >= 2020"``
+(see ``src.utils.filter_expr``).
+"""
+
+import importlib
+import itertools
+import os
+import sys
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from src.utils.concurrency import fan_out, DEFAULT_FAN_OUT
+from src.utils.columnar import ColumnBatch
+from src.utils.client_pool import find_pool_key
+
+PointId = Union[int, str]
+Filters = Union[Dict[str, Any], str]
+
+STORE_ADAPTERS: Dict[str, str] = {
+    "qdrant": "src.qdrant_lite.store:QdrantStore",
+    "milvus": "src.milvus_lite.store:MilvusStore",
+    "weaviate": "src.weaviate_lite.store:WeaviateStore",
+    "pinecone": "src.pinecone_client.store:PineconeStore",
+    "numpy": "src.numpy_lite.store:NumpyStore",
+    "hnsw": "src.hnsw_lite.store:HNSWStore",
+    "ivfpq": "src.ivfpq_lite.store:IVFPQStore",
+}
+
+_client_tokens: Dict[int, int] = {}
+_client_tokens_lock = threading.Lock()
+_next_client_token = itertools.count(1)
+
+
+def client_scope(backend: str, client: Any) -> Tuple[str, Hashable]:
+    """
+    Identity of the data a client reaches, used to keep per-collection state apart.
+
+    Every backend config uses the same collection name, so caches and indexes
+    keyed by name alone would mix up the collections of different backends
+    and clients. Clients leased from a shared pool reach the same server and
+    share the pool's scope; any other client is a scope of its own.
+
+    Args:
+        backend (str): Backend name, e.g. "numpy".
+        client (Any): Client (or store) the collection is reached through.
+
+    Returns:
+        Tuple[str, Hashable]: (backend, pool key or per-client token).
+    """
+    pool_key = find_pool_key(client)
+    if pool_key is not None:
+        return backend, pool_key
+    client_id = id(client)
+    with _client_tokens_lock:
+        token = _client_tokens.get(client_id)
+        if token is None:
+            token = next(_next_client_token)
+            _client_tokens[client_id] = token
+            try:
+                # Forget the token with the client so a new object at the same address gets a fresh one.
+                weakref.finalize(client, _client_tokens.pop, client_id, None)
+            except TypeError:
+                pass
+    return backend, token
+
+
+@dataclass
+class SearchResult:
+    """
+    One normalized search hit.
+
+    Attributes:
+        id (PointId): Point id as given to ``upsert``.
+        score (float): Similarity score; higher is more similar for every backend.
+        payload (Dict[str, Any]): Stored metadata, including the document text.
+    """
+    id: PointId
+    score: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class VectorStore(ABC):
+    """
+    Common interface implemented by every backend adapter.
+
+    Adapters set ``scope`` to the ``client_scope`` of their client; query
+    caches and sparse indexes are namespaced by it. It defaults to the store
+    itself. ``persistent`` is False when the collections do not outlive the
+    process.
+
+    Args:
+        collection_name (str): Collection, class or index the store operates on.
+        dimension (int): Vector dimension.
+    """
+
+    backend: str = ""
+    batch_concurrency: int = DEFAULT_FAN_OUT
+    persistent: bool = True
+
+    def __init__(self, collection_name: str, dimension: int) -> None:
+        self.collection_name = collection_name
+        self.dimension = dimension
+        self.scope: Hashable = client_scope(self.backend, self)
+
+    @abstractmethod
+    def create_collection(self, recreate: bool = False) -> None:
+        """
+        Create the collection, optionally dropping an existing one first.
+
+        Args:
+            recreate (bool): Drop and recreate the collection if it exists.
+        """
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: Sequence[PointId],
+        vectors: Sequence[Sequence[float]],
+        payloads: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> int:
+        """
+        Insert or overwrite points.
+
+        Args:
+            ids (Sequence[PointId]): Point ids.
+            vectors (Sequence[Sequence[float]]): One vector per id.
+            payloads (Optional[Sequence[Dict[str, Any]]]): Optional metadata per id.
+
+        Returns:
+            int: Number of points written.
+
+        Raises:
+            Exception: If any point could not be written; a call that returns stored every point.
+        """
+
+    def upsert_batch(self, batch: ColumnBatch) -> int:
+        """
+        Insert or overwrite a column-oriented batch of points.
+
+        The default converts the payload columns to rows and calls ``upsert``;
+        adapters whose backend takes column-oriented writes override it.
+
+        Args:
+            batch (ColumnBatch): Ids, vector matrix and payload columns.
+
+        Returns:
+            int: Number of points written.
+        """
+        return self.upsert(batch.id_list(), batch.vectors, batch.payload_rows())
+
+    @abstractmethod
+    def delete(self, ids: Sequence[PointId]) -> int:
+        """
+        Delete points by id.
+
+        Args:
+            ids (Sequence[PointId]): Point ids to delete.
+
+        Returns:
+            int: Number of ids submitted for deletion.
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+    ) -> List[SearchResult]:
+        """
+        Return the k nearest points to one query vector.
+
+        Args:
+            query_vector (Sequence[float]): Query vector.
+            k (int): Number of results.
+            filters (Optional[Filters]): Payload filter.
+
+        Returns:
+            List[SearchResult]: Hits ordered by decreasing score.
+        """
+
+    def count(self) -> Optional[int]:
+        """
+        Number of points in the collection.
+
+        Returns:
+            Optional[int]: Point count, or None when the adapter cannot tell.
+        """
+        return None
+
+    def batch_search(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Search several query vectors; results are aligned with the queries.
+
+        The default fans single searches out over up to ``batch_concurrency``
+        threads. Adapters whose backend accepts many queries per request
+        override this with a single batched call.
+
+        Args:
+            query_vectors (Sequence[Sequence[float]]): Query vectors.
+            k (int): Number of results per query.
+            filters (Optional[Filters]): Payload filter applied to every query.
+
+        Returns:
+            List[List[SearchResult]]: One result list per query.
+        """
+        return fan_out(
+            lambda query_vector: self.search(query_vector, k=k, filters=filters),
+            query_vectors,
+            max_workers=self.batch_concurrency,
+        )
+
+    def close(self) -> None:
+        """
+        Release client resources held by the store.
+        """
+
+
+def as_vector_list(vectors: Any) -> List[List[float]]:
+    """
+    Convert a matrix (ndarray or nested sequence) to a list of float lists.
+
+    Args:
+        vectors (Any): Matrix-like input.
+
+    Returns:
+        List[List[float]]: Vectors as plain Python lists.
+    """
+    if hasattr(vectors, "tolist"):
+        return vectors.tolist()
+    return [list(vector) for vector in vectors]
+
+
+def as_vector(vector: Any) -> List[float]:
+    """
+    Convert one vector (ndarray or sequence) to a list of floats.
+
+    Args:
+        vector (Any): Vector-like input.
+
+    Returns:
+        List[float]: Vector as a plain Python list.
+    """
+    if hasattr(vector, "tolist"):
+        return vector.tolist()
+    return list(vector)
+
+
+def register_store(backend: str, target: str) -> None:
+    """
+    Register an adapter under a backend name.
+
+    Args:
+        backend (str): Name used with ``create_store``.
+        target (str): Import path in the form ``"package.module:ClassName"``.
+    """
+    STORE_ADAPTERS[backend] = target
+
+
+def create_store(backend: str, *args: Any, **kwargs: Any) -> VectorStore:
+    """
+    Instantiate the adapter registered for a backend.
+
+    Args:
+        backend (str): Backend name, e.g. "qdrant" or "milvus".
+        *args: Positional arguments forwarded to the adapter.
+        **kwargs: Keyword arguments forwarded to the adapter.
+
+    Returns:
+        VectorStore: The adapter instance.
+
+    Raises:
+        ValueError: If no adapter is registered under that name.
+    """
+    target = STORE_ADAPTERS.get(backend)
+    if target is None:
+        raise ValueError(f"Unknown vector store backend '{backend}', expected one of {sorted(STORE_ADAPTERS)}")
+    module_name, class_name = target.split(":")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    return store_class(*args, **kwargs)
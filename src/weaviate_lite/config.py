@@ -7,10 +7,17 @@ a SentenceTransformer model for vector embeddings.
 Attributes:
     ROOT_DIR (str): Absolute path to the root directory of the project.
     CLASS_NAME (str): Default class name used in the Weaviate schema.
+    WEAVIATE_HOST (str): Host of the Weaviate instance (env ``WEAVIATE_HOST``).
+    WEAVIATE_PORT (int): HTTP port (env ``WEAVIATE_PORT``).
+    WEAVIATE_GRPC_PORT (int): gRPC port (env ``WEAVIATE_GRPC_PORT``).
+    WEAVIATE_POOL_SIZE (int): Maximum number of pooled clients (env ``WEAVIATE_POOL_SIZE``).
+    EMBEDDING_MODEL_NAME (str): SentenceTransformer model used for embeddings.
 """
 
 import os
 import sys
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -19,19 +26,36 @@ sys.path.append(ROOT_DIR)
 import weaviate
 from weaviate.exceptions import WeaviateBaseError
 from weaviate.classes.init import AdditionalConfig, Timeout
-from sentence_transformers import SentenceTransformer
 from src.utils import info, error
-from src.utils import info, error  # Assuming your logger is in this path
+from src.utils.client_pool import ClientPool, get_pool
+from src.utils.model_registry import EMBEDDING_MODEL
+from src.utils.parallel_encoder import get_encoder
 
 CLASS_NAME = "Document"
-
-
-def get_weaviate_client() -> weaviate.WeaviateClient:
+VECTOR_DIM = 384
+EMBEDDING_MODEL_NAME = EMBEDDING_MODEL
+WEAVIATE_HOST = os.getenv("WEAVIATE_HOST", "localhost")
+WEAVIATE_PORT = int(os.getenv("WEAVIATE_PORT", "8080"))
+WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
+WEAVIATE_POOL_SIZE = int(os.getenv("WEAVIATE_POOL_SIZE", "4"))
+
+
+def get_weaviate_client(
+    host: str = WEAVIATE_HOST,
+    port: int = WEAVIATE_PORT,
+    grpc_port: int = WEAVIATE_GRPC_PORT
+) -> weaviate.WeaviateClient:
     """
-    Initialize and return a Weaviate client.
+    Initialize and return a new Weaviate client.
 
-    Connects to a local Weaviate instance running on http://localhost:8080.
-    Includes support for gRPC port and timeout configuration.
+    Connects to a local Weaviate instance, by default on http://localhost:8080.
+    Includes support for gRPC port and timeout configuration. Every call
+    opens a new connection; use ``weaviate_connection`` to reuse pooled ones.
+
+    Args:
+        host (str): Weaviate host.
+        port (int): HTTP port.
+        grpc_port (int): gRPC port.
 
     Returns:
         weaviate.WeaviateClient: An initialized Weaviate client instance.
@@ -41,11 +65,12 @@ def get_weaviate_client() -> weaviate.WeaviateClient:
         Exception: For any unexpected error.
     """
     try:
-        info("🔄 Attempting to connect to Weaviate at http://localhost:8080...")
+        info("🔄 Attempting to connect to Weaviate at http://{}:{}...".format(host, port))
 
         client = weaviate.connect_to_local(
-            port=8080,
-            grpc_port=50051,
+            host=host,
+            port=port,
+            grpc_port=grpc_port,
             headers={
                 "X-OpenAI-Api-Key": os.getenv("OPENAI_APIKEY", "")  # Optional
             },
@@ -65,22 +90,137 @@ def get_weaviate_client() -> weaviate.WeaviateClient:
         raise
 
 
-def get_embedding_model() -> SentenceTransformer:
+async def get_async_weaviate_client(
+    host: str = WEAVIATE_HOST,
+    port: int = WEAVIATE_PORT,
+    grpc_port: int = WEAVIATE_GRPC_PORT
+) -> weaviate.WeaviateAsyncClient:
+    """
+    Initialize, connect and return a native async Weaviate client.
+
+    The client's queries and inserts are coroutines on the running event
+    loop, so async callers need no worker threads. It is bound to the loop
+    it was connected on; close it with ``await client.close()``.
+
+    Args:
+        host (str): Weaviate host.
+        port (int): HTTP port.
+        grpc_port (int): gRPC port.
+
+    Returns:
+        weaviate.WeaviateAsyncClient: A connected async client.
+
+    Raises:
+        WeaviateBaseError: If the client fails to connect.
+    """
+    try:
+        client = weaviate.use_async_with_local(
+            host=host,
+            port=port,
+            grpc_port=grpc_port,
+            additional_config=AdditionalConfig(
+                timeout=Timeout(init=10, query=30, insert=60)
+            )
+        )
+        await client.connect()
+        info("✅ Async Weaviate client initialized successfully.")
+        return client
+    except WeaviateBaseError as exc:
+        error(f"❌ WeaviateBaseError: Failed to connect async client to Weaviate - {exc}")
+        raise
+
+
+def get_weaviate_pool(
+    host: str = WEAVIATE_HOST,
+    port: int = WEAVIATE_PORT,
+    grpc_port: int = WEAVIATE_GRPC_PORT
+) -> ClientPool:
+    """
+    Return the process-wide client pool for a Weaviate instance.
+
+    Clients are opened lazily with ``get_weaviate_client``, checked with
+    ``is_ready()`` before reuse after being idle, and reopened when the check
+    fails.
+
+    Args:
+        host (str): Weaviate host.
+        port (int): HTTP port.
+        grpc_port (int): gRPC port.
+
+    Returns:
+        ClientPool: The shared pool for this host and ports.
+    """
+    return get_pool(
+        "weaviate:{}:{}:{}".format(host, port, grpc_port),
+        lambda: ClientPool(
+            "weaviate",
+            factory=lambda: get_weaviate_client(host, port, grpc_port),
+            health_check=lambda client: client.is_ready(),
+            max_size=WEAVIATE_POOL_SIZE,
+            keepalive_interval=60.0
+        )
+    )
+
+
+@contextmanager
+def weaviate_connection(**kwargs) -> Iterator[weaviate.WeaviateClient]:
+    """
+    Lease a pooled Weaviate client for the duration of a ``with`` block.
+
+    Args:
+        **kwargs: ``host``, ``port`` and ``grpc_port`` of the instance.
+
+    Yields:
+        weaviate.WeaviateClient: A connected client; do not close it.
+    """
+    with get_weaviate_pool(**kwargs).connection() as client:
+        yield client
+
+
+def get_embedded_weaviate_client() -> weaviate.WeaviateClient:
+    """
+    Start an embedded Weaviate instance and return a client connected to it.
+
+    Used as a local stand-in for benchmarks and tests when no Weaviate server
+    is running. The binary is downloaded and started by the client library.
+
+    Returns:
+        weaviate.WeaviateClient: A client connected to the embedded instance.
+
+    Raises:
+        WeaviateBaseError: If the embedded instance fails to start.
+    """
+    try:
+        client = weaviate.connect_to_embedded(
+            additional_config=AdditionalConfig(
+                timeout=Timeout(init=30, query=30, insert=60)
+            )
+        )
+        info("✅ Embedded Weaviate instance started.")
+        return client
+    except WeaviateBaseError as exc:
+        error(f"❌ WeaviateBaseError: Failed to start embedded Weaviate - {exc}")
+        raise
+
+
+def get_embedding_model() -> Any:
     """
-    Load and return a SentenceTransformer embedding model.
+    Return the shared embedding model.
 
-    Loads the 'all-MiniLM-L6-v2' model from SentenceTransformers.
-    If loading fails, logs the error and raises the original exception.
+    The model is loaded once per process through the model registry and
+    reused by every backend; sentence_transformers (and torch) are only
+    imported when the configured precision needs them. If loading fails,
+    logs the error and raises the original exception.
 
     Returns:
-        SentenceTransformer: A loaded SentenceTransformer model.
+        Any: A loaded SentenceTransformer model, or the ONNX encoder for EMBEDDING_PRECISION=onnx.
 
     Raises:
         Exception: If the model fails to load for any reason.
     """
     try:
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        info("📐 Embedding model 'all-MiniLM-L6-v2' loaded successfully.")
+        model = get_encoder(EMBEDDING_MODEL_NAME)
+        info("📐 Embedding model '{}' ready.".format(EMBEDDING_MODEL_NAME))
         return model
     except Exception as exc:
         error("❌ Failed to load embedding model: {}".format(str(exc)))
@@ -2,78 +2,444 @@
 Schema definition and data insertion for Weaviate.
 
 This module defines the vector schema and handles inserting text data
-with corresponding embeddings into a Weaviate vector database.
+with corresponding embeddings into a Weaviate vector database through the
+v4 collections API.
 """
 
 import sys
 import os
-from typing import List
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
+from weaviate.classes.config import Configure, DataType, Property, Tokenization, VectorDistances
+from weaviate.classes.data import DataObject
 from src.utils import info, error
+from src.utils.async_utils import get_limiter
+from src.utils.vector_buffers import as_matrix
+from src.utils.query_cache import invalidate_collection
+from src.utils.vector_store import client_scope
+from src.utils.sync import drop_manifest
+from src.utils.sparse_index import index_texts, drop_sparse_index
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+from src.utils.ingestion import ingest_stream, IngestStats, DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING
 
+WRITE_BATCH_SIZE = 200
+WRITE_CONCURRENCY = 2
+WRITE_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+# Property holding the caller's point id; search hits report it as their id, else the object UUID.
+ID_PROPERTY = "doc_id"
+# Property type and tokenization per payload field type; keyword fields are matched as whole values.
+PROPERTY_TYPES = {
+    "keyword": (DataType.TEXT, Tokenization.FIELD),
+    "integer": (DataType.INT, None),
+    "float": (DataType.NUMBER, None),
+    "bool": (DataType.BOOL, None),
+    "text": (DataType.TEXT, Tokenization.WORD),
+}
 
-def create_schema(client, class_name: str = "Document") -> None:
+
+def schema_properties(payload_schema: Optional[PayloadSchema]) -> List[Property]:
+    """
+    Declared properties for the fields of a payload schema.
+
+    Without a declaration Weaviate's auto-schema makes every string a TEXT
+    property with word tokenization, so ``==`` and ``in`` filters on it match
+    single tokens ("c1" also matches "c1 c2"). Keyword fields are declared
+    with field tokenization so they compare as whole values.
+
+    Args:
+        payload_schema (Optional[PayloadSchema]): {field: type}; None means no declared fields.
+
+    Returns:
+        List[Property]: One property per field.
+    """
+    properties = []
+    for field_name, field_type in validate_schema(payload_schema).items():
+        data_type, tokenization = PROPERTY_TYPES[field_type]
+        extra = {"tokenization": tokenization} if tokenization is not None else {}
+        properties.append(Property(name=field_name, data_type=data_type, **extra))
+    return properties
+
+
+def create_schema(
+    client,
+    class_name: str = "Document",
+    recreate: bool = True,
+    properties: Optional[List[Property]] = None,
+    payload_schema: Optional[PayloadSchema] = None
+) -> None:
     """
-    Creates a Weaviate schema with the specified class name.
+    Creates a Weaviate collection with the specified name.
 
-    The schema includes one property: 'text' of type 'text', and no built-in vectorizer.
+    The collection has a 'text' property of type TEXT, no built-in
+    vectorizer and a cosine HNSW index; vectors are supplied by the caller.
+    Null state is indexed so filters can test for missing properties
+    (``is null``, and negated ranges). The fields of ``payload_schema``
+    are declared up front (see ``schema_properties``); other payload keys
+    are still added by auto-schema on first insert.
 
     Args:
-        client (weaviate.Client): The initialized Weaviate client.
-        class_name (str): The name of the class to create. Default is "Document".
+        client (weaviate.WeaviateClient): The initialized Weaviate client.
+        class_name (str): The name of the collection to create. Default is "Document".
+        recreate (bool): Drop an existing collection of that name first; when False
+            an existing collection is kept as is.
+        properties (Optional[List[Property]]): Properties added after 'text'.
+        payload_schema (Optional[PayloadSchema]): {field: type} of the filterable payload
+            fields; defaults to PAYLOAD_SCHEMA.
 
     Raises:
         Exception: If the schema creation fails.
     """
-    schema = {
-        "classes": [{
-            "class": class_name,
-            "vectorizer": "none",
-            "properties": [{
-                "name": "text",
-                "dataType": ["text"]
-            }]
-        }]
-    }
     try:
-        client.schema.delete_all()
-        client.schema.create(schema)
-        info("📦 Schema created for class '{}'".format(class_name))
+        exists = client.collections.exists(class_name)
+        if exists and recreate:
+            client.collections.delete(class_name)
+            exists = False
+        if not exists:
+            declared = [Property(name="text", data_type=DataType.TEXT), *(properties or [])]
+            names = {prop.name for prop in declared}
+            schema = DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema
+            declared += [prop for prop in schema_properties(schema) if prop.name not in names]
+            client.collections.create(
+                class_name,
+                vectorizer_config=Configure.Vectorizer.none(),
+                vector_index_config=Configure.VectorIndex.hnsw(distance_metric=VectorDistances.COSINE),
+                inverted_index_config=Configure.inverted_index(index_null_state=True),
+                properties=declared
+            )
+            drop_sparse_index(client_scope("weaviate", client), class_name)
+            drop_manifest("weaviate", class_name)
+            info("📦 Schema created for class '{}'".format(class_name))
     except Exception as exc:
         error("❌ Failed to create schema: {}".format(str(exc)))
         raise
+    finally:
+        invalidate_collection(client_scope("weaviate", client), class_name)
+
+
+@dataclass
+class InsertSummary:
+    """
+    Outcome of an insert_documents call.
+
+    Attributes:
+        inserted (int): Number of objects stored.
+        failed (Dict[int, str]): Index of each object that still failed after retries, mapped to its error.
+        retries (int): Number of per-object retry attempts made.
+        batches (int): Number of batches flushed (1 per object in fallback mode).
+        elapsed_seconds (float): Wall-clock duration of the insert.
+    """
+    inserted: int = 0
+    failed: Dict[int, str] = field(default_factory=dict)
+    retries: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.inserted / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def _flush_batch(collection, objects: List[Any]) -> Dict[int, str]:
+    """
+    Sends one batch and returns the position and message of every rejected object.
+    """
+    try:
+        response = collection.data.insert_many(objects)
+    except Exception as exc:
+        return {position: str(exc) for position in range(len(objects))}
+    return {position: getattr(err, "message", str(err)) for position, err in response.errors.items()}
+
+
+def _insert_batch_with_retries(
+    collection,
+    objects: List[Any],
+    indices: List[int],
+    max_retries: int,
+    summary: InsertSummary,
+    lock: threading.Lock
+) -> None:
+    """
+    Flushes a batch, retrying only the objects the server rejected.
+    """
+    pending = list(range(len(objects)))
+    errors: Dict[int, str] = {}
+    for attempt in range(max_retries + 1):
+        if attempt:
+            time.sleep(RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+        batch_errors = _flush_batch(collection, [objects[p] for p in pending])
+        errors = {pending[p]: message for p, message in batch_errors.items()}
+        with lock:
+            summary.inserted += len(pending) - len(errors)
+            summary.batches += 1
+            if attempt:
+                summary.retries += len(pending)
+        if not errors:
+            break
+        pending = sorted(errors)
+    with lock:
+        for position, message in errors.items():
+            summary.failed[indices[position]] = message
+
+
+def _prepare_objects(texts: List[str], vectors: Any, payloads: Optional[List[Dict[str, Any]]],
+                     uuids: Optional[List[Any]]) -> Tuple[Any, List[Dict[str, Any]], List[Any]]:
+    """
+    Vector matrix, properties and object ids of the documents to insert.
+    """
+    # Rows stay views of one float32 matrix; the client serializes each batch from them.
+    vectors = as_matrix(vectors)
+    if len(texts) != len(vectors):
+        raise ValueError("Got {} texts but {} vectors".format(len(texts), len(vectors)))
+    properties = [
+        {**(payloads[i] if payloads else {}), "text": text} for i, text in enumerate(texts)
+    ]
+    uuids = list(uuids) if uuids is not None else [uuid.uuid4() for _ in texts]
+    return vectors, properties, uuids
+
+
+def _record_inserted(client, class_name: str, texts: List[str], properties: List[Dict[str, Any]],
+                     uuids: List[Any], summary: InsertSummary) -> None:
+    """
+    Indexes the stored texts for sparse search and logs the outcome of an insert.
+    """
+    # The sparse index uses the ids search hits report, so hybrid fusion can match both sides.
+    stored = [i for i in range(len(texts)) if i not in summary.failed]
+    index_texts(client_scope("weaviate", client), class_name,
+                [properties[i].get(ID_PROPERTY, str(uuids[i])) for i in stored], [texts[i] for i in stored])
+    if summary.failed:
+        error("❌ {} of {} documents failed to insert into '{}'".format(
+            len(summary.failed), len(texts), class_name))
+    info("✅ Inserted {} documents into '{}' in {} batch(es), {:.1f} objects/s".format(
+        summary.inserted, class_name, summary.batches, summary.objects_per_second))
+
+
+def _insert_one_by_one(collection, properties: List[Dict[str, Any]], vectors: Any,
+                       uuids: List[Any], summary: InsertSummary) -> None:
+    """
+    Fallback path: one insert request per object.
+    """
+    for index, (data_object, vector) in enumerate(zip(properties, vectors)):
+        try:
+            collection.data.insert(properties=data_object, vector=vector, uuid=uuids[index])
+            summary.inserted += 1
+        except Exception as exc:
+            summary.failed[index] = str(exc)
+        summary.batches += 1
 
 
 def insert_documents(
     client,
     texts: List[str],
-    vectors: List[List[float]],
-    class_name: str = "Document"
-) -> None:
+    vectors: Any,
+    class_name: str = "Document",
+    batch_size: int = WRITE_BATCH_SIZE,
+    concurrent_requests: int = WRITE_CONCURRENCY,
+    max_retries: int = WRITE_MAX_RETRIES,
+    use_batch: bool = True,
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    uuids: Optional[List[Any]] = None
+) -> InsertSummary:
     """
     Inserts documents with their corresponding vectors into Weaviate.
 
+    Objects are grouped into batches of ``batch_size`` and flushed with
+    ``insert_many``, which sends them as one gRPC batch request with the
+    vectors packed as float32 bytes, from up to ``concurrent_requests``
+    threads. Objects the server rejects are retried individually within their
+    batch with exponential backoff; whatever still fails is reported per
+    object in the returned summary instead of aborting the whole load. The
+    one request per object path is used only when ``use_batch`` is False.
+
     Args:
-        client (weaviate.Client): The initialized Weaviate client.
+        client (weaviate.WeaviateClient): The initialized Weaviate client.
         texts (List[str]): List of document texts.
-        vectors (List[List[float]]): Corresponding list of embedding vectors.
+        vectors (Any): Corresponding embeddings as an ndarray, buffer or list of lists.
         class_name (str): The class name into which the documents will be inserted.
+        batch_size (int): Objects per batch request.
+        concurrent_requests (int): Batches flushed in parallel.
+        max_retries (int): Retry attempts for rejected objects.
+        use_batch (bool): Set to False to force the one-at-a-time fallback.
+        payloads (Optional[List[Dict[str, Any]]]): Extra properties stored with each document.
+        uuids (Optional[List[Any]]): Object ids; existing objects with these ids are overwritten.
+
+    Returns:
+        InsertSummary: Inserted count, per-object failures and throughput.
 
     Raises:
-        Exception: If the insertion of any document fails.
+        ValueError: If texts and vectors differ in length.
+        Exception: If the insert cannot be started at all.
     """
+    vectors, properties, uuids = _prepare_objects(texts, vectors, payloads, uuids)
+    summary = InsertSummary()
+    started = time.perf_counter()
     try:
-        for _, (text, vector) in enumerate(zip(texts, vectors)):
-            client.data_object.create(
-                data_object={"text": text},
-                class_name=class_name,
-                vector=vector
-            )
-        info("✅ Inserted {} documents into '{}'".format(len(texts), class_name))
+        collection = client.collections.get(class_name)
+        if not use_batch:
+            _insert_one_by_one(collection, properties, vectors, uuids, summary)
+        else:
+            lock = threading.Lock()
+            with ThreadPoolExecutor(max_workers=max(1, concurrent_requests)) as executor:
+                futures = []
+                for start in range(0, len(texts), batch_size):
+                    indices = list(range(start, min(start + batch_size, len(texts))))
+                    objects = [
+                        DataObject(properties=properties[i], vector=vectors[i], uuid=uuids[i])
+                        for i in indices
+                    ]
+                    futures.append(executor.submit(
+                        _insert_batch_with_retries, collection, objects, indices, max_retries, summary, lock
+                    ))
+                for future in futures:
+                    future.result()
     except Exception as exc:
         error("❌ Failed to insert documents: {}".format(str(exc)))
         raise
+    finally:
+        summary.elapsed_seconds = time.perf_counter() - started
+        invalidate_collection(client_scope("weaviate", client), class_name)
+
+    _record_inserted(client, class_name, texts, properties, uuids, summary)
+    return summary
+
+
+async def _async_flush_batch(collection, objects: List[Any], timeout: Optional[float]) -> Dict[int, str]:
+    """
+    Awaits one batch on the "weaviate" limiter and returns the position and message of every rejected object.
+    """
+    try:
+        response = await get_limiter("weaviate").run(collection.data.insert_many(objects), timeout=timeout)
+    except Exception as exc:
+        return {position: str(exc) for position in range(len(objects))}
+    return {position: getattr(err, "message", str(err)) for position, err in response.errors.items()}
+
+
+async def _async_insert_batch_with_retries(
+    collection,
+    objects: List[Any],
+    indices: List[int],
+    max_retries: int,
+    summary: InsertSummary,
+    timeout: Optional[float]
+) -> None:
+    """
+    Flushes a batch, retrying only the objects the server rejected; the async twin of
+    ``_insert_batch_with_retries``.
+    """
+    pending = list(range(len(objects)))
+    errors: Dict[int, str] = {}
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+        batch_errors = await _async_flush_batch(collection, [objects[p] for p in pending], timeout)
+        errors = {pending[p]: message for p, message in batch_errors.items()}
+        summary.inserted += len(pending) - len(errors)
+        summary.batches += 1
+        if attempt:
+            summary.retries += len(pending)
+        if not errors:
+            break
+        pending = sorted(errors)
+    for position, message in errors.items():
+        summary.failed[indices[position]] = message
+
+
+async def async_insert_documents(
+    client,
+    texts: List[str],
+    vectors: Any,
+    class_name: str = "Document",
+    timeout: Optional[float] = None,
+    batch_size: int = WRITE_BATCH_SIZE,
+    max_retries: int = WRITE_MAX_RETRIES,
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    uuids: Optional[List[Any]] = None
+) -> InsertSummary:
+    """
+    Inserts documents with a native async client.
+
+    Batches are sent with the async ``insert_many`` and awaited on the event
+    loop through the "weaviate" limiter, which caps the requests in flight and
+    applies the timeout to each of them. Rejected objects are retried as in
+    ``insert_documents``, and the returned summary reports the same fields.
+
+    Args:
+        client (weaviate.WeaviateAsyncClient): A connected async client, see ``get_async_weaviate_client``.
+        texts (List[str]): List of document texts.
+        vectors (Any): Corresponding embeddings as an ndarray, buffer or list of lists.
+        class_name (str): The class name into which the documents will be inserted.
+        timeout (Optional[float]): Seconds to wait per batch request; defaults to the limiter timeout.
+        batch_size (int): Objects per batch request.
+        max_retries (int): Retry attempts for rejected objects.
+        payloads (Optional[List[Dict[str, Any]]]): Extra properties stored with each document.
+        uuids (Optional[List[Any]]): Object ids; existing objects with these ids are overwritten.
+
+    Returns:
+        InsertSummary: Inserted count, per-object failures and throughput.
+
+    Raises:
+        ValueError: If texts and vectors differ in length.
+    """
+    vectors, properties, uuids = _prepare_objects(texts, vectors, payloads, uuids)
+    summary = InsertSummary()
+    started = time.perf_counter()
+    try:
+        collection = client.collections.get(class_name)
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            indices = list(range(start, min(start + batch_size, len(texts))))
+            objects = [DataObject(properties=properties[i], vector=vectors[i], uuid=uuids[i]) for i in indices]
+            batches.append(_async_insert_batch_with_retries(collection, objects, indices, max_retries,
+                                                            summary, timeout))
+        await asyncio.gather(*batches)
+    except Exception as exc:
+        error("❌ Failed to insert documents asynchronously: {}".format(str(exc)))
+        raise
+    finally:
+        summary.elapsed_seconds = time.perf_counter() - started
+        invalidate_collection(client_scope("weaviate", client), class_name)
+
+    _record_inserted(client, class_name, texts, properties, uuids, summary)
+    return summary
+
+
+def stream_insert_documents(
+    client,
+    documents: Iterable[str],
+    encode_fn: Callable[[List[str]], Any],
+    class_name: str = "Document",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING
+) -> IngestStats:
+    """
+    Encodes and inserts a stream of documents batch by batch.
+
+    Encoding of the next batch overlaps with the insert of the previous one,
+    so the corpus never has to be held in memory as a whole.
+
+    Args:
+        client (weaviate.WeaviateClient): The initialized Weaviate client.
+        documents (Iterable[str]): Document texts; consumed lazily.
+        encode_fn (Callable[[List[str]], Any]): Maps a batch of texts to an embedding matrix.
+        class_name (str): The class name into which the documents will be inserted.
+        batch_size (int): Documents per batch.
+        max_pending (int): Encoded batches allowed to queue ahead of the inserts.
+
+    Returns:
+        IngestStats: Counters and timings for the run; objects still rejected after
+            retries are counted in ``failed``, not ``documents``.
+    """
+    def write(texts: List[str], embeddings: Any, offset: int) -> int:
+        return len(insert_documents(client, texts, embeddings, class_name).failed)
+
+    return ingest_stream(documents, encode_fn, write, batch_size=batch_size, max_pending=max_pending)
@@ -11,42 +11,48 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
 from src.weaviate_lite.search_utils import search_documents
-from src.weaviate_lite.config import get_weaviate_client, get_embedding_model, CLASS_NAME
+from src.weaviate_lite.config import weaviate_connection, get_embedding_model, CLASS_NAME, VECTOR_DIM, EMBEDDING_MODEL_NAME
 from src.weaviate_lite.index_utils import create_schema, insert_documents
 
 from src.utils import info
+from src.utils.embedding_cache import get_embedding_cache
+from src.utils.sync import sync_collection, INCREMENTAL_SYNC
 
 def main() -> None:
     """
-    Entry point of the script. Initializes client and embedding model,
-    creates schema, inserts documents, and performs a semantic search.
+    Entry point of the script. Leases a pooled client, loads the embedding
+    model, creates schema, inserts documents, and performs a semantic search.
     """
-    # Initialize Weaviate client and embedding model
-    client = get_weaviate_client()
-    model = get_embedding_model()
-
-    # Create the schema
-    create_schema(client, CLASS_NAME)
-
-    # Documents and their embeddings
-    texts = [
-        "Artificial intelligence was founded as an academic discipline in 1956.",
-        "Alan Turing was the first person to conduct substantial research in AI."
-    ]
-    embeddings = model.encode(texts).tolist()
-
-    # Insert documents
-    insert_documents(client, texts, embeddings, CLASS_NAME)
-
-    # Perform a vector search
-    query = "Who is Alan Turing?"
-    query_vector = model.encode([query])[0].tolist()
-    results = search_documents(client, query_vector, CLASS_NAME)
-
-    # Display results
-    hits = results.get("data", {}).get("Get", {}).get(CLASS_NAME, [])
-    for result in hits:
-        info(result)
+    # Lease a Weaviate client from the shared pool and load the embedding model
+    with weaviate_connection() as client:
+        model = get_embedding_model()
+        cache = get_embedding_cache(EMBEDDING_MODEL_NAME)
+
+        # Documents
+        texts = [
+            "Artificial intelligence was founded as an academic discipline in 1956.",
+            "Alan Turing was the first person to conduct substantial research in AI."
+        ]
+
+        if INCREMENTAL_SYNC:
+            # Keep the class across runs and only embed new or changed documents
+            documents = [(f"doc-{i}", text, {}) for i, text in enumerate(texts)]
+            sync_collection("weaviate", CLASS_NAME, VECTOR_DIM, documents, model, EMBEDDING_MODEL_NAME,
+                            client=client)
+        else:
+            # Create the schema, embed and insert documents
+            create_schema(client, CLASS_NAME)
+            embeddings = cache.encode(model, texts)
+            insert_documents(client, texts, embeddings, CLASS_NAME)
+
+        # Perform a vector search
+        query = "Who is Alan Turing?"
+        query_vector = model.encode([query])[0]
+        results = search_documents(client, query_vector, CLASS_NAME)
+
+        # Display results
+        for result in results:
+            info("{:.4f}  {}".format(result.score, result.payload.get("text", "")))
 
 
 if __name__ == "__main__":
@@ -1,53 +1,238 @@
 """
 Search functionality for Weaviate.
 
-This module provides a function to perform vector similarity search
-in a Weaviate vector database.
+This module provides functions to perform vector similarity search
+in a Weaviate vector database through the v4 collections (gRPC) API.
 """
 
 import sys
 import os
-from typing import List
+from typing import Any, List, Optional
 
 # Get absolute path to the root of the project (VectorDatabase)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(ROOT_DIR)
 
+from weaviate.classes.query import Filter, MetadataQuery
 from src.utils.logging_utils import info, error
+from src.utils.vector_store import SearchResult
+from src.utils.vector_buffers import as_query
+from src.utils.concurrency import fan_out, DEFAULT_FAN_OUT
+from src.utils.async_utils import get_limiter
+from src.utils.query_cache import QueryCache
+from src.utils.filter_expr import Node, Compare, In, IsNull, And, Or, negate, parse_filter
+from src.utils.vector_store import Filters, client_scope
+
+
+def _to_filter(node: Node) -> Any:
+    if isinstance(node, Compare):
+        prop = Filter.by_property(node.field)
+        return {
+            "==": prop.equal, "!=": prop.not_equal, "<": prop.less_than, "<=": prop.less_or_equal,
+            ">": prop.greater_than, ">=": prop.greater_or_equal,
+        }[node.op](node.value)
+    if isinstance(node, IsNull):
+        return Filter.by_property(node.field).is_none(True)
+    if isinstance(node, In):
+        values = sorted(node.values, key=repr)
+        if node.negate:
+            return Filter.all_of([Filter.by_property(node.field).not_equal(value) for value in values])
+        return Filter.by_property(node.field).contains_any(values)
+    if isinstance(node, And):
+        return Filter.all_of([_to_filter(item) for item in node.items])
+    if isinstance(node, Or):
+        return Filter.any_of([_to_filter(item) for item in node.items])
+    if isinstance(node.item, IsNull):
+        return Filter.by_property(node.item.field).is_none(False)
+    # Weaviate filters have no NOT; push the negation down to the comparisons.
+    return _to_filter(negate(node.item))
+
+
+def build_filter(filters: Optional[Filters]) -> Optional[Filter]:
+    """
+    Translate a {property: value | [values]} dict or a Milvus-style expression into a Weaviate filter.
+
+    Args:
+        filters (Optional[Filters]): Equality (scalar) or membership (list) conditions, or an
+            expression such as "subject == 'biology' and year >= 2020".
+
+    Returns:
+        Optional[Filter]: Combined filter, or None when no conditions are given.
+    """
+    if not filters:
+        return None
+    if isinstance(filters, str):
+        return _to_filter(parse_filter(filters))
+    conditions = []
+    for name, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(Filter.by_property(name).contains_any(list(value)))
+        else:
+            conditions.append(Filter.by_property(name).equal(value))
+    return conditions[0] if len(conditions) == 1 else Filter.all_of(conditions)
+
+
+def to_search_results(response: Any, id_property: Optional[str] = None) -> List[SearchResult]:
+    """
+    Convert a v4 query response into ``SearchResult`` objects.
+
+    Args:
+        response (Any): ``QueryReturn`` of a near-vector query with distance metadata.
+        id_property (Optional[str]): Property holding the caller's point id; it is
+            removed from the payload and reported as the id. Defaults to the object UUID.
+
+    Returns:
+        List[SearchResult]: Hits ordered by decreasing score (1 - cosine distance).
+    """
+    results = []
+    for obj in response.objects:
+        payload = dict(obj.properties)
+        point_id = payload.pop(id_property, None) if id_property else None
+        results.append(SearchResult(
+            id=point_id if point_id is not None else str(obj.uuid),
+            score=1.0 - obj.metadata.distance,
+            payload=payload
+        ))
+    return results
 
 
 def search_documents(
     client,
-    query_vector: List[float],
+    query_vector: Any,
     class_name: str = "Document",
-    limit: int = 2
-) -> dict:
+    limit: int = 2,
+    cache: Optional[QueryCache] = None,
+    filters: Optional[Filters] = None,
+    return_properties: Optional[List[str]] = None,
+    id_property: Optional[str] = None
+) -> List[SearchResult]:
     """
     Perform a vector similarity search in the Weaviate database.
 
+    The query goes through the v4 collections API, so it is sent over gRPC
+    with the vector packed as float32 bytes rather than as a GraphQL literal.
+
     Args:
-        client (weaviate.Client): The initialized Weaviate client.
-        query_vector (List[float]): The vector to search against.
-        class_name (str): The class name to search in. Default is "Document".
+        client (weaviate.WeaviateClient): The initialized Weaviate client.
+        query_vector (Any): The vector to search against, as an ndarray, buffer or list.
+        class_name (str): The collection to search in. Default is "Document".
         limit (int): The number of top results to return. Default is 2.
+        cache (Optional[QueryCache]): Query-result cache; a query answered before is served from it.
+        filters (Optional[Dict[str, Any]]): Property conditions, see ``build_filter``.
+        return_properties (Optional[List[str]]): Properties to fetch; all of them by default.
+        id_property (Optional[str]): Property reported as the hit id instead of the object UUID.
 
     Returns:
-        dict: The raw response dictionary from Weaviate.
+        List[SearchResult]: Hits ordered by decreasing score.
 
     Raises:
         Exception: If the search fails.
     """
+    if cache is not None:
+        return cache.cached(
+            client_scope("weaviate", client), class_name, query_vector, limit, filters,
+            lambda: search_documents(client, query_vector, class_name, limit, filters=filters,
+                                     return_properties=return_properties, id_property=id_property),
+            extra=(tuple(return_properties) if return_properties else None, id_property)
+        )
     try:
-        results = (
-            client.query
-            .get(class_name, ["text"])
-            .with_near_vector({"vector": query_vector})
-            .with_limit(limit)
-            .do()
+        response = client.collections.get(class_name).query.near_vector(
+            near_vector=as_query(query_vector),
+            limit=limit,
+            filters=build_filter(filters),
+            return_properties=return_properties,
+            return_metadata=MetadataQuery(distance=True)
         )
-        hits = results.get("data", {}).get("Get", {}).get(class_name, [])
-        info("🔍 Search returned {} result(s) from '{}'".format(len(hits), class_name))
+        results = to_search_results(response, id_property)
+        info("🔍 Search returned %d result(s) from '%s'", len(results), class_name, service="search_utils",
+             operation="search")
         return results
     except Exception as exc:
         error("❌ Search failed: {}".format(str(exc)))
         raise
+
+
+def search_documents_batch(
+    client,
+    query_vectors: Any,
+    class_name: str = "Document",
+    limit: int = 2,
+    max_workers: int = DEFAULT_FAN_OUT
+) -> List[List[SearchResult]]:
+    """
+    Perform several vector similarity searches concurrently.
+
+    Weaviate has no multi-vector near-vector query, so the queries are fanned
+    out over a thread pool; the client's gRPC channel multiplexes them.
+
+    Args:
+        client (weaviate.WeaviateClient): The initialized Weaviate client.
+        query_vectors (Any): The vectors to search against, as a matrix or list of vectors.
+        class_name (str): The collection to search in. Default is "Document".
+        limit (int): The number of top results per query. Default is 2.
+        max_workers (int): Maximum number of queries in flight.
+
+    Returns:
+        List[List[SearchResult]]: One hit list per query, aligned with ``query_vectors``.
+
+    Raises:
+        Exception: If any of the searches fails.
+    """
+    return fan_out(
+        lambda query_vector: search_documents(client, query_vector, class_name, limit),
+        query_vectors,
+        max_workers=max_workers
+    )
+
+
+async def async_search_documents(
+    client,
+    query_vector: Any,
+    class_name: str = "Document",
+    limit: int = 2,
+    timeout: Optional[float] = None,
+    filters: Optional[Filters] = None,
+    return_properties: Optional[List[str]] = None,
+    id_property: Optional[str] = None
+) -> List[SearchResult]:
+    """
+    Perform a vector similarity search on a native async client.
+
+    The query is awaited on the event loop through the "weaviate" limiter,
+    which caps the number of searches in flight and applies the timeout; no
+    worker thread is involved.
+
+    Args:
+        client (weaviate.WeaviateAsyncClient): A connected async client, see ``get_async_weaviate_client``.
+        query_vector (Any): The vector to search against.
+        class_name (str): The collection to search in. Default is "Document".
+        limit (int): The number of top results to return. Default is 2.
+        timeout (Optional[float]): Seconds to wait; defaults to the limiter timeout.
+        filters (Optional[Filters]): Property conditions, see ``build_filter``.
+        return_properties (Optional[List[str]]): Properties to fetch; all of them by default.
+        id_property (Optional[str]): Property reported as the hit id instead of the object UUID.
+
+    Returns:
+        List[SearchResult]: Hits ordered by decreasing score.
+
+    Raises:
+        asyncio.TimeoutError: If the search does not finish in time.
+    """
+    try:
+        response = await get_limiter("weaviate").run(
+            client.collections.get(class_name).query.near_vector(
+                near_vector=as_query(query_vector),
+                limit=limit,
+                filters=build_filter(filters),
+                return_properties=return_properties,
+                return_metadata=MetadataQuery(distance=True)
+            ),
+            timeout=timeout
+        )
+        results = to_search_results(response, id_property)
+        info("🔍 Async search returned %d result(s) from '%s'", len(results), class_name, service="search_utils",
+             operation="search")
+        return results
+    except Exception as exc:
+        error("❌ Async search failed: {}".format(str(exc)))
+        raise
@@ -0,0 +1,129 @@
+"""
+VectorStore adapter for Weaviate.
+
+Weaviate identifies objects by UUID, so arbitrary point ids are mapped to
+deterministic UUIDv5 values and the original id is kept in the ``doc_id``
+property, which is what search results report back.
+"""
+
+import sys
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+# Get absolute path to the root of the project (VectorDatabase)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(ROOT_DIR)
+
+from weaviate.classes.query import Filter
+from src.weaviate_lite.config import get_weaviate_pool
+from src.weaviate_lite.index_utils import create_schema, insert_documents, ID_PROPERTY
+from src.weaviate_lite.search_utils import search_documents
+from src.utils import error
+from src.utils.vector_store import VectorStore, SearchResult, Filters, client_scope
+from src.utils.vector_buffers import as_matrix
+from src.utils.query_cache import invalidate_collection
+from src.utils.sparse_index import remove_texts
+from src.utils.payload_schema import PayloadSchema, validate_schema, DEFAULT_PAYLOAD_SCHEMA
+
+ID_NAMESPACE = uuid.UUID("6f1c1f6e-5b7e-4c61-9a63-0f7a3f5b2d10")
+
+
+def point_uuid(point_id: Any) -> uuid.UUID:
+    """
+    Map a point id to the deterministic UUID used as the Weaviate object id.
+
+    Args:
+        point_id (Any): Point id as passed to ``upsert``.
+
+    Returns:
+        uuid.UUID: UUIDv5 derived from the id.
+    """
+    return uuid.uuid5(ID_NAMESPACE, str(point_id))
+
+
+class WeaviateStore(VectorStore):
+    """
+    Weaviate-backed VectorStore using the v4 collections API.
+
+    Fields of ``payload_schema`` (default ``PAYLOAD_SCHEMA``) are declared when the
+    collection is created, keyword fields with field tokenization so equality and
+    ``in`` filters match whole values.
+
+    Args:
+        collection_name (str): Collection (class) name.
+        dimension (int): Vector dimension.
+        client (weaviate.WeaviateClient): Existing client; defaults to one leased from
+            the shared pool of the local instance and returned on ``close``.
+        payload_schema (Optional[PayloadSchema]): {field: type} of the filterable payload fields.
+    """
+
+    backend = "weaviate"
+
+    def __init__(self, collection_name: str, dimension: int, client=None,
+                 payload_schema: Optional[PayloadSchema] = None) -> None:
+        super().__init__(collection_name, dimension)
+        self.payload_schema = validate_schema(DEFAULT_PAYLOAD_SCHEMA if payload_schema is None else payload_schema)
+        self._pool = None if client is not None else get_weaviate_pool()
+        self.client = client if client is not None else self._pool.acquire()
+        self.scope = client_scope(self.backend, self.client)
+        self.collection = self.client.collections.get(collection_name)
+
+    def create_collection(self, recreate: bool = False) -> None:
+        create_schema(self.client, self.collection_name, recreate=recreate, payload_schema=self.payload_schema)
+        self.collection = self.client.collections.get(self.collection_name)
+
+    def upsert(
+        self,
+        ids: Sequence[Any],
+        vectors: Sequence[Sequence[float]],
+        payloads: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> int:
+        payloads = list(payloads) if payloads else [{} for _ in ids]
+        properties = [{**payload, ID_PROPERTY: point_id} for point_id, payload in zip(ids, payloads)]
+        texts = [payload.get("text", "") for payload in payloads]
+        summary = insert_documents(
+            self.client,
+            texts,
+            as_matrix(vectors),
+            self.collection_name,
+            payloads=properties,
+            uuids=[point_uuid(point_id) for point_id in ids]
+        )
+        if summary.failed:
+            # Callers such as sync_store treat a returned upsert as fully stored.
+            position, message = next(iter(summary.failed.items()))
+            raise RuntimeError("{} of {} objects were rejected, first '{}': {}".format(
+                len(summary.failed), len(ids), ids[position], message))
+        return summary.inserted
+
+    def delete(self, ids: Sequence[Any]) -> int:
+        try:
+            self.collection.data.delete_many(
+                where=Filter.by_id().contains_any([point_uuid(point_id) for point_id in ids])
+            )
+            remove_texts(self.scope, self.collection_name, ids)
+            return len(ids)
+        except Exception as exc:
+            error("❌ Failed to delete objects: {}".format(str(exc)))
+            raise
+        finally:
+            invalidate_collection(self.scope, self.collection_name)
+
+    def count(self) -> int:
+        return self.collection.aggregate.over_all(total_count=True).total_count
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filters: Optional[Filters] = None
+    ) -> List[SearchResult]:
+        return search_documents(self.client, query_vector, self.collection_name, limit=k, filters=filters,
+                                id_property=ID_PROPERTY)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.release(self.client)
+        else:
+            self.client.close()